@@ -56,9 +56,14 @@ from .nodeSystem.node_menu import NodeMenu as FTkNodeMenu
 
 # CTkRadarChart | https://github.com/Akascape/CTkRadarChart
 from .radarChart import CTkRadarChart as FTkRadarChart
+from .radarChart import render_radar_chart as renderRadarChart
 
 # CTkPieChart | https://github.com/Akascape/CTkPieChart
 from .pieChart import CTkPieChart as FTkPieChart
+from .pieChart import render_pie_chart as renderPieChart
+
+# headless rendering of the charts with PIL
+from .imageCanvas import ImageCanvas as FTkImageCanvas
 
 # CustomTkinter | https://github.com/TomSchimansky/CustomTkinter | `pip install customtkinter`
 from .customtkinter.windows.widgets.appearance_mode import AppearanceModeTracker
@@ -111,9 +116,15 @@ from .mapview.utility_functions import (
     convert_coordinates_to_country as convertCoordinatesToCountry,
     convert_coordinates_to_city as convertCoordinatesToCity,
     convert_address_to_coordinates as convertAddressToCordinates,
+    convert_addresses_to_coordinates as convertAddressesToCoordinates,
     decimal_to_osm as decimalToOSM,
+    decimal_to_osm_array as decimalToOSMArray,
     osm_to_decimal as OSMtoDecimal
 )
+from .mapview.geocoding import (
+    GazetteerBackend as FTkGazetteer,
+    configure_geocoding as configureGeocoding
+)
 
 # tkVideoPlayer | https://github.com/PaulleDemon/tkVideoPlayer
 from .videoPlayer import TkinterVideo as FTkVideo
@@ -121,11 +132,12 @@ from .videoPlayer import TkinterVideo as FTkVideo
 # ctkChart | https://github.com/Thisal-D/ctkchart
 from .chart.LineChart import CTkLineChart as FTkLineChart
 from .chart.Line import CTkLine as FTkLine
+from .chart.LineChartImage import render_line_chart as renderLineChart
 
 # CTkDataVisualizingWidgets | https://github.com/ZikPin/CTkDataVisualizingWidgets
 from .dataVisualizingWidgets.calender import CTkCalendar as FTkCalendar
-from .dataVisualizingWidgets.graph import CTkGraph as FTkGraph
-from .dataVisualizingWidgets.chart import CTkChart as FTkChart
+from .dataVisualizingWidgets.graph import CTkGraph as FTkGraph, render_graph as renderGraph
+from .dataVisualizingWidgets.chart import CTkChart as FTkChart, render_chart as renderChart
 from .dataVisualizingWidgets.calendarStat import CTkCalendarStat as FTkCalendarStat
 
 # tkTerm | https://github.com/dhanoosu/TkTerm
@@ -0,0 +1,240 @@
+"""
+Chart benchmark
+Measures draw time, canvas item count and peak memory of the chart widgets for standard data sizes.
+
+Usage (from the directory containing the package):
+    python -m <package>.benchmarks.chartBenchmark                      headless, no display needed
+    python -m <package>.benchmarks.chartBenchmark --live               draws the widgets in a window (Xvfb works)
+    python -m <package>.benchmarks.chartBenchmark --json result.json   saves the results
+    python -m <package>.benchmarks.chartBenchmark --compare result.json --threshold 0.25
+                                                                       exits with 1 if a case got slower
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..chart.LineChartImage import render_line_chart
+from ..pieChart import render_pie_chart
+from ..radarChart import render_radar_chart
+from ..dataVisualizingWidgets.graph import render_graph
+from ..dataVisualizingWidgets.chart import render_chart
+
+LINE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+PIE_SIZES = (5, 50)
+RADAR_SIZES = (6, 24)
+GRAPH_SIZES = (100, 1_000)
+CHART_SIZES = (7, 30)
+
+# times below this are not compared, they are dominated by noise
+MIN_COMPARED_TIME = 0.005
+
+
+def random_values(count: int, seed: int = 0) -> List[float]:
+    generator = random.Random(seed)
+    value, values = 50.0, []
+    for _ in range(count):
+        value = min(max(value + generator.uniform(-5, 5), 0), 100)
+        values.append(value)
+    return values
+
+
+def headless_cases() -> List[Tuple[str, Callable[[], Any]]]:
+    """ (name, function) pairs, every function draws one chart and returns its ImageCanvas """
+
+    cases = []
+    for size in LINE_SIZES:
+        values = random_values(size)
+        cases.append((f"line_chart[{size}]", lambda values=values: render_line_chart(
+            [{"data": values, "fill": "enabled"}], width=900, height=400, y_axis_values=(0, 100),
+            x_axis_values=tuple(range(10)), x_axis_point_spacing="auto")))
+    for size in PIE_SIZES:
+        values = {f"section {i}": {"value": value} for i, value in enumerate(random_values(size))}
+        cases.append((f"pie_chart[{size}]", lambda values=values: render_pie_chart(values, radius=300)))
+    for size in RADAR_SIZES:
+        data = {"first": {"data": random_values(size, 1), "color": "#ff6666"},
+                "second": {"data": random_values(size, 2), "color": "#66aaff"}}
+        labels = [f"axis {i}" for i in range(size)]
+        cases.append((f"radar_chart[{size}]", lambda data=data, labels=labels: render_radar_chart(
+            data, labels=labels, num_axes=len(labels))))
+    for size in GRAPH_SIZES:
+        values = [int(value) + 1 for value in random_values(size)]
+        cases.append((f"graph[{size}]", lambda values=values: render_graph(values, width=600, height=300)))
+    for size in CHART_SIZES:
+        data = {f"day {i}": int(value) for i, value in enumerate(random_values(size))}
+        cases.append((f"chart[{size}]", lambda data=data: render_chart(data, width=60 * size, height=300)))
+    return cases
+
+
+def run_headless(repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, draw in headless_cases():
+        def run():
+            canvas = draw()
+            canvas.to_png()
+            return canvas
+
+        draw_time = render_time = float("inf")
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            canvas = draw()
+            drawn = time.perf_counter()
+            canvas.to_png()
+            draw_time = min(draw_time, drawn - start)
+            render_time = min(render_time, time.perf_counter() - drawn)
+
+        items = len(canvas.find_all())
+        results[name] = {"draw_time": draw_time, "render_time": render_time, "items": items,
+                         "peak_memory": measure_memory(run)}
+        print_result(name, results[name])
+    return results
+
+
+def run_live(repeat: int) -> Dict[str, Dict[str, float]]:
+    """ draws the widgets in a window, the time includes the update of the window """
+
+    import customtkinter
+    from ..chart.LineChart import CTkLineChart
+    from ..chart.Line import CTkLine
+    from ..pieChart import CTkPieChart
+    from ..radarChart import CTkRadarChart
+    from ..dataVisualizingWidgets.graph import CTkGraph
+    from ..dataVisualizingWidgets.chart import CTkChart
+
+    root = customtkinter.CTk()
+    root.geometry("1000x600")
+
+    def line_chart(values):
+        chart = CTkLineChart(root, width=900, height=400, y_axis_values=(0, 100), x_axis_values=tuple(range(10)))
+        chart.show_data(CTkLine(chart, fill="enabled"), values)
+        return chart
+
+    def pie_chart(values):
+        chart = CTkPieChart(root, radius=300)
+        for tag, value in values.items():
+            chart.add(tag, value["value"], draw=False)
+        chart.draw_pie_chart()
+        return chart
+
+    def radar_chart(data, labels):
+        chart = CTkRadarChart(root, labels=labels, num_axes=len(labels))
+        for tag, value in data.items():
+            chart.add(tag, value["data"], color=value["color"])
+        return chart
+
+    cases = []
+    for size in LINE_SIZES:
+        cases.append((f"line_chart[{size}]", lambda values=random_values(size): line_chart(values)))
+    for size in PIE_SIZES:
+        values = {f"section {i}": {"value": value} for i, value in enumerate(random_values(size))}
+        cases.append((f"pie_chart[{size}]", lambda values=values: pie_chart(values)))
+    for size in RADAR_SIZES:
+        data = {"first": {"data": random_values(size, 1), "color": "#ff6666"},
+                "second": {"data": random_values(size, 2), "color": "#66aaff"}}
+        labels = [f"axis {i}" for i in range(size)]
+        cases.append((f"radar_chart[{size}]", lambda data=data, labels=labels: radar_chart(data, labels)))
+    for size in GRAPH_SIZES:
+        values = [int(value) + 1 for value in random_values(size)]
+        cases.append((f"graph[{size}]", lambda values=values: CTkGraph(root, values, width=600, height=300)))
+    for size in CHART_SIZES:
+        data = {f"day {i}": int(value) for i, value in enumerate(random_values(size))}
+        cases.append((f"chart[{size}]", lambda data=data: CTkChart(root, data, width=60 * size, height=300)))
+
+    results = {}
+    for name, create in cases:
+        def run():
+            widget = create()
+            widget.pack()
+            root.update()
+            return widget
+
+        draw_time = float("inf")
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            widget = run()
+            draw_time = min(draw_time, time.perf_counter() - start)
+            items = count_canvas_items(widget)
+            widget.destroy()
+
+        results[name] = {"draw_time": draw_time, "render_time": 0.0, "items": items,
+                         "peak_memory": measure_memory(lambda: run().destroy())}
+        print_result(name, results[name])
+
+    root.destroy()
+    return results
+
+
+def count_canvas_items(widget: Any) -> int:
+    # items of all tkinter canvases of the widget and its children
+    count = len(widget.find_all()) if hasattr(widget, "find_all") else 0
+    return count + sum(count_canvas_items(child) for child in widget.winfo_children())
+
+
+def measure_memory(function: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def print_result(name: str, result: Dict[str, float]) -> None:
+    print(f"{name:<22} draw {result['draw_time'] * 1000:9.2f} ms   render {result['render_time'] * 1000:9.2f} ms   "
+          f"items {result['items']:6d}   peak memory {result['peak_memory'] / 1024 / 1024:8.2f} MiB")
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """ returns the regressions, a case regresses if its time grows by more than threshold or its item count grows """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        for key in ("draw_time", "render_time"):
+            if max(old[key], result[key]) >= MIN_COMPARED_TIME and result[key] > old[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {old[key] * 1000:.2f} ms -> {result[key] * 1000:.2f} ms")
+        if result["items"] > old["items"]:
+            regressions.append(f"{name}: items {old['items']} -> {result['items']}")
+        if result["peak_memory"] > old["peak_memory"] * (1 + threshold):
+            regressions.append(f"{name}: peak memory {old['peak_memory']} -> {result['peak_memory']} bytes")
+    return regressions
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="benchmark of the chart widgets")
+    parser.add_argument("--live", action="store_true", help="draw the widgets in a window instead of headless")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the fastest run is reported")
+    parser.add_argument("--json", metavar="PATH", help="save the results as json")
+    parser.add_argument("--compare", metavar="PATH", help="json results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown for --compare")
+    arguments = parser.parse_args(arguments)
+
+    results = run_live(arguments.repeat) if arguments.live else run_headless(arguments.repeat)
+
+    if arguments.json:
+        with open(arguments.json, "w") as file:
+            json.dump({"mode": "live" if arguments.live else "headless", "results": results}, file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, arguments.threshold)
+        for regression in regressions:
+            print("regression:", regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
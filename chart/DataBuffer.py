@@ -0,0 +1,139 @@
+from array import array
+from typing import List, Union, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # numpy arrays are converted with the buffer protocol or element by element then
+
+
+def to_float_array(values: Iterable[Union[int, float]]) -> array:
+    """
+    Convert numeric values to an array of C doubles.
+
+    Lists, tuples, generators, array.array objects, memoryviews and numpy arrays are accepted. Arrays of doubles
+    are returned without copying, contiguous numeric buffers are copied as one block of memory.
+
+    Args:
+        values (Iterable[Union[int, float]]): The values to convert.
+
+    Returns:
+        array: The values as array('d').
+
+    Raises:
+        TypeError: If a value is not a number.
+    """
+
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+
+    if np is not None and isinstance(values, np.ndarray):
+        if values.dtype.kind not in "biuf":
+            raise TypeError(f"numpy array of dtype {values.dtype} does not contain numbers")
+        result = array("d")
+        result.frombytes(np.ascontiguousarray(values, dtype=np.float64).ravel().tobytes())
+        return result
+
+    if isinstance(values, memoryview):
+        if values.format == "d" and values.c_contiguous:
+            result = array("d")
+            result.frombytes(values.cast("B"))
+            return result
+        values = values.tolist()
+
+    return array("d", values)
+
+
+class RingBuffer:
+    """
+Fixed-capacity buffer of numeric values used by streaming lines.
+
+When the buffer is full, the oldest values are dropped. Appending n values costs O(n)
+independent of the capacity, the values are stored in one preallocated array of C doubles.
+
+Args:
+    capacity (int): The maximum number of values kept in the buffer.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity: int = capacity
+        self.total_count: int = 0  # number of values appended since the last clear, including dropped values
+        self.__values = array("d", bytes(8 * capacity))
+        self.__start: int = 0
+        self.__size: int = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def extend(self, values: Iterable[Union[int, float]]) -> None:
+        """
+        Append values, the oldest values are dropped if the capacity is exceeded.
+
+        Args:
+            values (Iterable[Union[int, float]]): The values to append.
+        """
+
+        values = to_float_array(values)
+        count = len(values)
+        self.total_count += count
+        if count >= self.capacity:
+            values = values[count - self.capacity:]
+            count = self.capacity
+
+        # write position after the newest value, the new values wrap around the end of the array at most once
+        position = (self.__start + self.__size) % self.capacity
+        first_part = min(count, self.capacity - position)
+        self.__values[position:position + first_part] = values[:first_part]
+        self.__values[:count - first_part] = values[first_part:]
+
+        dropped = max(0, self.__size + count - self.capacity)
+        self.__start = (self.__start + dropped) % self.capacity
+        self.__size = min(self.capacity, self.__size + count)
+
+    def __iadd__(self, values: Iterable[Union[int, float]]) -> "RingBuffer":
+        self.extend(values)
+        return self
+
+    def __add__(self, values: list) -> list:
+        return self.to_list() + values
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, list]:
+        if isinstance(index, slice):
+            return self.to_list()[index]
+
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError("RingBuffer index out of range")
+        return self.__values[(self.__start + index) % self.capacity]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def tail(self, count: int) -> array:
+        """
+        Get the newest values.
+
+        Args:
+            count (int): The maximum number of values.
+
+        Returns:
+            array: The newest values as array('d'), oldest first.
+        """
+
+        count = min(max(count, 0), self.__size)
+        start = (self.__start + self.__size - count) % self.capacity
+        if start + count <= self.capacity:
+            return self.__values[start:start + count]
+        return self.__values[start:] + self.__values[:start + count - self.capacity]
+
+    def to_list(self) -> List[float]:
+        return self.tail(self.__size).tolist()
+
+    def clear(self) -> None:
+        self.total_count = 0
+        self.__start = 0
+        self.__size = 0
@@ -1,5 +1,7 @@
+from array import array
 from typing import Union, Tuple, Literal
 from .Validate import Validate
+from .DataBuffer import RingBuffer
 
 
 class CTkLine:
@@ -18,6 +20,7 @@ Args:
     point_highlight_color (Union[Tuple[str, str], str]): The color of points used for highlighting.
     fill (str): Whether fill for the line is enabled or disabled.
     fill_color (Union[Tuple[str, str], str]): The color of the fill for the line.
+    buffer_size (int): Maximum number of values kept for streaming, the oldest values are dropped. None keeps all values.
 
 Author: Thisal Dilmith | https://github.com/Thisal-D
     """
@@ -34,6 +37,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             point_highlight_color: Union[Tuple[str, str], str] = ("#768df1", "#768df1"),
             fill: Literal["enabled", "disabled"] = "disabled",
             fill_color: Union[Tuple[str, str], str] = ("#bdc6ed", "#5d6db6"),
+            buffer_size: int = None,
             *args: any) -> None:
 
 
@@ -53,15 +57,17 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         Validate._isValidColor(point_highlight_color, "point_highlight_color")
         Validate._isValidLineFill(fill, "fill")
         Validate._isValidColor(fill_color, "fill_color")
+        if buffer_size is not None:
+            Validate._isInt(buffer_size, "buffer_size")
 
         self.__master = master
         self.__color = color
         self.__size = size
         self.__y_end = 0
         self.__x_end = self.__master._CTkLineChart__x_axis_point_spacing * -1
-        self.__data = []
+        self.__buffer_size = buffer_size
+        self.__data = self.__create_data_buffer()
         self.__temp_data = []
-        self.__ret_data = []
         self.__visibility = self.__master._CTkLineChart__visibility
         self.__style = style
         self.__style_type = style_type
@@ -150,6 +156,17 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         if changes_req:
             self.__master._CTkLineChart__apply_line_configuration()
 
+    def __create_data_buffer(self) -> Union[array, RingBuffer]:
+        """
+        Create the storage for the values of the line, a ring buffer if buffer_size is set.
+
+        The values are stored as C doubles, 8 bytes per value instead of a list of float objects.
+        """
+
+        if self.__buffer_size is not None:
+            return RingBuffer(self.__buffer_size)
+        return array("d")
+
     def __reset(self) -> None:
         """
         Reset the CTkLine object.
@@ -157,7 +174,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
 
         self.__y_end = 0
         self.__x_end = self.__master._CTkLineChart__x_axis_point_spacing * -1
-        self.__data = []
+        self.__data = self.__create_data_buffer()
 
     def reset(self) -> None:
         """
@@ -183,7 +200,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             attribute_name: Literal[
                 "master", "color", "size", "style", "style_type", "point_highlight",
                 "point_highlight_size", "point_highlight_color", "fill", "fill_color",
-                "__all__"]) -> any:
+                "buffer_size", "__all__"]) -> any:
         """
         Get the value of a CTkLine attribute.
 
@@ -214,6 +231,8 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             return self.__fill
         if attribute_name == "fill_color":
             return self.__fill_color
+        if attribute_name == "buffer_size":
+            return self.__buffer_size
 
         if attribute_name == "__all__":
             return {
@@ -226,7 +245,8 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
                 "point_highlight_size": self.__point_highlight_size,
                 "point_highlight_color": self.__point_highlight_color,
                 "fill": self.__fill,
-                "fill_color": self.__fill_color
+                "fill_color": self.__fill_color,
+                "buffer_size": self.__buffer_size
             }
         Validate._invalidCget(attribute_name)
 
@@ -249,7 +269,6 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         del self.__x_end
         del self.__data
         del self.__temp_data
-        del self.__ret_data
         del self.__visibility
         del self.__style
         del self.__style_type
@@ -258,6 +277,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         del self.__point_highlight_color
         del self.__fill
         del self.__fill_color
+        del self.__buffer_size
 
     def destroy(self) -> None:
         """
@@ -1,7 +1,9 @@
 import tkinter
-from typing import Union, List, Tuple, Literal, Any, Callable
+import time
+from typing import Union, List, Tuple, Literal, Any, Callable, Iterable
 import customtkinter
 from .Line import CTkLine
+from .DataBuffer import RingBuffer, to_float_array
 from .ThemeManager import ThemeManager
 from .Utils import Utils
 from .Validate import Validate
@@ -58,6 +60,9 @@ Args:
     pointing_values_precision: The precision for the values displayed when pointing to data points.
     pointer_lock: The lock state of the pointer ('disabled' or 'enabled').
     pointer_size: The size of the pointer.
+    pointer_tooltip: Whether a tooltip with the pointed values of all lines is shown next to the pointer ('disabled' or 'enabled').
+
+    streaming_fps: The maximum number of redraws and pointer updates per second.
 
 Author: Thisal Dilmith | https://github.com/Thisal-D
         """
@@ -109,6 +114,9 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             pointing_values_precision: int = 1,
             pointer_lock: Literal["enabled", "disabled"] = "disabled",
             pointer_size: int = 1,
+            pointer_tooltip: Literal["enabled", "disabled"] = "disabled",
+
+            streaming_fps: int = 30,
 
             *args: Any) -> None:
 
@@ -127,6 +135,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         Validate._isInt(x_axis_section_count, "x_axis_section_count")
         Validate._isInt(pointing_values_precision, "pointing_values_precision")
         Validate._isInt(pointer_size, "pointer_size")
+        Validate._isInt(streaming_fps, "streaming_fps")
         Validate._isValidXAxisValues(x_axis_values, "x_axis_values")
         Validate._isValidYAxisValues(y_axis_values, "y_axis_values")
         Validate._isValidColor(y_axis_section_color, "y_axis_section_color")
@@ -150,6 +159,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         Validate._isValidXAxisPointSpacing(x_axis_point_spacing, "x_axis_point_spacing")
         Validate._isValidPointerState_Lock(pointer_state, "pointer_state")
         Validate._isValidPointerState_Lock(pointer_lock, "pointer_lock")
+        Validate._isValidPointerState_Lock(pointer_tooltip, "pointer_tooltip")
         Validate._isValidFunction(pointing_callback_function, "pointing_callback_function")
         Validate._isValidXAxisIndices(x_axis_values, x_axis_display_values_indices, "x_axis_display_values_indices")
         Validate._isValidXAxisLabelCount(x_axis_label_count, "x_axis_label_count")
@@ -206,16 +216,26 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         self.__pointer_lock: Literal["enabled", 'disabled'] = pointer_lock
         self.__pointer_size: int = pointer_size
         self.__pointer_color: Union[Tuple[str, str], str] = pointer_color
+        self.__pointer_tooltip: Literal["enabled", 'disabled'] = pointer_tooltip
+        self.__pointer_event_x: int = 0
+        self.__pointer_job: Union[str, None] = None
+        self.__last_pointer_time: float = 0.0
+        self.__tooltip_labels: List[tkinter.Label] = []
         self.__x_values_frame_place_req: bool = True
         self.__y_values_frame_place_req: bool = True
 
-        self.__place_x: int = 0
         self.__real_height: int = 0
         self.__real_width: int = 0
         self.__const_real_height: int = 0
         self.__const_real_width: int = 0
         self.__visibility: bool = True
 
+        self.__streaming_fps: int = streaming_fps
+        self.__render_job: Union[str, None] = None
+        self.__render_job_idle: bool = False
+        self.__last_render_time: float = 0.0
+        self.__line_canvas_items: dict = {}
+
         self.__place_info_x: Union[int, None] = None
         self.__place_info_y: Union[int, None] = None
         self.__place_info_rely: Union[int, float, None] = None
@@ -303,6 +323,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         self.__y_axis_frame = tkinter.Frame(master=self.__main_frame)
         self.__x_axis_frame = tkinter.Frame(master=self.__main_frame)
         self.__pointer = tkinter.Frame(master=self.__output_canvas)
+        self.__tooltip = tkinter.Frame(master=self.__output_canvas, padx=1, pady=1)
 
     def __set_pointer_state(self) -> None:
         """
@@ -330,6 +351,9 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         self.__x_axis_frame.configure(bg=ThemeManager.get_color_by_theme(self.__axis_color))
         self.__output_canvas.configure(bg=ThemeManager.get_color_by_theme(self.__fg_color))
         self.__pointer.configure(bg=ThemeManager.get_color_by_theme(self.__pointer_color))
+        self.__tooltip.configure(bg=ThemeManager.get_color_by_theme(self.__pointer_color))
+        for label in self.__tooltip_labels:
+            label.configure(bg=ThemeManager.get_color_by_theme(self.__bg_color))
 
     def __set_customtkinter_widgets_colors(self) -> None:
         """
@@ -954,7 +978,9 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             pointer_color: Union[Tuple[str, str], str] = None,
             pointer_lock: Literal["enabled", "disabled"] = None,
             pointing_callback_function: Callable = None,
-            pointer_size: int = None) -> None:
+            pointer_size: int = None,
+            pointer_tooltip: Literal["enabled", "disabled"] = None,
+            streaming_fps: int = None) -> None:
         """
         Configures the properties of the chart widget based on the provided arguments.
       
@@ -1003,6 +1029,9 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             pointing_values_precision: The precision for the values displayed when pointing to data points.
             pointer_lock: The lock state of the pointer ('disabled' or 'enabled').
             pointer_size: The size of the pointer.
+            pointer_tooltip: Whether a tooltip with the pointed values of all lines is shown next to the pointer ('disabled' or 'enabled').
+
+            streaming_fps: The maximum number of redraws and pointer updates per second.
         """
 
         chart_reset_req: bool = False
@@ -1274,6 +1303,16 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             self.__pointer_size = pointer_size
             pointer_size_change_req = True
 
+        if pointer_tooltip is not None:
+            Validate._isValidPointerState_Lock(pointer_tooltip, "pointer_tooltip")
+            self.__pointer_tooltip = pointer_tooltip
+            if pointer_tooltip == "disabled":
+                self.__tooltip.place_forget()
+
+        if streaming_fps is not None:
+            Validate._isInt(streaming_fps, "streaming_fps")
+            self.__streaming_fps = streaming_fps
+
         if x_axis_point_spacing is not None:
             Validate._isValidXAxisPointSpacing(x_axis_point_spacing, "x_axis_point_spacing")
             if x_axis_point_spacing == "auto":
@@ -1355,6 +1394,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         """
 
         self.__output_canvas.delete("all")
+        self.__line_canvas_items = {}
         self.__real_width = (self.__width - (
                 self.__y_value_req_width_space + self.__axis_size + self.__x_axis_data_req_width_space_top +
                 self.__y_axis_data_req_width_space_side +
@@ -1373,7 +1413,6 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         self.__const_real_height = self.__real_height
 
         self.__output_canvas.place(y=0, x=0, height=self.__const_real_height, width=self.__const_real_width)
-        self.__place_x = 0
 
     def __reset_lines_info(self) -> None:
         """
@@ -1389,281 +1428,379 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         """
         Re-shows data on the chart.
 
-        This method recalculates the chart info, ensures that the chart can support the maximum amount of
-        data to be shown, resets each line with the latest data, and then displays the data for each line.
+        This method recalculates the chart info, which clears the canvas, and draws the newest values
+        of all lines again. A pending redraw is not needed anymore and gets cancelled.
         """
 
-        lines_values = [len(line._CTkLine__data) for line in self.__lines]
         self.__reset_chart_info()
+        self.__cancel_render()
+        self.__render_lines()
 
-        if len(lines_values) > 0:
-            maximum_data = max(lines_values)
-            max_support = int(self.__const_real_width / self.__x_axis_point_spacing) + 1
-
-            for line in self.__lines:
-                if maximum_data > max_support:
-                    line._CTkLine__temp_data = line._CTkLine__data[maximum_data - max_support::]
-                else:
-                    line._CTkLine__temp_data = line._CTkLine__data
-                line._CTkLine__reset()
-
-            for line in self.__lines:
-                self.show_data(line=line, data=line._CTkLine__temp_data)
-
-    def show_data(self, line: CTkLine, data: List[Union[int, float]]) -> None:
+    def show_data(self, line: CTkLine, data: Iterable[Union[int, float]]) -> None:
         """
         Show data on the chart for the given line.
 
         Args:
              line (CTkLine): The line object to which the data belongs.
-             data (List[Union[int, float]]): The list of data points to be displayed.
+             data (Iterable[Union[int, float]]): The data points to be displayed, a list, tuple, array.array,
+                numpy array, memoryview or iterator.
 
         Raises:
             ValueError: If the provided line object is not valid or not found in the chart.
          
-        This method adds the provided data to the line's existing data, adjusts the display of the chart accordingly,
-        and shows the data points on the chart. It also handles various styles for displaying the data points,
-        such as dashed or dotted lines, and highlights for individual data points.
+        This method adds the provided data to the line's existing data and redraws the lines when tkinter is idle,
+        so that many calls in a row cause only one redraw. Every line is drawn as one polyline, see __render_lines().
         """
 
         Validate._isValidCTkLine(line, "line")
         Validate._isValidData(data, "data")
 
-        re_show_data = False
         if line not in self.__lines:
             Validate._invalidCTkLine(line)
 
-        line._CTkLine__data += data
+        line._CTkLine__data += self.__to_float_array(data, "data")
+        self.__schedule_render(throttle=False)
 
-        if line._CTkLine__visibility:
+    def append(self, line: CTkLine, values: Iterable[Union[int, float]]) -> None:
+        """
+        Append values to a line in streaming mode.
 
-            line_color = ThemeManager.get_color_by_theme(line._CTkLine__color)
-            highlight_color = ThemeManager.get_color_by_theme(line._CTkLine__point_highlight_color)
-            fill_color = ThemeManager.get_color_by_theme(line._CTkLine__fill_color)
+        Args:
+            line (CTkLine): The line object to which the values belong.
+            values (Iterable[Union[int, float]]): The new values, a list, tuple, array.array, numpy array,
+                memoryview or iterator.
 
-            for d in data:
-                x_start = line._CTkLine__x_end
-                y_start = line._CTkLine__y_end
+        Raises:
+            ValueError: If the provided line object is not valid or not found in the chart.
 
-                line._CTkLine__x_end += self.__x_axis_point_spacing
+        Appending only stores the values, which costs O(number of new values). The chart is redrawn at most
+        streaming_fps times per second, a redraw shows the newest values of all lines in a sliding window and
+        reuses the canvas items of the previous redraw. Lines with a buffer_size keep a fixed amount of memory,
+        so data can be streamed for an unlimited time.
+        """
 
-                if d >= 0:
-                    d = d - self.__y_axis_min_value
-                    line._CTkLine__y_end = self.__const_real_height - (
-                            d / self.__y_axis_values_gap * self.__const_real_height)
-                else:
-                    d = abs(d) + self.__y_axis_max_value
-                    line._CTkLine__y_end = (d / self.__y_axis_values_gap * self.__const_real_height)
-                line._CTkLine__y_end += (line._CTkLine__size / 2)
+        Validate._isValidCTkLine(line, "line")
+        Validate._isValidData(values, "values")
+        if line not in self.__lines:
+            Validate._invalidCTkLine(line)
 
-                if round(line._CTkLine__x_end) > round(self.__real_width) and self.__real_width < self.__width * 5:
-                    self.__place_x -= self.__x_axis_point_spacing
+        line._CTkLine__data += self.__to_float_array(values, "values")
+        self.__schedule_render(throttle=True)
 
-                    self.__output_canvas.place(
-                        x=self.__place_x,
-                        width=self.__real_width + self.__x_axis_point_spacing
-                    )
+    @staticmethod
+    def __to_float_array(values: Iterable[Union[int, float]], var: str) -> Any:
+        """
+        Convert values to the array of doubles in which the lines store their values.
 
-                    self.__real_width += self.__x_axis_point_spacing
-
-                elif self.__real_width > self.__width * 5:
-                    re_show_data = True
-                    break
-
-                if line._CTkLine__fill == "enabled":
-                    points_of_polygon = [
-                        x_start, y_start,
-                        line._CTkLine__x_end, line._CTkLine__y_end,
-                        line._CTkLine__x_end, self.__const_real_height,
-                        x_start, self.__const_real_height
-                    ]
-                    self.__output_canvas.create_polygon(
-                        points_of_polygon, fill=fill_color
-                    )
+        Args:
+            values (Iterable[Union[int, float]]): The values to convert.
+            var (str): The name of the argument, used in the error message.
 
-                if line._CTkLine__style == "dashed":
-                    dash_width = line._CTkLine__style_type[0]
-                    space_width = line._CTkLine__style_type[1]
-                    total_width = dash_width + space_width
-                    real_x_axis_point_spacing = ((abs(y_start - line._CTkLine__y_end) ** 2) + (
-                            self.__x_axis_point_spacing ** 2)) ** (1 / 2)
-                    dash_count = real_x_axis_point_spacing / (dash_width + space_width)
-                    total_change_x = (line._CTkLine__x_end - x_start)
-                    total_change_y = (line._CTkLine__y_end - y_start)
-                    dash_change_percentage = dash_width / total_width
-                    space_change_percentage = space_width / total_width
-                    change_x = (total_change_x / dash_count)
-                    change_y = (total_change_y / dash_count)
-                    dash_change_x = change_x * dash_change_percentage
-                    dash_change_y = change_y * dash_change_percentage
-                    space_change_x = change_x * space_change_percentage
-                    space_change_y = change_y * space_change_percentage
-                    dashed_x_start = x_start
-                    dashed_y_start = y_start
-                    if y_start > line._CTkLine__y_end:
-                        line_going = "to_up"
-                    else:
-                        line_going = "to_down"
-                    while line._CTkLine__x_end > dashed_x_start:
-                        dashed_x_end = dashed_x_start + dash_change_x
-                        dashed_y_end = dashed_y_start + dash_change_y
-                        if dashed_x_end > line._CTkLine__x_end:
-                            dashed_x_end = dashed_x_end - (dashed_x_end - line._CTkLine__x_end)
-                        if dashed_y_end <= line._CTkLine__y_end and line_going == "to_up":
-                            dashed_y_end = dashed_y_end - (dashed_y_end - line._CTkLine__y_end)
-                        if dashed_y_end > line._CTkLine__y_end and line_going == "to_down":
-                            dashed_y_end = dashed_y_end - (dashed_y_end - line._CTkLine__y_end)
-                        self.__output_canvas.create_line(
-                            dashed_x_start, dashed_y_start,
-                            dashed_x_end, dashed_y_end,
-                            fill=line_color, width=line._CTkLine__size
-                        )
-                        dashed_x_start += dash_change_x + space_change_x
-                        dashed_y_start += dash_change_y + space_change_y
-
-                elif line._CTkLine__style == "dotted":
-                    circle_size = line._CTkLine__style_type[0]
-                    space_width = line._CTkLine__style_type[1]
-                    total_width = circle_size + space_width
-                    real_x_axis_point_spacing = ((abs(y_start - line._CTkLine__y_end) ** 2) + (
-                            self.__x_axis_point_spacing ** 2)) ** (1 / 2)
-                    circle_count = real_x_axis_point_spacing / (circle_size + space_width)
-                    total_change_x = (line._CTkLine__x_end - x_start)
-                    total_change_y = (line._CTkLine__y_end - y_start)
-                    circle_change_percentage = circle_size / total_width * 100
-                    space_change_percentage = space_width / total_width * 100
-                    circle_change_x = (total_change_x / circle_count) / 100 * circle_change_percentage
-                    circle_change_y = (total_change_y / circle_count) / 100 * circle_change_percentage
-                    space_change_x = (total_change_x / circle_count) / 100 * space_change_percentage
-                    space_change_y = (total_change_y / circle_count) / 100 * space_change_percentage
-                    dotted_x_start = x_start
-                    dotted_y_start = y_start
-
-                    while line._CTkLine__x_end > dotted_x_start:
-                        self.__output_canvas.create_oval(
-                            dotted_x_start - circle_size / 2,
-                            dotted_y_start - circle_size / 2,
-                            dotted_x_start + circle_size - circle_size / 2,
-                            dotted_y_start + circle_size - circle_size / 2,
-                            fill=line_color, outline=line_color
-                        )
-                        dotted_x_start += circle_change_x + space_change_x
-                        dotted_y_start += circle_change_y + space_change_y
-
-                elif line._CTkLine__style == "normal":
-                    self.__output_canvas.create_line(
-                        x_start, y_start,
-                        line._CTkLine__x_end, line._CTkLine__y_end,
-                        fill=line_color, width=line._CTkLine__size
-                    )
+        Returns:
+            array: The values as array('d').
 
-                if line._CTkLine__point_highlight == "enabled" and line._CTkLine__point_highlight_size > 0:
-                    highlight_size = line._CTkLine__point_highlight_size / 2
-                    self.__output_canvas.create_oval(
-                        line._CTkLine__x_end - highlight_size,
-                        line._CTkLine__y_end - highlight_size,
-                        line._CTkLine__x_end + highlight_size,
-                        line._CTkLine__y_end + highlight_size,
-                        fill=highlight_color,
-                        outline=highlight_color
-                    )
+        Raises:
+            TypeError: If a value is not int or float.
+        """
+
+        try:
+            return to_float_array(values)
+        except (TypeError, ValueError):
+            Validate._invalidData(var)
+
+    def __schedule_render(self, throttle: bool) -> None:
+        """
+        Schedule one redraw for all values added until then.
+
+        Args:
+            throttle (bool): True to redraw at most streaming_fps times per second, False to redraw when tkinter is idle.
+        """
+
+        if self.__render_job is not None:
+            if throttle or self.__render_job_idle:
+                return
+            self.__output_canvas.after_cancel(self.__render_job)
+
+        if throttle:
+            delay = 1 / self.__streaming_fps - (time.perf_counter() - self.__last_render_time)
+            self.__render_job = self.__output_canvas.after(max(int(delay * 1000), 0), self.__render_callback)
+        else:
+            self.__render_job = self.__output_canvas.after_idle(self.__render_callback)
+        self.__render_job_idle = not throttle
+
+    def __cancel_render(self) -> None:
+        """
+        Cancel a scheduled redraw.
+        """
+
+        if self.__render_job is not None:
+            self.__output_canvas.after_cancel(self.__render_job)
+            self.__render_job = None
+
+    def __render_callback(self) -> None:
+        """
+        Redraw the lines, called by a redraw scheduled with __schedule_render().
+        """
+
+        self.__render_job = None
+        self.__last_render_time = time.perf_counter()
+        self.__render_lines()
+
+    @staticmethod
+    def __get_data_count(line: CTkLine) -> int:
+        """
+        Get the number of values added to a line, including values dropped by its ring buffer.
+        """
+
+        data = line._CTkLine__data
+        if isinstance(data, RingBuffer):
+            return data.total_count
+        return len(data)
+
+    def __get_first_index(self, data_counts: List[int]) -> int:
+        """
+        Get the index of the value at x = 0 of the sliding window, for the data counts of all lines.
+        """
+
+        max_view = int(self.__const_real_width / self.__x_axis_point_spacing) + 1
+        return max(max(data_counts, default=0) - max_view, 0)
+
+    @staticmethod
+    def __get_visible_values(line: CTkLine, data_count: int, first_index: int) -> Any:
+        """
+        Get the values of a line which are in the sliding window that starts at first_index.
+        """
+
+        data = line._CTkLine__data
+        count = max(min(data_count - first_index, len(data)), 0)
+        if isinstance(data, RingBuffer):
+            return data.tail(count)
+        return data[len(data) - count:]
 
-                    self.__output_canvas.create_oval(
-                        x_start - highlight_size,
-                        y_start - highlight_size,
-                        x_start + highlight_size,
-                        y_start + highlight_size,
-                        fill=highlight_color,
-                        outline=highlight_color
+    def __render_lines(self) -> None:
+        """
+        Draw the newest values of all lines in the sliding window.
+
+        Every visible line is drawn as one polyline and one fill polygon, which are created once and
+        then only get new coordinates, so a redraw never deletes and re-creates canvas items. If there
+        are more values than pixels, only the minimum and maximum value of every pixel column are drawn,
+        which keeps the envelope of the line identical with at most two vertices per pixel.
+        """
+
+        canvas = self.__output_canvas
+        data_counts = [self.__get_data_count(line) for line in self.__lines]
+        first_index = self.__get_first_index(data_counts)  # index of the value at x = 0
+        scale = self.__const_real_height / self.__y_axis_values_gap
+
+        for line, data_count in zip(self.__lines, data_counts):
+            items = self.__line_canvas_items.setdefault(line, {"line": None, "fill": None, "highlights": []})
+            data = line._CTkLine__data
+            count = min(data_count - first_index, len(data))
+
+            if not line._CTkLine__visibility or count < 1:
+                for item in [items["line"], items["fill"]] + items["highlights"]:
+                    if item is not None:
+                        canvas.delete(item)
+                del self.__line_canvas_items[line]
+                continue
+
+            values = self.__get_visible_values(line, data_count, first_index)
+
+            x_start = (data_count - count - first_index) * self.__x_axis_point_spacing
+            x_values, values = Utils._min_max_decimate(values, x_start, self.__x_axis_point_spacing)
+            decimated = len(values) < count
+
+            y_offset = self.__y_axis_max_value * scale + line._CTkLine__size / 2
+            coords = Utils._to_canvas_coords(x_values, values, y_offset, scale)
+            if len(coords) == 2:
+                coords = coords * 2
+
+            if line._CTkLine__fill != "enabled" and items["fill"] is not None:
+                canvas.delete(items["fill"])
+                items["fill"] = None
+            elif line._CTkLine__fill == "enabled":
+                fill_coords = coords + [coords[-2], self.__const_real_height, coords[0], self.__const_real_height]
+                if items["fill"] is None:
+                    items["fill"] = canvas.create_polygon(
+                        fill_coords, fill=ThemeManager.get_color_by_theme(line._CTkLine__fill_color), tags="line_fill"
                     )
+                    canvas.tag_lower("line_fill")
+                else:
+                    canvas.coords(items["fill"], fill_coords)
+
+            if items["line"] is None:
+                dotted = line._CTkLine__style == "dotted"
+                items["line"] = canvas.create_line(
+                    coords,
+                    fill=ThemeManager.get_color_by_theme(line._CTkLine__color),
+                    width=line._CTkLine__style_type[0] if dotted else line._CTkLine__size,
+                    dash=Utils._get_line_dash(line._CTkLine__style, line._CTkLine__style_type),
+                    capstyle=tkinter.ROUND if dotted else tkinter.BUTT,
+                    joinstyle=tkinter.ROUND,
+                    tags="line"
+                )
+            else:
+                canvas.coords(items["line"], coords)
+
+            # highlight ovals are reused as well, only the surplus of a shrinking window is deleted
+            highlights = items["highlights"]
+            highlight_count = 0
+            if line._CTkLine__point_highlight == "enabled" and line._CTkLine__point_highlight_size > 0 and not decimated:
+                highlight_size = line._CTkLine__point_highlight_size / 2
+                highlight_color = ThemeManager.get_color_by_theme(line._CTkLine__point_highlight_color)
+                highlight_count = len(coords) // 2
+                for i in range(highlight_count):
+                    oval_coords = (coords[i * 2] - highlight_size, coords[i * 2 + 1] - highlight_size,
+                                   coords[i * 2] + highlight_size, coords[i * 2 + 1] + highlight_size)
+                    if i < len(highlights):
+                        canvas.coords(highlights[i], oval_coords)
+                    else:
+                        highlights.append(canvas.create_oval(
+                            oval_coords, fill=highlight_color, outline=highlight_color, tags="line_highlight"
+                        ))
+            for item in highlights[highlight_count:]:
+                canvas.delete(item)
+            del highlights[highlight_count:]
 
-            if re_show_data:
-                self.__reshow_data()
+        canvas.tag_raise("line_highlight")
 
     def __hide_pointer(self, _event: tkinter.Event) -> None:
         """
-        Hides the pointer widget from the GUI canvas.
+        Hides the pointer widget and the tooltip from the GUI canvas.
 
         Args:
             _event (tkinter.Event): The event triggering the pointer hiding.
         """
 
+        if self.__pointer_job is not None:
+            self.__output_canvas.after_cancel(self.__pointer_job)
+            self.__pointer_job = None
         self.__pointer.place_forget()
+        self.__tooltip.place_forget()
 
     def __return_pointed_values(self, event: tkinter.Event) -> None:
         """
-        Returns the values pointed by the user's mouse cursor.
+        Schedules the update of the values pointed by the user's mouse cursor.
 
         Args:
             event (tkinter.Event): The mouse event containing cursor position.
+
+        Mouse motions arrive much more often than the chart is redrawn, so only the newest cursor position is
+        kept and the pointed values are updated at most streaming_fps times per second.
         """
 
-        def round_x(x) -> Union[int, float]:
-            """
-            Rounds the x-coordinate to the nearest x-axis point spacing.
+        self.__pointer_event_x = event.x
+        if self.__pointer_job is not None:
+            return
 
-            Args:
-                x (float): The x-coordinate to be rounded.
+        delay = 1 / self.__streaming_fps - (time.perf_counter() - self.__last_pointer_time)
+        self.__pointer_job = self.__output_canvas.after(max(int(delay * 1000), 0), self.__update_pointed_values)
 
-            Returns:
-                float: The rounded x-coordinate.
-            """
+    @staticmethod
+    def __get_value(line: CTkLine, data_count: int, index: int) -> Union[float, None]:
+        """
+        Get a value of the line by its index in all values ever added to the line.
+
+        Args:
+            line (CTkLine): The line object.
+            data_count (int): The number of values ever added to the line.
+            index (int): The index of the value.
+
+        Returns:
+            Union[float, None]: The value, or None if the line has no value at the index.
+        """
+
+        data = line._CTkLine__data
+        index -= data_count - len(data)  # values dropped by a buffer_size come before the first stored value
+        if 0 <= index < len(data):
+            return data[index]
+        return None
+
+    def __update_pointed_values(self) -> None:
+        """
+        Updates the pointer, the tooltip and calls the pointing callback function for the newest cursor position.
+
+        The cursor position is mapped directly to an index in the window drawn by __render_lines(), so a value of
+        every line is looked up in O(1) without copying the data of the lines.
+        """
+
+        self.__pointer_job = None
+        self.__last_pointer_time = time.perf_counter()
+
+        spacing = self.__x_axis_point_spacing
+        data_counts = [self.__get_data_count(line) for line in self.__lines]
+        first_index = self.__get_first_index(data_counts)  # index of the value at x = 0
+
+        event_x = self.__pointer_event_x
+        if self.__pointer_lock == "enabled":
+            event_x = round(event_x / spacing) * spacing
+        if event_x == self.__real_width:
+            self.__pointer.place(x=((event_x - self.__pointer_size / 2) - 2), y=0)
+        else:
+            self.__pointer.place(x=((event_x - self.__pointer_size / 2) + 1), y=0)
 
-            x_ = (x // self.__x_axis_point_spacing) * self.__x_axis_point_spacing
-            if x % self.__x_axis_point_spacing >= self.__x_axis_point_spacing / 2:
-                x_ += self.__x_axis_point_spacing
-            return x_
+        index_float = event_x / spacing
+        index_int = int(index_float)
+        x_index = index_int
+        if index_float != 0 and index_float == index_int:
+            x_index -= 1
 
-        max_sup = int(self.__const_real_width / self.__x_axis_point_spacing)
-        max_view = max_sup + 1
         values = []
-        try:
-            max_data = max([len(line._CTkLine__data) for line in self.__lines])
-            if self.__pointer_lock == "enabled":
-                event_x = round_x(event.x)
-            else:
-                event_x = event.x
-            if self.__const_real_width >= self.__real_width:
-                event_x_converted = event_x
+        for line, data_count in zip(self.__lines, data_counts):
+            value = self.__get_value(line, data_count, first_index + index_int)
+            if value is not None and index_float != index_int:
+                next_value = self.__get_value(line, data_count, first_index + index_int + 1)
+                value = None if next_value is None else value + (next_value - value) * (index_float - index_int)
+            if value is None:
+                values.append("null")
             else:
-                event_x_converted = event_x - (self.__x_axis_point_spacing * (max_data - max_view))
-            width_x = self.__const_real_width - (self.__const_real_width - (self.__x_axis_point_spacing * max_sup))
-            index_float = ((event_x_converted / width_x) * max_sup)
-            index_round_float = round(index_float)
-            if event_x == self.__real_width:
-                self.__pointer.place(x=((event_x - self.__pointer_size / 2) - 2), y=0)
-            else:
-                self.__pointer.place(x=((event_x - self.__pointer_size / 2) + 1), y=0)
-            index_int = int(index_float)
-            x_index = index_int
-            if index_float != 0 and index_float == index_int:
-                x_index -= 1
-            for line in self.__lines:
-                line._CTkLine__ret_data = line._CTkLine__data + (max_data - len(line._CTkLine__data)) * [None]
-                line._CTkLine__ret_data = line._CTkLine__ret_data[-int(max_view)::]
-                line._CTkLine__ret_data = line._CTkLine__ret_data + (int(max_view) - len(line._CTkLine__ret_data)) * [
-                    None]
-            for line in self.__lines:
-                try:
-                    if self.__pointer_lock == "enabled":
-                        value = line._CTkLine__ret_data[int(index_round_float)]
-                    else:
-                        if index_float == index_int:
-                            value = line._CTkLine__ret_data[index_int]
-                        else:
-                            value = line._CTkLine__ret_data[index_int]
-                            value = value + (
-                                ((line._CTkLine__ret_data[index_int + 1] - value) * (index_float - index_int)))
-                    values.append(Utils._format_float_with_precision(float(value), self.__pointing_values_precision))
-                except:
-                    values.append("null")
-            if self.__pointing_callback_function is not None:
-                try:
-                    self.__pointing_callback_function(self.__x_axis_values[x_index], values)
-                except:
-                    self.__pointing_callback_function("null", values)
-        except:
-            pass
+                values.append(Utils._format_float_with_precision(float(value), self.__pointing_values_precision))
+
+        try:
+            x_value = self.__x_axis_values[x_index]
+        except (IndexError, TypeError):
+            x_value = "null"
+
+        if self.__pointer_tooltip == "enabled":
+            self.__show_tooltip(event_x, x_value, values)
+
+        if self.__pointing_callback_function is not None:
+            try:
+                self.__pointing_callback_function(x_value, values)
+            except:
+                self.__pointing_callback_function("null", values)
+
+    def __show_tooltip(self, event_x: Union[int, float], x_value: Any, values: List[str]) -> None:
+        """
+        Shows the x-axis value and the pointed values of all visible lines next to the pointer.
+
+        Args:
+            event_x (Union[int, float]): The x-coordinate of the pointer.
+            x_value (Any): The pointed x-axis value.
+            values (List[str]): The formatted pointed values of all lines.
+        """
+
+        rows = [(str(x_value), self.__x_axis_font_color)]
+        rows += [(value, line._CTkLine__color) for line, value in zip(self.__lines, values) if line._CTkLine__visibility]
+
+        # the labels are reused, they are only created or destroyed if the number of visible lines changes
+        while len(self.__tooltip_labels) < len(rows):
+            label = tkinter.Label(master=self.__tooltip, anchor="w", padx=6, pady=0, font=self.__axis_font_style)
+            label.pack(fill="x")
+            self.__tooltip_labels.append(label)
+        while len(self.__tooltip_labels) > len(rows):
+            self.__tooltip_labels.pop().destroy()
+
+        for label, (text, color) in zip(self.__tooltip_labels, rows):
+            label.configure(text=text, fg=ThemeManager.get_color_by_theme(color),
+                            bg=ThemeManager.get_color_by_theme(self.__bg_color))
+
+        # the tooltip is shown on the left of the pointer if there is not enough space on its right
+        if event_x + 10 + self.__tooltip.winfo_reqwidth() > self.__const_real_width:
+            self.__tooltip.place(x=event_x - 10, y=10, anchor="ne")
+        else:
+            self.__tooltip.place(x=event_x + 10, y=10, anchor="nw")
+        self.__tooltip.lift()
 
     def place(
             self,
@@ -1866,7 +2003,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
                 "y_space", "x_space", "pointer_state",
                 "pointing_callback_function", "pointer_color",
                 "pointing_values_precision", "pointer_lock",
-                "pointer_size", "__all__"
+                "pointer_size", "pointer_tooltip", "streaming_fps", "__all__"
             ] = "__all__") -> Any:
         """
         Get the value of the specified attribute.
@@ -1954,6 +2091,10 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
             return self.__pointer_lock
         if attribute_name == "pointer_size":
             return self.__pointer_size
+        if attribute_name == "pointer_tooltip":
+            return self.__pointer_tooltip
+        if attribute_name == "streaming_fps":
+            return self.__streaming_fps
 
         if attribute_name == "__all__":
             return {
@@ -1994,11 +2135,38 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
                 "pointer_color": self.__pointer_color,
                 "pointing_values_precision": self.__pointing_values_precision,
                 "pointer_lock": self.__pointer_lock,
-                "pointer_size": self.__pointer_size
+                "pointer_size": self.__pointer_size,
+                "pointer_tooltip": self.__pointer_tooltip,
+                "streaming_fps": self.__streaming_fps
             }
 
         Validate._invalidCget(attribute_name)
 
+    def to_image(self, antialias: int = 2) -> Any:
+        """
+        Render the chart to an image.
+
+        Args:
+            antialias (int): Factor of supersampling when the image is rendered.
+
+        Returns:
+            PIL.Image.Image: The chart with the current options, values and appearance mode.
+
+        The image is drawn with the headless renderer of LineChartImage, so it does not depend on the window,
+        the chart can even be hidden. Use render_line_chart() to draw a chart without creating a widget.
+        """
+
+        from .LineChartImage import render_line_chart  # LineChartImage takes the default options from this module
+
+        lines = []
+        for line in self.__lines:
+            line_options = line.cget("__all__")
+            del line_options["master"]
+            lines.append(dict(line_options, data=line._CTkLine__data, visible=line._CTkLine__visibility))
+
+        return render_line_chart(lines, appearance_mode=customtkinter.get_appearance_mode(), antialias=antialias,
+                                 **self.cget("__all__")).to_image()
+
     def get_line_visibility(self, line: CTkLine):
         """
         Get the visibility state of a specific line.
@@ -2052,16 +2220,9 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         Validate._isValidCTkLine(line, "line")
         if line not in self.__lines:
             Validate._invalidCTkLine(line)
-        lines_values = [len(line_._CTkLine__data) for line_ in self.__lines]
-
-        if len(lines_values) > 0:
-            maximum_data = max(lines_values)
-            max_support = int(self.__const_real_width / self.__x_axis_point_spacing) + 1
-           
-            if maximum_data > max_support:
-                line._CTkLine__temp_data = line._CTkLine__data[maximum_data - max_support::]
-            else:
-                line._CTkLine__temp_data = line._CTkLine__data
+        # same window as __render_lines(), lines are aligned by the number of values ever added to them
+        first_index = self.__get_first_index([self.__get_data_count(line_) for line_ in self.__lines])
+        line._CTkLine__temp_data = self.__get_visible_values(line, self.__get_data_count(line), first_index)
                 
         # print(self.__x_axis_point_spacing)
         total_area = 0
@@ -2218,6 +2379,7 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         self.__y_axis_frame.destroy()
         self.__x_axis_frame.destroy()
         self.__pointer.destroy()
+        self.__tooltip.destroy()
 
         # Deleting attributes to help with garbage collection
         del self.__main_frame
@@ -2230,6 +2392,8 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         del self.__y_axis_frame
         del self.__x_axis_frame
         del self.__pointer
+        del self.__tooltip
+        del self.__tooltip_labels
         del self.__master
         del self.__height
         del self.__width
@@ -2276,14 +2440,22 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
         del self.__pointer_lock
         del self.__pointer_size
         del self.__pointer_color
+        del self.__pointer_tooltip
+        del self.__pointer_event_x
+        del self.__pointer_job
+        del self.__last_pointer_time
         del self.__x_values_frame_place_req
         del self.__y_values_frame_place_req
-        del self.__place_x
         del self.__real_height
         del self.__real_width
         del self.__const_real_height
         del self.__const_real_width
         del self.__visibility
+        del self.__streaming_fps
+        del self.__render_job
+        del self.__render_job_idle
+        del self.__last_render_time
+        del self.__line_canvas_items
         del self.__place_info_x
         del self.__place_info_y
         del self.__place_info_rely
@@ -2307,6 +2479,10 @@ Author: Thisal Dilmith | https://github.com/Thisal-D
 
     def destroy(self) -> None:
         ThemeManager.unbind_widget(self)
+        self.__cancel_render()
+        if self.__pointer_job is not None:
+            self.__output_canvas.after_cancel(self.__pointer_job)
+            self.__pointer_job = None
         for line in self.__lines:
             line.destroy()
 
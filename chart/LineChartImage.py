@@ -0,0 +1,221 @@
+import inspect
+from typing import Any, Dict, List, Tuple, Union
+from ..imageCanvas import ImageCanvas
+from .DataBuffer import RingBuffer, to_float_array
+from .Line import CTkLine
+from .LineChart import CTkLineChart
+from .Utils import Utils
+
+
+def _get_defaults(function: Any) -> Dict[str, Any]:
+    return {name: parameter.default for name, parameter in inspect.signature(function).parameters.items()
+            if parameter.default is not inspect.Parameter.empty}
+
+
+# the headless chart takes the same options as the widgets, with the same defaults
+CHART_DEFAULTS: Dict[str, Any] = _get_defaults(CTkLineChart.__init__)
+LINE_DEFAULTS: Dict[str, Any] = dict(_get_defaults(CTkLine.__init__), data=(), visible=True)
+
+
+def render_line_chart(
+        lines: List[Dict[str, Any]],
+        appearance_mode: str = "light",
+        antialias: int = 2,
+        **options: Any) -> ImageCanvas:
+    """
+    Render a line chart without a window.
+
+    Args:
+        lines (List[Dict[str, Any]]): One dict per line with the data of the line ("data", a list, array, numpy
+            array or iterator), the options of CTkLine ("color", "size", "style", "fill", ...) and "visible".
+        appearance_mode (str): 'light' or 'dark', used for (light, dark) color tuples.
+        antialias (int): Factor of supersampling when the image is rendered.
+        **options: The options of CTkLineChart, for example width, height, y_axis_values, x_axis_values.
+
+    Returns:
+        ImageCanvas: The drawn chart, to_image() and to_png() render it, find_all() returns its items.
+
+    Raises:
+        TypeError: If an option is not an option of CTkLineChart or CTkLine.
+        ValueError: If y_axis_values are not given or x_axis_values are empty.
+
+    The chart is laid out like the widget: y-axis labels on the left, x-axis labels below the chart, sections and
+    axes, and the newest values of every line in the sliding window drawn with the same decimation as the widget.
+    """
+
+    for name in options:
+        if name not in CHART_DEFAULTS:
+            raise TypeError(f"render_line_chart() got an unexpected keyword argument '{name}'")
+    options = dict(CHART_DEFAULTS, **options)
+    y_min, y_max = options["y_axis_values"]
+    if y_min is None or y_max is None:
+        raise ValueError("y_axis_values must be given")
+    if len(options["x_axis_values"]) == 0:
+        raise ValueError("x_axis_values must not be empty")
+
+    canvas = ImageCanvas(options["width"], options["height"], bg=options["bg_color"],
+                         appearance_mode=appearance_mode, antialias=antialias)
+    x0, y0, width, height = _layout(canvas, options)
+
+    canvas.create_rectangle(x0, y0, x0 + width, y0 + height, fill=options["fg_color"], outline="")
+    _draw_lines(canvas, lines, options, x0, y0, width, height)
+    # the sections of the widget are frames, which are shown above the canvas of the lines
+    _draw_sections(canvas, options, x0, y0, width, height)
+
+    axis_size = options["axis_size"]
+    canvas.create_rectangle(x0 - axis_size, y0, x0, y0 + height + axis_size, fill=options["axis_color"], outline="")
+    canvas.create_rectangle(x0 - axis_size, y0 + height, x0 + width, y0 + height + axis_size,
+                            fill=options["axis_color"], outline="")
+    return canvas
+
+
+def _get_y_axis_labels(options: Dict[str, Any]) -> List[str]:
+    # same values as CTkLineChart.__set_y_axis_values()
+    y_min, y_max = options["y_axis_values"]
+    count = options["y_axis_label_count"]
+    labels = []
+    for i in range(count + 1 if count > 0 else 0):
+        value = y_max - (abs(y_max - y_min) / count) * i
+        if y_min == 0 and i == count:
+            value = 0
+        labels.append(Utils._format_float_with_precision(value, options["y_axis_precision"]))
+    return labels
+
+
+def _get_x_axis_labels(options: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    # (position from the right, value) of the x-axis labels, same as CTkLineChart.__configure_x_axis_labels_info()
+    values = options["x_axis_values"]
+    indices = options["x_axis_display_values_indices"]
+    if indices is not None:
+        return [(len(values) - 1 - index, values[index]) for index in Utils._sort_tuple(indices)]
+
+    label_count = options["x_axis_label_count"]
+    if label_count == 0:
+        return []
+    if label_count is None or label_count > len(values):
+        label_count = len(values)
+    while len(values) % label_count != 0:
+        label_count += 1
+    index_change = int(len(values) / label_count)
+    return [(i * index_change, values[-1 - i * index_change]) for i in range(label_count)]
+
+
+def _layout(canvas: ImageCanvas, options: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """ draws the axis labels and returns x, y, width and height of the area of the lines """
+
+    margin = 10
+    axis_font, data_font = options["axis_font_style"], options["data_font_style"]
+
+    y_labels = _get_y_axis_labels(options)
+    x_labels = _get_x_axis_labels(options)
+    y_data = options["y_axis_data"] if options["y_axis_data_position"] == "top" else "\n".join(str(options["y_axis_data"]))
+    x_data = str(options["x_axis_data"])
+
+    y_label_width = max((canvas.text_size(label, axis_font)[0] for label in y_labels), default=0)
+    x_label_height = max((canvas.text_size(value, axis_font)[1] for _, value in x_labels), default=0)
+    y_data_height = canvas.text_size(y_data, data_font)[1] if y_data else 0
+    x_data_width = canvas.text_size(x_data, data_font)[0] if x_data else 0
+
+    x0 = margin + y_label_width + 5 + options["axis_size"] + options["y_space"]
+    y0 = margin + y_data_height + 5
+    # the last x-axis label is centered on the right end of the chart, the x-axis data is shown next to it
+    last_label_width = canvas.text_size(x_labels[0][1], axis_font)[0] if x_labels else 0
+    x1 = options["width"] - margin - (x_data_width + 5 if x_data else 0) - last_label_width / 2
+    y1 = options["height"] - margin - x_label_height - 5 - options["axis_size"] - options["x_space"]
+    width, height = max(x1 - x0, 1), max(y1 - y0, 1)
+
+    if y_data:
+        canvas.create_text(margin, margin, text=y_data, anchor="nw", font=data_font,
+                           fill=options["y_axis_data_font_color"])
+    if x_data:
+        canvas.create_text(options["width"] - margin, y1 + options["axis_size"] + options["x_space"] + 3, text=x_data,
+                           anchor="ne", font=data_font, fill=options["x_axis_data_font_color"])
+
+    for i, label in enumerate(y_labels):
+        canvas.create_text(x0 - options["axis_size"] - 5, y0 + height / (len(y_labels) - 1) * i, text=label,
+                           anchor="e", font=axis_font, fill=options["y_axis_font_color"])
+
+    label_spacing = width / len(options["x_axis_values"])
+    for position, value in x_labels:
+        canvas.create_text(x0 + width - position * label_spacing, y1 + options["axis_size"] + options["x_space"] + 3,
+                           text=value, anchor="n", font=axis_font, fill=options["x_axis_font_color"])
+
+    return x0, y0, width, height
+
+
+def _draw_sections(canvas: ImageCanvas, options: Dict[str, Any], x0: float, y0: float, width: float, height: float):
+    # same positions as CTkLineChart.__create_y_axis_sections() and __create_x_axis_sections()
+    count = options["y_axis_section_count"]
+    dash = options["y_axis_section_style_type"] if options["y_axis_section_style"] == "dashed" else None
+    for i in range(count):
+        y = y0 + height / count * i
+        canvas.create_line(x0, y, x0 + width, y, fill=options["y_axis_section_color"], width=1, dash=dash)
+
+    count = options["x_axis_section_count"]
+    dash = options["x_axis_section_style_type"] if options["x_axis_section_style"] == "dashed" else None
+    for i in range(count):
+        x = x0 + width - 1 - width / count * i
+        canvas.create_line(x, y0, x, y0 + height, fill=options["x_axis_section_color"], width=1, dash=dash)
+
+
+def _draw_lines(canvas: ImageCanvas, lines: List[Dict[str, Any]], options: Dict[str, Any],
+                 x0: float, y0: float, width: float, height: float):
+    """ draws the lines like CTkLineChart.__render_lines(), one polyline and one fill polygon per line """
+
+    spacing = options["x_axis_point_spacing"]
+    if spacing == "auto":
+        spacing = width / len(options["x_axis_values"])
+    y_min, y_max = options["y_axis_values"]
+    scale = height / abs(y_max - y_min)
+
+    line_data: List[Tuple[Dict[str, Any], Union[RingBuffer, Any], int]] = []
+    for line in lines:
+        for name in line:
+            if name not in LINE_DEFAULTS:
+                raise TypeError(f"render_line_chart() got an unexpected line option '{name}'")
+        line = dict(LINE_DEFAULTS, **line)
+        data = line["data"]
+        if isinstance(data, RingBuffer):
+            line_data.append((line, data, data.total_count))
+        else:
+            data = to_float_array(data)
+            line_data.append((line, data, len(data)))
+
+    max_view = int(width / spacing) + 1
+    first_index = max(max((count for _, _, count in line_data), default=0) - max_view, 0)
+
+    drawn_lines = []
+    for line, data, data_count in line_data:
+        count = min(data_count - first_index, len(data))
+        if not line["visible"] or count < 1:
+            continue
+
+        values = data.tail(count) if isinstance(data, RingBuffer) else data[len(data) - count:]
+        x_start = x0 + (data_count - count - first_index) * spacing
+        x_values, values = Utils._min_max_decimate(values, x_start, spacing)
+        decimated = len(values) < count
+
+        y_offset = y0 + y_max * scale + line["size"] / 2
+        coords = Utils._to_canvas_coords(x_values, values, y_offset, scale)
+        if len(coords) == 2:
+            coords = coords * 2
+
+        # fills are drawn first, below all lines
+        if line["fill"] == "enabled":
+            canvas.create_polygon(coords + [coords[-2], y0 + height, coords[0], y0 + height],
+                                  fill=line["fill_color"], tags="line_fill")
+        drawn_lines.append((line, coords, decimated))
+
+    for line, coords, decimated in drawn_lines:
+        dotted = line["style"] == "dotted"
+        canvas.create_line(coords, fill=line["color"], width=line["style_type"][0] if dotted else line["size"],
+                           dash=Utils._get_line_dash(line["style"], line["style_type"]),
+                           capstyle="round" if dotted else "butt", joinstyle="round", tags="line")
+
+        if line["point_highlight"] == "enabled" and line["point_highlight_size"] > 0 and not decimated:
+            size = line["point_highlight_size"] / 2
+            for x, y in zip(coords[0::2], coords[1::2]):
+                canvas.create_oval(x - size, y - size, x + size, y + size, fill=line["point_highlight_color"],
+                                   outline=line["point_highlight_color"], tags="line_highlight")
+
+    canvas.tag_raise("line_highlight")
@@ -1,5 +1,11 @@
+import math
 import tkinter
-from typing import Union, Tuple, Any
+from typing import Union, Tuple, Any, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # decimation and scaling fall back to plain python loops
 
 
 class Utils:
@@ -54,3 +60,82 @@ class Utils:
     def _toInt(value: Union[int, str]) -> int:
         # return math.ceil(value)
         return value
+
+    @staticmethod
+    def _get_line_dash(style: str, style_type: Tuple[int, int]) -> Tuple[int, ...]:
+        # Tk dash pattern of a line style, an empty tuple draws a solid line
+        if style == "dashed":
+            return tuple(min(max(int(value), 1), 255) for value in style_type)
+        if style == "dotted":
+            # dots of style_type[0] pixels are drawn as round caps of 1 pixel long dashes
+            return 1, min(max(int(style_type[0] + style_type[1]), 1), 255)
+        return ()
+
+    @staticmethod
+    def _min_max_decimate(values: Sequence[float], x_start: float, x_spacing: float) -> Tuple[Sequence[float], Sequence[float]]:
+        # keeps the minimum and the maximum value of every pixel column in their original order, so that a line
+        # with more values than pixels is drawn with at most two vertices per pixel and the same envelope
+        count = len(values)
+        if np is not None:
+            return Utils.__min_max_decimate_numpy(np.asarray(values, dtype=np.float64), x_start, x_spacing)
+        if x_spacing >= 0.5 or count <= 2:
+            return [x_start + i * x_spacing for i in range(count)], list(values)
+
+        x_values, decimated_values = [], []
+        start = 0
+        last_column = math.floor(x_start + (count - 1) * x_spacing)
+        for column in range(math.floor(x_start), last_column + 1):
+            end = count if column == last_column else min(count, math.ceil((column + 1 - x_start) / x_spacing))
+            if end <= start:
+                continue
+
+            chunk = values[start:end]
+            min_index = start + chunk.index(min(chunk))
+            max_index = start + chunk.index(max(chunk))
+            for index in sorted({min_index, max_index}):
+                x_values.append(x_start + index * x_spacing)
+                decimated_values.append(values[index])
+            start = end
+        return x_values, decimated_values
+
+    @staticmethod
+    def __min_max_decimate_numpy(values: Any, x_start: float, x_spacing: float) -> Tuple[Any, Any]:
+        count = len(values)
+        indices = np.arange(count)
+        if x_spacing >= 0.5 or count <= 2:
+            return x_start + indices * x_spacing, values
+
+        columns = np.floor(x_start + indices * x_spacing).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(columns)) + 1))
+        lengths = np.diff(np.append(starts, count))
+
+        # first index of the minimum and the maximum of every column, fmin and fmax ignore nan values
+        first_indices = []
+        for reduce in (np.fmin, np.fmax):
+            extremes = np.repeat(reduce.reduceat(values, starts), lengths)
+            first_index = np.minimum.reduceat(np.where(values == extremes, indices, count), starts)
+            first_indices.append(np.where(first_index == count, starts, first_index))
+        min_indices, max_indices = first_indices
+
+        pairs = np.empty(len(starts) * 2, dtype=np.int64)
+        pairs[0::2] = np.minimum(min_indices, max_indices)
+        pairs[1::2] = np.maximum(min_indices, max_indices)
+        keep = np.ones(len(pairs), dtype=bool)
+        keep[1::2] = min_indices != max_indices
+        pairs = pairs[keep]
+        return x_start + pairs * x_spacing, values[pairs]
+
+    @staticmethod
+    def _to_canvas_coords(x_values: Sequence[float], values: Sequence[float], y_offset: float, scale: float) -> List[float]:
+        # flat [x0, y0, x1, y1, ...] list of canvas coordinates, the y-axis of the canvas points down
+        if np is not None:
+            coords = np.empty(len(values) * 2)
+            coords[0::2] = x_values
+            coords[1::2] = y_offset - np.asarray(values, dtype=np.float64) * scale
+            return coords.tolist()
+
+        coords = []
+        for x, value in zip(x_values, values):
+            coords.append(x)
+            coords.append(y_offset - value * scale)
+        return coords
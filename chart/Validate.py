@@ -245,14 +245,18 @@ class Validate:
 
     @staticmethod
     def _isValidData(value: Any, var: str) -> None:
-        Validate._isList(value, var)
-        if all(isinstance(value, (int, float)) for value in value):
-            ...
-        else:
+        # the values themselves are checked when they are converted to an array of doubles, see _invalidData()
+        if isinstance(value, (str, bytes, dict)) or not hasattr(value, "__iter__"):
             raise TypeError(
-                f'''{Validate._var_font(var)} {Validate._error_font("all values in the list should be either int or float.")}'''
+                f'''{Validate._var_font(var)} {Validate._error_font("must be a list, tuple, array, numpy array, memoryview or iterator.")}'''
             )
 
+    @staticmethod
+    def _invalidData(var: str) -> None:
+        raise TypeError(
+            f'''{Validate._var_font(var)} {Validate._error_font("all values should be either int or float.")}'''
+        )
+
     @staticmethod
     def _isValidIndices(value: Any, var: str) -> None:
         if all(isinstance(value, int) for value in value):
@@ -1,5 +1,14 @@
 import customtkinter as ctk
 import tkinter as tk
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # sum and maximum are calculated with python builtins then
+
+from .numericData import format_number, to_numeric_array
+from ..imageCanvas import ImageCanvas
 
 class CTkChart(ctk.CTkFrame):
     """
@@ -13,10 +22,15 @@ class CTkChart(ctk.CTkFrame):
     * stat_info_show: first bool is responsible for drawing the value in the stat, second for drawing title
     * show_indicators: first bool is responsible for max value, second for average.
 
+    Instead of a dict, data can be a (keys, values) pair, values can be a list, tuple, generator, array.array,
+    memoryview or numpy array. The values are stored in an array.array.
+
+    to_image() returns the chart as a PIL image, render_chart() draws a chart without a window.
+
     Author: Zik Pin | https://github.com/ZikPin
     """
     def __init__(self, master,
-                 data: dict,
+                 data: Union[dict, tuple],
                  width=350,
                  height=250,
                  fg_color="gray17",
@@ -44,7 +58,9 @@ class CTkChart(ctk.CTkFrame):
 
         # data
         self.data = data
+        self.data_keys, self.data_values = self.split_data(data)
         self.data_avg, self.data_max = self.format_data()
+        self.chart_fg_color = chart_fg_color
 
         # data about chart axis
         self.chart_axis_width = chart_axis_width
@@ -73,16 +89,24 @@ class CTkChart(ctk.CTkFrame):
         self.main_canvas.pack(expand=True, fill="both", padx=corner_radius//1.5, pady=corner_radius//1.5)
         self.main_canvas.bind("<Configure>", lambda event: self.draw_stats())
 
+    @staticmethod
+    def split_data(data: Union[dict, tuple]) -> tuple:
+        if isinstance(data, dict):
+            return tuple(data.keys()), to_numeric_array(data.values())
+        return tuple(data[0]), to_numeric_array(data[1])
+
     def format_data(self) -> tuple[float, int]:
-        m = 0.01
-        s, count = 0, 0.01
+        count = len(self.data_values) + 0.01
+        if count < 1:
+            return 0, 0.01
 
-        for value in self.data.values():
-            s += value
-            count += 1
-            m = max(m, value)
+        if np is not None:
+            values = np.asarray(self.data_values)
+            s, m = values.sum().item(), values.max().item()
+        else:
+            s, m = sum(self.data_values), max(self.data_values)
 
-        return s/count, m
+        return s/count, max(m, 0.01)
 
     def draw_stats(self):
         # updating canvas and canvas info
@@ -99,7 +123,7 @@ class CTkChart(ctk.CTkFrame):
                                      0 + self.chart_axis_width, 0, arrow=self.chart_arrow,
                                      capstyle="round", width=self.chart_axis_width, fill=self.chart_axis_color)
 
-        for index, key in enumerate(self.data.keys()):
+        for index, key in enumerate(self.data_keys):
             self.draw_stat_day(canvas_width*0.01, canvas_height * 0.2, canvas_width * 0.9, canvas_height * 0.55,
                                index, key)
 
@@ -111,10 +135,10 @@ class CTkChart(ctk.CTkFrame):
             self.draw_stat_indicator(canvas_width * 0.9, avg_height + canvas_height * 0.2, "avg")
 
     def draw_stat_day(self, graph_x_offset, graph_y_offset, graph_width, graph_height, index, key):
-        day_width = graph_width//len(self.data.keys())
+        day_width = graph_width//len(self.data_keys)
         day_offset = day_width*0.6
 
-        value = self.data[key]
+        value = self.data_values[index]
         day_stat_height = value / self.data_max * graph_height
 
         self.main_canvas.create_line(graph_x_offset + day_width * index + day_offset,
@@ -126,18 +150,77 @@ class CTkChart(ctk.CTkFrame):
         if self.stat_info_show[0]:
             self.main_canvas.create_text(graph_x_offset + day_width * index + day_offset,
                                          graph_y_offset + graph_height,
-                                         text=value, fill=self.stat_text_color,
-                                         font=ctk.CTkFont("Arial", 13, "bold"))
+                                         text=format_number(value), fill=self.stat_text_color,
+                                         font=("Arial", -13, "bold"))
 
         if self.stat_info_show[1]:
             self.main_canvas.create_text(graph_x_offset + day_width * index + day_offset,
                                          graph_y_offset + graph_height + 40,
                                          text=key, fill=self.stat_title_color,
-                                         font=ctk.CTkFont("Arial", 13, "bold"))
+                                         font=("Arial", -13, "bold"))
 
     def draw_stat_indicator(self, x2, y, title):
         self.main_canvas.create_line(10, y, x2, y,
                                      dash=[20], fill=self.indicator_line_color, capstyle="round", width=3)
         self.main_canvas.create_text(x2+5, y, anchor="w", text=title, fill=self.indicator_text_color,
-                                     font=ctk.CTkFont("Arial", 15, "bold"))
+                                     font=("Arial", -15, "bold"))
+
+    def to_image(self, antialias=2):
+        # the chart canvas as a PIL image, drawn with draw_stats on an ImageCanvas
+        canvas = ImageCanvas(self.main_canvas.winfo_width(), self.main_canvas.winfo_height(), bg=self.chart_fg_color,
+                             appearance_mode=ctk.get_appearance_mode(), antialias=antialias)
+        chart = _ChartImage(canvas, **{name: getattr(self, name) for name in _ChartImage.OPTIONS})
+        chart.draw_stats()
+        return canvas.to_image()
+
+
+class _ChartImage:
+    """ off-screen chart, it draws with the methods of CTkChart on an ImageCanvas """
+
+    OPTIONS = ("data_keys", "data_values", "data_avg", "data_max", "chart_axis_width", "chart_axis_color",
+               "chart_arrow", "show_indicators", "indicator_line_color", "indicator_text_color", "stat_color",
+               "stat_width", "stat_info_show", "stat_text_color", "stat_title_color")
+
+    format_data = CTkChart.format_data
+    draw_stats = CTkChart.draw_stats
+    draw_stat_day = CTkChart.draw_stat_day
+    draw_stat_indicator = CTkChart.draw_stat_indicator
+
+    def __init__(self, canvas: ImageCanvas, **options):
+        self.main_canvas = canvas
+        for name, value in options.items():
+            setattr(self, name, value)
+
+
+def render_chart(data: Union[dict, tuple],
+                 width=350,
+                 height=250,
+                 chart_fg_color="gray17",
+                 chart_axis_width=4,
+                 chart_axis_color="white",
+                 chart_arrow="last",
+                 show_indicators: tuple[bool, bool] = (True, True),
+                 indicator_line_color="white",
+                 indicator_text_color="white",
+                 stat_color="white",
+                 stat_width=30,
+                 stat_info_show: tuple[bool, bool] = (True, True),
+                 stat_text_color="gray17",
+                 stat_title_color="white",
+                 appearance_mode="light",
+                 antialias=2) -> ImageCanvas:
+    """
+    Draws the chart canvas of a CTkChart without a window and returns the ImageCanvas,
+    use .to_image() or .to_png() to render it.
+    """
 
+    canvas = ImageCanvas(width, height, bg=chart_fg_color, appearance_mode=appearance_mode, antialias=antialias)
+    data_keys, data_values = CTkChart.split_data(data)
+    chart = _ChartImage(canvas, data_keys=data_keys, data_values=data_values, chart_axis_width=chart_axis_width,
+                        chart_axis_color=chart_axis_color, chart_arrow=chart_arrow, show_indicators=show_indicators,
+                        indicator_line_color=indicator_line_color, indicator_text_color=indicator_text_color,
+                        stat_color=stat_color, stat_width=stat_width, stat_info_show=stat_info_show,
+                        stat_text_color=stat_text_color, stat_title_color=stat_title_color)
+    chart.data_avg, chart.data_max = chart.format_data()
+    chart.draw_stats()
+    return canvas
@@ -2,6 +2,14 @@ import customtkinter as ctk
 from datetime import datetime
 import tkinter as tk
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the graph coordinates are calculated with a python loop then
+
+from .numericData import to_numeric_array
+from ..imageCanvas import ImageCanvas
+
 class CTkGraph(ctk.CTkFrame):
     """
     Widget to display list of integers as a graph. You can customize almost everything, except for the corner radius
@@ -12,6 +20,11 @@ class CTkGraph(ctk.CTkFrame):
     Graph axis vars are responsible for the arrows of the graph, graph line is responsible for the outline of the
     graph polygon (the graph is represented with a polygon)
 
+    data_values can be a list, tuple, generator, array.array, memoryview or numpy array, the values are stored
+    in an array.array.
+
+    to_image() returns the graph as a PIL image, render_graph() draws a graph without a window.
+
     Author: Zik Pin | https://github.com/ZikPin
     """
     def __init__(self, master,
@@ -38,7 +51,7 @@ class CTkGraph(ctk.CTkFrame):
                          border_color=border_color, border_width=border_width)
 
         # data
-        self.data_values = data_values
+        self.data_values = to_numeric_array(data_values)
         self.date = self.current_date()
         self.date_display = self.date[:]
         self.graph_fg_color = graph_fg_color
@@ -88,19 +101,74 @@ class CTkGraph(ctk.CTkFrame):
         data_len = len(self.data_values)
         max_value = max(self.data_values)
         gap = (width - 15) // data_len
-        coordinates = [(width * 0.05, height * 0.95)]
-
-        for i in range(data_len):
-            h = height * 0.8 * self.data_values[i] / max_value
-            coordinates.append((width * 0.05 + gap * i, height * 0.95 - h))
 
+        if np is not None:
+            # all points are scaled at once, the polygon gets a flat list of x and y coordinates
+            values = np.asarray(self.data_values, dtype=np.float64)
+            points = np.empty(data_len * 2)
+            points[0::2] = width * 0.05 + gap * np.arange(data_len)
+            points[1::2] = height * 0.95 - height * 0.8 * values / max_value
+            coordinates = [width * 0.05, height * 0.95] + points.tolist()
         else:
-            coordinates.append((width * 0.05 + gap * data_len - gap, height * 0.95))
+            coordinates = [width * 0.05, height * 0.95]
+            for i in range(data_len):
+                h = height * 0.8 * self.data_values[i] / max_value
+                coordinates += [width * 0.05 + gap * i, height * 0.95 - h]
+
+        coordinates += [width * 0.05 + gap * data_len - gap, height * 0.95]
 
         self.main_canvas.create_polygon(coordinates, width=self.graph_line_width, fill=self.graph_color,
                                         outline=self.graph_line_color)
 
+    def to_image(self, antialias=2):
+        # the graph canvas as a PIL image, drawn with draw_stats on an ImageCanvas
+        canvas = ImageCanvas(self.main_canvas.winfo_width(), self.main_canvas.winfo_height(), bg=self.graph_fg_color,
+                             appearance_mode=ctk.get_appearance_mode(), antialias=antialias)
+        graph = _GraphImage(canvas, **{name: getattr(self, name) for name in _GraphImage.OPTIONS})
+        graph.draw_stats(canvas.width, canvas.height)
+        return canvas.to_image()
+
     def current_date(self) -> tuple[int, int, int]:
         date = str(datetime.now()).split()
         year, month, day = date[0].split("-")
         return int(day), int(month), int(year)
+
+
+class _GraphImage:
+    """ off-screen graph, it draws with CTkGraph.draw_stats on an ImageCanvas """
+
+    OPTIONS = ("data_values", "graph_color", "graph_axis_width", "graph_line_width", "graph_axis_color",
+               "graph_line_color", "graph_axis_arrow")
+
+    draw_stats = CTkGraph.draw_stats
+
+    def __init__(self, canvas: ImageCanvas, **options):
+        self.main_canvas = canvas
+        for name, value in options.items():
+            setattr(self, name, value)
+
+
+def render_graph(data_values,
+                 width=200,
+                 height=200,
+                 graph_fg_color="gray17",
+                 graph_color="gray20",
+                 graph_axis_width=3,
+                 graph_line_width=2,
+                 graph_axis_color="white",
+                 graph_line_color="white",
+                 graph_axis_arrow="last",
+                 appearance_mode="light",
+                 antialias=2) -> ImageCanvas:
+    """
+    Draws the graph canvas of a CTkGraph without a window and returns the ImageCanvas,
+    use .to_image() or .to_png() to render it.
+    """
+
+    canvas = ImageCanvas(width, height, bg=graph_fg_color, appearance_mode=appearance_mode, antialias=antialias)
+    graph = _GraphImage(canvas, data_values=to_numeric_array(data_values), graph_color=graph_color,
+                        graph_axis_width=graph_axis_width, graph_line_width=graph_line_width,
+                        graph_axis_color=graph_axis_color, graph_line_color=graph_line_color,
+                        graph_axis_arrow=graph_axis_arrow)
+    graph.draw_stats(width, height)
+    return canvas
@@ -0,0 +1,45 @@
+from array import array
+from typing import Iterable, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def to_numeric_array(values: Iterable[Union[int, float]]) -> array:
+    """
+    Stores numbers compactly in an array.array instead of a list of python objects.
+
+    Lists, tuples, generators, array.array objects, memoryviews and numpy arrays are accepted. Integers are
+    kept as 64 bit integers ('q'), so they are displayed without a decimal point, everything else as doubles ('d').
+    """
+
+    if np is not None and isinstance(values, np.ndarray):
+        if values.dtype.kind in "biu":
+            return array("q", np.ascontiguousarray(values, dtype=np.int64).ravel().tobytes())
+        if values.dtype.kind == "f":
+            return array("d", np.ascontiguousarray(values, dtype=np.float64).ravel().tobytes())
+        raise TypeError(f"numpy array of dtype {values.dtype} does not contain numbers")
+
+    if isinstance(values, memoryview):
+        values = values.tolist()
+
+    if isinstance(values, array):
+        return array("d" if values.typecode in "fd" else "q", values)
+
+    values = list(values)
+    if all(type(value) in (int, bool) for value in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            pass
+    return array("d", values)
+
+
+def format_number(value: Union[int, float]) -> Union[int, float]:
+    """ whole numbers of a double array are shown without decimal point, like the integers they were given as """
+
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
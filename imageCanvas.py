@@ -0,0 +1,413 @@
+"""
+ImageCanvas
+Off-screen canvas which records tkinter canvas items and renders them with PIL, no display is needed.
+"""
+
+import math
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# fill density of the tkinter stipple bitmaps, stippled items are drawn semi-transparent
+STIPPLE_ALPHA = {"gray12": 0.125, "gray25": 0.25, "gray50": 0.5, "gray75": 0.75}
+
+# tkinter anchors as PIL text anchors, horizontal (left, middle, right) and vertical (ascender, middle, descender)
+TEXT_ANCHORS = {"n": "ma", "s": "md", "e": "rm", "w": "lm", "center": "mm",
+                "ne": "ra", "nw": "la", "se": "rd", "sw": "ld"}
+
+POINTS_TO_PIXELS = 4 / 3  # tkinter font sizes are points if positive and pixels if negative
+
+
+@lru_cache(maxsize=64)
+def load_font(family: str, size: int, bold: bool) -> ImageFont.ImageFont:
+    """ truetype font of the family if it is installed, the default font of PIL otherwise """
+
+    names = [family, family.lower(), family.replace(" ", "")]
+    if bold:
+        names = [name + suffix for name in names for suffix in ("bd", "b", "-Bold", " Bold")] + names
+    for name in names + ["DejaVuSans-Bold" if bold else "DejaVuSans"]:
+        for file_name in (name, name + ".ttf"):
+            try:
+                return ImageFont.truetype(file_name, size)
+            except OSError:
+                continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has only a bitmap font of a fixed size
+        return ImageFont.load_default()
+
+
+class ImageCanvas:
+    """
+A canvas with the drawing methods of tkinter.Canvas, which renders to a PIL image instead of a window.
+
+Widgets draw on it with the same code they use for their tkinter canvas, so charts can be exported
+or benchmarked on machines without a display. Colors can be (light, dark) tuples like in customtkinter,
+they are resolved with appearance_mode.
+
+## Usage
+```python
+canvas = ImageCanvas(200, 100, bg="white")
+canvas.create_line(10, 90, 100, 10, 190, 90, fill="#768df1", width=2)
+canvas.create_text(100, 50, text="Hello", font=("Arial", 12, "bold"))
+canvas.to_png("image.png")
+```
+
+Supported items are line, polygon, oval, rectangle, text and image (a PIL image),
+`antialias` draws the image that many times larger and scales it down for smooth edges.
+    """
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 bg: Union[str, Tuple[str, str]] = "white",
+                 appearance_mode: str = "light",
+                 antialias: int = 2):
+
+        self.width = int(width)
+        self.height = int(height)
+        self.bg = bg
+        self.appearance_mode = appearance_mode.lower()
+        self.antialias = max(int(antialias), 1)
+
+        self.items: Dict[int, Dict[str, Any]] = {}  # item id: item, in drawing order
+        self._next_id = 1
+
+    # tkinter.Canvas compatible methods
+
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def create_line(self, *coords, **options) -> int:
+        return self._create("line", coords, {"fill": "black", "width": 1, "dash": None, "capstyle": "butt",
+                                             "joinstyle": "round", "arrow": None, "arrowshape": (8, 10, 3)}, options)
+
+    def create_polygon(self, *coords, **options) -> int:
+        return self._create("polygon", coords, {"fill": "black", "outline": "", "width": 1, "stipple": ""}, options)
+
+    def create_oval(self, *coords, **options) -> int:
+        return self._create("oval", coords, {"fill": "", "outline": "black", "width": 1, "stipple": ""}, options)
+
+    def create_rectangle(self, *coords, **options) -> int:
+        return self._create("rectangle", coords, {"fill": "", "outline": "black", "width": 1, "stipple": ""}, options)
+
+    def create_text(self, *coords, **options) -> int:
+        return self._create("text", coords, {"text": "", "fill": "black", "font": None, "anchor": "center"}, options)
+
+    def create_image(self, *coords, **options) -> int:
+        return self._create("image", coords, {"image": None, "anchor": "center"}, options)
+
+    def coords(self, item: Union[int, str], *coords) -> List[float]:
+        items = self.find_withtag(item)
+        if not items:
+            return []
+        if coords:
+            for item_id in items:
+                self.items[item_id]["coords"] = self._flatten(coords)
+        return list(self.items[items[0]]["coords"])
+
+    def itemconfigure(self, item: Union[int, str], **options):
+        for item_id in self.find_withtag(item):
+            self.items[item_id]["options"].update(options)
+            if "tags" in options:
+                self.items[item_id]["tags"] = self._tags(options["tags"])
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, item: Union[int, str], option: str) -> Any:
+        items = self.find_withtag(item)
+        return self.items[items[0]]["options"].get(option) if items else None
+
+    def type(self, item: Union[int, str]) -> Optional[str]:
+        items = self.find_withtag(item)
+        return self.items[items[0]]["type"] if items else None
+
+    def delete(self, *items: Union[int, str]):
+        for item in items:
+            for item_id in self.find_withtag(item):
+                del self.items[item_id]
+
+    def find_all(self) -> Tuple[int, ...]:
+        return tuple(self.items)
+
+    def find_withtag(self, tag: Union[int, str]) -> Tuple[int, ...]:
+        if tag == "all":
+            return self.find_all()
+        if isinstance(tag, int) or (isinstance(tag, str) and tag.isdigit()):
+            return (int(tag),) if int(tag) in self.items else ()
+        return tuple(item_id for item_id, item in self.items.items() if tag in item["tags"])
+
+    def tag_raise(self, tag: Union[int, str], above: Union[int, str, None] = None):
+        self._move(tag, lower=False)
+
+    def tag_lower(self, tag: Union[int, str], below: Union[int, str, None] = None):
+        self._move(tag, lower=True)
+
+    lift = tag_raise
+    lower = tag_lower
+
+    def _apply_appearance_mode(self, color: Union[str, Tuple[str, str], List[str]]) -> str:
+        """ same as customtkinter, (light, dark) color tuples are resolved with the appearance mode """
+
+        if isinstance(color, (tuple, list)):
+            return color[0] if self.appearance_mode == "light" else color[1]
+        return color
+
+    def text_size(self, text: Any, font: Any = None) -> Tuple[int, int]:
+        """ width and height of a text in pixels, used to lay out labels like tkinter does with winfo_reqwidth """
+
+        family, size, bold = self._font_spec(font)
+        left, top, right, bottom = ImageDraw.Draw(Image.new("L", (1, 1))).multiline_textbbox(
+            (0, 0), str(text), font=load_font(family, max(round(size), 1), bold))
+        return right - left, bottom - top
+
+    # rendering
+
+    def to_image(self) -> Image.Image:
+        """ renders all items in their drawing order to a new RGB image """
+
+        scale = self.antialias
+        size = (self.width * scale, self.height * scale)
+        image = Image.new("RGBA", size, self._rgb(self.bg) or (255, 255, 255))
+
+        for item in self.items.values():
+            draw_method = getattr(self, "_draw_" + item["type"])
+            image = draw_method(image, [value * scale for value in item["coords"]], item["options"], scale) or image
+
+        if scale > 1:
+            image = image.resize((self.width, self.height), Image.LANCZOS)
+        return image.convert("RGB")
+
+    def to_png(self, path: Optional[str] = None) -> Optional[bytes]:
+        """ saves the image as PNG if path is given, otherwise returns the PNG data """
+
+        image = self.to_image()
+        if path is not None:
+            image.save(path, "PNG")
+            return None
+        buffer = BytesIO()
+        image.save(buffer, "PNG")
+        return buffer.getvalue()
+
+    def _draw_line(self, image: Image.Image, coords: List[float], options: dict, scale: int):
+        color = self._rgb(options["fill"])
+        width = max(float(options["width"] or 1) * scale, 1)
+        if color is None or len(coords) < 4:
+            return
+
+        points = list(zip(coords[0::2], coords[1::2]))
+        draw = ImageDraw.Draw(image)
+
+        arrow = options["arrow"]
+        if arrow in ("first", "both"):
+            points[0] = self._draw_arrow(draw, points[1], points[0], width, options["arrowshape"], scale, color)
+        if arrow in ("last", "both"):
+            points[-1] = self._draw_arrow(draw, points[-2], points[-1], width, options["arrowshape"], scale, color)
+
+        dash = options["dash"]
+        if isinstance(dash, str):
+            dash = tuple(int(value) for value in dash.split()) if dash.strip() else None
+        elif isinstance(dash, int):
+            dash = (dash,)
+        segments = self._dash_segments(points, [value * scale for value in dash]) if dash else [points]
+
+        joint = "curve" if options["joinstyle"] == "round" else None
+        for segment in segments:
+            draw.line(segment, fill=color, width=round(width), joint=joint)
+            if options["capstyle"] == "round" and width > 2:
+                for x, y in (segment[0], segment[-1]):
+                    draw.ellipse((x - width / 2, y - width / 2, x + width / 2, y + width / 2), fill=color)
+
+    def _draw_polygon(self, image: Image.Image, coords: List[float], options: dict, scale: int):
+        if len(coords) < 4:
+            return
+        return self._draw_shape(image, "polygon", coords, options, scale)
+
+    def _draw_oval(self, image: Image.Image, coords: List[float], options: dict, scale: int):
+        return self._draw_shape(image, "ellipse", self._box(coords), options, scale)
+
+    def _draw_rectangle(self, image: Image.Image, coords: List[float], options: dict, scale: int):
+        return self._draw_shape(image, "rectangle", self._box(coords), options, scale)
+
+    def _draw_text(self, image: Image.Image, coords: List[float], options: dict, scale: int):
+        color = self._rgb(options["fill"])
+        text = str(options["text"])
+        if color is None or not text:
+            return
+
+        family, size, bold = self._font_spec(options["font"])
+        font = load_font(family, max(round(size * scale), 1), bold)
+        anchor = TEXT_ANCHORS.get(options["anchor"], "mm")
+        draw = ImageDraw.Draw(image)
+        if "\n" in text:
+            draw.multiline_text((coords[0], coords[1]), text, fill=color, font=font, anchor=anchor[0] + "a", align="center")
+        else:
+            draw.text((coords[0], coords[1]), text, fill=color, font=font, anchor=anchor)
+
+    def _draw_image(self, image: Image.Image, coords: List[float], options: dict, scale: int):
+        item_image = options["image"]
+        if item_image is None:
+            return
+        item_image = item_image.convert("RGBA")
+        if scale > 1:
+            item_image = item_image.resize((item_image.width * scale, item_image.height * scale), Image.LANCZOS)
+
+        # anchor is the point of the image which is placed at the coordinates
+        anchor = "" if options["anchor"] == "center" else options["anchor"]
+        x = coords[0] - item_image.width * (0 if "w" in anchor else 1 if "e" in anchor else 0.5)
+        y = coords[1] - item_image.height * (0 if "n" in anchor else 1 if "s" in anchor else 0.5)
+        image.alpha_composite(item_image, (round(x), round(y)))
+
+    def _draw_shape(self, image: Image.Image, shape: str, coords: List[float], options: dict, scale: int):
+        fill = self._rgb(options["fill"])
+        outline = self._rgb(options["outline"])
+        width = round(float(options["width"] or 0) * scale) if outline is not None else 0
+        stipple_alpha = STIPPLE_ALPHA.get(options.get("stipple") or "", 1.0)
+
+        if fill is not None and stipple_alpha < 1:
+            # stippled fills are drawn on an overlay, so only the fill is transparent
+            overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
+            getattr(ImageDraw.Draw(overlay), shape)(coords, fill=fill + (round(255 * stipple_alpha),))
+            image = Image.alpha_composite(image, overlay)
+            fill = None
+
+        if fill is None and width == 0:
+            return image
+        draw = ImageDraw.Draw(image)
+        if shape == "polygon" and outline is not None and width > 1:
+            # PIL draws wide polygon outlines inside the polygon, tkinter centers them on the edges
+            draw.polygon(coords, fill=fill)
+            points = list(zip(coords[0::2], coords[1::2]))
+            draw.line(points + points[:1], fill=outline, width=width, joint="curve")
+        else:
+            getattr(draw, shape)(coords, fill=fill, outline=outline, width=width)
+        return image
+
+    @staticmethod
+    def _draw_arrow(draw: ImageDraw.ImageDraw, start: Tuple[float, float], end: Tuple[float, float],
+                    width: float, arrowshape: Tuple[float, float, float], scale: int, color: tuple) -> Tuple[float, float]:
+        # tkinter arrowshape: distance from the tip to the neck, from the tip to the trailing points and
+        # the distance of the trailing points from the outside edge of the line, returns the new line end
+        length = math.hypot(end[0] - start[0], end[1] - start[1])
+        if length == 0:
+            return end
+
+        neck, trailing, outside = (value * scale for value in arrowshape)
+        ux, uy = (end[0] - start[0]) / length, (end[1] - start[1]) / length
+        spread = width / 2 + outside
+        back_x, back_y = end[0] - ux * trailing, end[1] - uy * trailing
+        draw.polygon([end, (back_x - uy * spread, back_y + ux * spread),
+                      (end[0] - ux * neck, end[1] - uy * neck),
+                      (back_x + uy * spread, back_y - ux * spread)], fill=color)
+        return end[0] - ux * neck, end[1] - uy * neck
+
+    @staticmethod
+    def _dash_segments(points: List[Tuple[float, float]], dash: List[float]) -> List[List[Tuple[float, float]]]:
+        # splits the line into its visible dashes, the pattern continues over the corners of the line
+        if len(dash) % 2 == 1:
+            dash = dash * 2
+        if sum(dash) <= 0:
+            return [points]
+
+        segments, current = [], [points[0]]
+        dash_index, remaining, visible = 0, dash[0], True
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            length = math.hypot(x1 - x0, y1 - y0)
+            position = 0.0
+            while length - position > remaining:
+                position += remaining
+                point = (x0 + (x1 - x0) * position / length, y0 + (y1 - y0) * position / length)
+                if visible:
+                    current.append(point)
+                    segments.append(current)
+                current = [point]
+                dash_index = (dash_index + 1) % len(dash)
+                remaining, visible = dash[dash_index], not visible
+            remaining -= length - position
+            if visible:
+                current.append((x1, y1))
+        if visible and len(current) > 1:
+            segments.append(current)
+        return segments
+
+    # helpers
+
+    def _create(self, item_type: str, coords: tuple, defaults: dict, options: dict) -> int:
+        item_id = self._next_id
+        self._next_id += 1
+        tags = self._tags(options.pop("tags", None))
+        defaults.update(options)
+        self.items[item_id] = {"type": item_type, "coords": self._flatten(coords), "options": defaults, "tags": tags}
+        return item_id
+
+    def _move(self, tag: Union[int, str], lower: bool):
+        moved = self.find_withtag(tag)
+        if not moved:
+            return
+        moved_items = {item_id: self.items.pop(item_id) for item_id in moved}
+        if lower:
+            moved_items.update(self.items)
+            self.items = moved_items
+        else:
+            self.items.update(moved_items)
+
+    @staticmethod
+    def _tags(tags: Union[str, Tuple[str, ...], List[str], None]) -> Tuple[str, ...]:
+        if not tags:
+            return ()
+        if isinstance(tags, str):
+            return tuple(tags.split())
+        return tuple(tags)
+
+    @staticmethod
+    def _flatten(coords: Any) -> List[float]:
+        flat = []
+        for value in coords:
+            if isinstance(value, (list, tuple)):
+                flat.extend(ImageCanvas._flatten(value))
+            else:
+                flat.append(float(value))
+        return flat
+
+    @staticmethod
+    def _box(coords: List[float]) -> List[float]:
+        x0, y0, x1, y1 = coords[:4]
+        return [min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)]
+
+    def _rgb(self, color: Union[str, Tuple[str, str], None]) -> Optional[Tuple[int, int, int]]:
+        color = self._apply_appearance_mode(color)
+        if not color or color == "transparent":
+            return None
+        color = color.strip()
+        if color.lower().startswith(("gray", "grey")) and color[4:].isdigit():
+            # X11 grayNN colors, which are not known by PIL
+            value = round(int(color[4:]) * 255 / 100)
+            return value, value, value
+        return ImageColor.getrgb(color)[:3]
+
+    @staticmethod
+    def _font_spec(font: Any) -> Tuple[str, float, bool]:
+        """ (family, size in pixels, bold) of a tkinter font description, tuple, string or font object """
+
+        if font is None:
+            return "Arial", 13, False
+        if hasattr(font, "actual"):  # tkinter.font.Font and customtkinter.CTkFont
+            actual = font.actual()
+            family, size, styles = actual["family"], actual["size"], (actual["weight"],)
+        elif isinstance(font, str):
+            parts = font.split()
+            family = parts[0]
+            size = int(parts[1]) if len(parts) > 1 and parts[1].lstrip("-").isdigit() else 10
+            styles = tuple(parts[2:])
+        else:
+            family = font[0]
+            size = int(font[1]) if len(font) > 1 else 10
+            styles = tuple(font[2:])
+
+        pixels = -size if size < 0 else size * POINTS_TO_PIXELS
+        return family, pixels, "bold" in styles
@@ -0,0 +1,101 @@
+import tkinter
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .map_widget import TkinterMapView
+
+from .marker_index import MarkerCluster
+from .utility_functions import osm_to_decimal
+
+
+class CanvasMarkerCluster:
+    """ round badge with the number of markers, drawn instead of the markers of a MarkerCluster """
+
+    def __init__(self,
+                 map_widget: "TkinterMapView",
+                 cluster: MarkerCluster,
+                 zoom: int,
+                 color: str = "#C5542D",
+                 text_color: str = "white",
+                 font=None):
+
+        self.map_widget = map_widget
+        self.cluster = cluster
+        self.zoom = zoom
+        self.color = color
+        self.text_color = text_color
+
+        self.canvas_circle = None
+        self.canvas_text = None
+
+        if font is None:
+            if sys.platform == "darwin":
+                self.font = "Tahoma 12 bold"
+            else:
+                self.font = "Tahoma 10 bold"
+        else:
+            self.font = font
+
+    @property
+    def radius(self) -> int:
+        # badge grows slowly with the number of markers
+        return 14 + min(len(str(len(self.cluster.markers))), 5) * 3
+
+    def delete(self):
+        self.map_widget.canvas.delete(self.canvas_circle)
+        self.map_widget.canvas.delete(self.canvas_text)
+        self.canvas_circle, self.canvas_text = None, None
+
+    def set_cluster(self, cluster: MarkerCluster):
+        self.cluster = cluster
+
+    def mouse_enter(self, event=None):
+        if sys.platform == "darwin":
+            self.map_widget.canvas.config(cursor="pointinghand")
+        else:
+            self.map_widget.canvas.config(cursor="hand2")
+
+    def mouse_leave(self, event=None):
+        self.map_widget.canvas.config(cursor="arrow")
+
+    def click(self, event=None):
+        # zoom into the cluster, so that its markers get separated
+        self.map_widget.canvas.config(cursor="arrow")
+        position = osm_to_decimal(*self.cluster.world_position, 0)
+        self.map_widget.set_zoom(self.zoom + 2)
+        self.map_widget.set_position(*position)
+
+    def get_canvas_pos(self) -> tuple:
+        factor = 2 ** round(self.map_widget.zoom)
+        widget_tile_width = self.map_widget.lower_right_tile_pos[0] - self.map_widget.upper_left_tile_pos[0]
+        widget_tile_height = self.map_widget.lower_right_tile_pos[1] - self.map_widget.upper_left_tile_pos[1]
+
+        canvas_pos_x = ((self.cluster.world_position[0] * factor - self.map_widget.upper_left_tile_pos[0]) / widget_tile_width) * self.map_widget.width
+        canvas_pos_y = ((self.cluster.world_position[1] * factor - self.map_widget.upper_left_tile_pos[1]) / widget_tile_height) * self.map_widget.height
+        return canvas_pos_x, canvas_pos_y
+
+    def draw(self):
+        canvas_pos_x, canvas_pos_y = self.get_canvas_pos()
+        radius = self.radius
+
+        if self.canvas_circle is None:
+            self.canvas_circle = self.map_widget.canvas.create_oval(canvas_pos_x - radius, canvas_pos_y - radius,
+                                                                    canvas_pos_x + radius, canvas_pos_y + radius,
+                                                                    fill=self.color, width=4, outline="white",
+                                                                    tag=("marker", "marker_cluster", "map"))
+            self.canvas_text = self.map_widget.canvas.create_text(canvas_pos_x, canvas_pos_y,
+                                                                  text=str(len(self.cluster.markers)),
+                                                                  fill=self.text_color,
+                                                                  font=self.font,
+                                                                  tag=("marker", "marker_cluster", "map"))
+
+            for canvas_item in (self.canvas_circle, self.canvas_text):
+                self.map_widget.canvas.tag_bind(canvas_item, "<Enter>", self.mouse_enter)
+                self.map_widget.canvas.tag_bind(canvas_item, "<Leave>", self.mouse_leave)
+                self.map_widget.canvas.tag_bind(canvas_item, "<Button-1>", self.click)
+        else:
+            self.map_widget.canvas.coords(self.canvas_circle, canvas_pos_x - radius, canvas_pos_y - radius,
+                                          canvas_pos_x + radius, canvas_pos_y + radius)
+            self.map_widget.canvas.coords(self.canvas_text, canvas_pos_x, canvas_pos_y)
+            self.map_widget.canvas.itemconfig(self.canvas_text, text=str(len(self.cluster.markers)))
@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Callable
 if TYPE_CHECKING:
     from .map_widget import TkinterMapView
 
-from .utility_functions import decimal_to_osm, osm_to_decimal
+from .utility_functions import decimal_to_osm, osm_to_decimal, osm_array_to_canvas_coords, clip_osm_array, ProjectedPositionList
 
 
 class CanvasPolygon:
@@ -34,6 +34,11 @@ class CanvasPolygon:
 
         self.last_upper_left_tile_pos = None
         self.last_position_list_length = len(self.position_list)
+        self.projected_positions = ProjectedPositionList(self.position_list, min_positions=3)
+
+        # positions closer than simplify_tolerance pixels to the drawn line are left out, None draws all positions
+        self.simplify_tolerance = 0.5
+        self.clip_area = None  # area in tile coordinates which contains all visible positions of the last draw
 
     def delete(self):
         self.map_widget.canvas.delete(self.canvas_polygon)
@@ -49,10 +54,12 @@ class CanvasPolygon:
             self.position_list.append((deg_x, deg_y))
         else:
             self.position_list.insert(index, (deg_x, deg_y))
+        self.projected_positions.invalidate()
         self.draw()
 
     def remove_position(self, deg_x, deg_y):
         self.position_list.remove((deg_x, deg_y))
+        self.projected_positions.invalidate()
         self.draw()
 
     def mouse_enter(self, event=None):
@@ -78,6 +85,17 @@ class CanvasPolygon:
 
         return canvas_pos_x, canvas_pos_y
 
+    def clip_area_contains_widget(self) -> bool:
+        if self.clip_area is None:
+            return False
+
+        # line width in tile coordinates, so that lines along the edge of the clip area stay invisible
+        margin = self.border_width * (self.map_widget.lower_right_tile_pos[0] - self.map_widget.upper_left_tile_pos[0]) / self.map_widget.width
+        return (self.clip_area[0] <= self.map_widget.upper_left_tile_pos[0] - margin and
+                self.clip_area[1] <= self.map_widget.upper_left_tile_pos[1] - margin and
+                self.clip_area[2] >= self.map_widget.lower_right_tile_pos[0] + margin and
+                self.clip_area[3] >= self.map_widget.lower_right_tile_pos[1] + margin)
+
     def draw(self, move=False):
         # check if number of positions in position_list has changed
         new_line_length = self.last_position_list_length != len(self.position_list)
@@ -88,19 +106,30 @@ class CanvasPolygon:
         widget_tile_height = self.map_widget.lower_right_tile_pos[1] - self.map_widget.upper_left_tile_pos[1]
 
         # if only moving happened and len(self.position_list) did not change, shift current positions, else calculate new position_list
-        if move is True and self.last_upper_left_tile_pos is not None and new_line_length is False:
+        # positions are clipped to an area around the widget, moving inside this area only shifts them
+        if move is True and self.last_upper_left_tile_pos is not None and new_line_length is False and self.clip_area_contains_widget():
             x_move = ((self.last_upper_left_tile_pos[0] - self.map_widget.upper_left_tile_pos[0]) / widget_tile_width) * self.map_widget.width
             y_move = ((self.last_upper_left_tile_pos[1] - self.map_widget.upper_left_tile_pos[1]) / widget_tile_height) * self.map_widget.height
 
-            for i in range(0, len(self.position_list) * 2, 2):
+            for i in range(0, len(self.canvas_polygon_positions), 2):
                 self.canvas_polygon_positions[i] += x_move
                 self.canvas_polygon_positions[i + 1] += y_move
         else:
-            self.canvas_polygon_positions = []
-            for position in self.position_list:
-                canvas_position = self.get_canvas_pos(position, widget_tile_width, widget_tile_height)
-                self.canvas_polygon_positions.append(canvas_position[0])
-                self.canvas_polygon_positions.append(canvas_position[1])
+            # project all positions in one step, projections and simplifications are cached per zoom level
+            if self.projected_positions.position_list is not self.position_list:
+                self.projected_positions.set_position_list(self.position_list)
+            tile_positions = self.projected_positions.get(round(self.map_widget.zoom), tolerance=self.simplify_tolerance)
+
+            # leave out positions which are far outside the widget, the clip area is one widget size larger on every side
+            self.clip_area = (self.map_widget.upper_left_tile_pos[0] - widget_tile_width,
+                              self.map_widget.upper_left_tile_pos[1] - widget_tile_height,
+                              self.map_widget.lower_right_tile_pos[0] + widget_tile_width,
+                              self.map_widget.lower_right_tile_pos[1] + widget_tile_height)
+            tile_positions = clip_osm_array(tile_positions, *self.clip_area, min_positions=3)
+
+            self.canvas_polygon_positions = osm_array_to_canvas_coords(tile_positions, self.map_widget.upper_left_tile_pos,
+                                                                       self.map_widget.lower_right_tile_pos,
+                                                                       self.map_widget.width, self.map_widget.height)
 
         if not self.deleted:
             if self.canvas_polygon is None:
@@ -110,7 +139,7 @@ class CanvasPolygon:
                                                                             outline=self.outline_color,
                                                                             joinstyle=tkinter.ROUND,
                                                                             stipple="gray25",
-                                                                            tag="polygon")
+                                                                            tag=("polygon", "map"))
                 if self.fill_color is None:
                     self.map_widget.canvas.itemconfig(self.canvas_polygon, fill="")
                 else:
@@ -35,11 +35,16 @@ class CanvasPositionMarker:
         self.icon = icon
         self.icon_anchor = icon_anchor  # can be center, n, nw, w, sw, s, ew, e, ne
         self.image_hidden = False
+        self.clustered = False  # True if marker is drawn as part of a cluster badge of the map widget
         self.image_zoom_visibility = image_zoom_visibility
         self.deleted = False
         self.command = command
         self.data = data
 
+        # OSM coordinates of position at zoom 0, coordinates of other zoom levels are scaled from them
+        self.projected_position = None
+        self.projected_position_source = None
+
         self.polygon = None
         self.big_circle = None
         self.canvas_text = None
@@ -72,7 +77,16 @@ class CanvasPositionMarker:
     def delete(self):
         if self in self.map_widget.canvas_marker_list:
             self.map_widget.canvas_marker_list.remove(self)
+        self.map_widget.marker_index.remove(self)
 
+        self.remove_from_canvas()
+        self.deleted = True
+        if self.map_widget.marker_clustering:
+            self.map_widget.schedule_marker_redraw()  # number of markers in the cluster changed
+        self.map_widget.canvas.update()
+
+    def remove_from_canvas(self):
+        # deletes all canvas objects of the marker, they are created again by the next draw() in the visible area
         self.map_widget.canvas.delete(self.polygon)
         self.map_widget.canvas.delete(self.big_circle)
         self.map_widget.canvas.delete(self.canvas_text)
@@ -80,11 +94,11 @@ class CanvasPositionMarker:
         self.map_widget.canvas.delete(self.canvas_image)
 
         self.polygon, self.big_circle, self.canvas_text, self.canvas_image, self.canvas_icon = None, None, None, None, None
-        self.deleted = True
-        self.map_widget.canvas.update()
+        self.map_widget.drawn_marker_set.discard(self)
 
     def set_position(self, deg_x, deg_y):
         self.position = (deg_x, deg_y)
+        self.map_widget.marker_index.update(self)
         self.draw()
 
     def set_text(self, text):
@@ -118,8 +132,20 @@ class CanvasPositionMarker:
         if self.command is not None:
             self.command(self)
 
+    def get_tile_position(self, position, zoom: int) -> tuple:
+        if self.projected_position_source != position:
+            self.projected_position = decimal_to_osm(*position, 0)
+            self.projected_position_source = position
+
+        factor = 2.0 ** zoom
+        return self.projected_position[0] * factor, self.projected_position[1] * factor
+
+    def get_world_position(self) -> tuple:
+        # OSM coordinates at zoom 0, used by the marker index of the map widget
+        return self.get_tile_position(self.position, 0)
+
     def get_canvas_pos(self, position):
-        tile_position = decimal_to_osm(*position, round(self.map_widget.zoom))
+        tile_position = self.get_tile_position(position, round(self.map_widget.zoom))
 
         widget_tile_width = self.map_widget.lower_right_tile_pos[0] - self.map_widget.upper_left_tile_pos[0]
         widget_tile_height = self.map_widget.lower_right_tile_pos[1] - self.map_widget.upper_left_tile_pos[1]
@@ -129,11 +155,15 @@ class CanvasPositionMarker:
 
         return canvas_pos_x, canvas_pos_y
 
-    def draw(self, event=None):
+    def draw(self, event=None, manage_z_order: bool = True):
         canvas_pos_x, canvas_pos_y = self.get_canvas_pos(self.position)
 
         if not self.deleted:
-            if 0 - 50 < canvas_pos_x < self.map_widget.width + 50 and 0 < canvas_pos_y < self.map_widget.height + 70:
+            # markers are also drawn in a border around the widget, so they are already there when the map is moved
+            border = self.map_widget.render_border
+            if 0 - 50 - border < canvas_pos_x < self.map_widget.width + 50 + border and 0 - border < canvas_pos_y < self.map_widget.height + 70 + border\
+                    and not self.clustered:
+                self.map_widget.drawn_marker_set.add(self)
 
                 # draw icon image for marker
                 if self.icon is not None:
@@ -141,7 +171,7 @@ class CanvasPositionMarker:
                         self.canvas_icon = self.map_widget.canvas.create_image(canvas_pos_x, canvas_pos_y,
                                                                                anchor=self.icon_anchor,
                                                                                image=self.icon,
-                                                                               tag="marker")
+                                                                               tag=("marker", "map"))
                         if self.command is not None:
                             self.map_widget.canvas.tag_bind(self.canvas_icon, "<Enter>", self.mouse_enter)
                             self.map_widget.canvas.tag_bind(self.canvas_icon, "<Leave>", self.mouse_leave)
@@ -156,7 +186,7 @@ class CanvasPositionMarker:
                                                                              canvas_pos_x, canvas_pos_y,
                                                                              canvas_pos_x + 14, canvas_pos_y - 23,
                                                                              fill=self.marker_color_outside, width=2,
-                                                                             outline=self.marker_color_outside, tag="marker")
+                                                                             outline=self.marker_color_outside, tag=("marker", "map"))
                         if self.command is not None:
                             self.map_widget.canvas.tag_bind(self.polygon, "<Enter>", self.mouse_enter)
                             self.map_widget.canvas.tag_bind(self.polygon, "<Leave>", self.mouse_leave)
@@ -170,7 +200,7 @@ class CanvasPositionMarker:
                         self.big_circle = self.map_widget.canvas.create_oval(canvas_pos_x - 14, canvas_pos_y - 45,
                                                                              canvas_pos_x + 14, canvas_pos_y - 17,
                                                                              fill=self.marker_color_circle, width=6,
-                                                                             outline=self.marker_color_outside, tag="marker")
+                                                                             outline=self.marker_color_outside, tag=("marker", "map"))
                         if self.command is not None:
                             self.map_widget.canvas.tag_bind(self.big_circle, "<Enter>", self.mouse_enter)
                             self.map_widget.canvas.tag_bind(self.big_circle, "<Leave>", self.mouse_leave)
@@ -187,7 +217,7 @@ class CanvasPositionMarker:
                                                                               text=self.text,
                                                                               fill=self.text_color,
                                                                               font=self.font,
-                                                                              tag=("marker", "marker_text"))
+                                                                              tag=("marker", "marker_text", "map"))
                         if self.command is not None:
                             self.map_widget.canvas.tag_bind(self.canvas_text, "<Enter>", self.mouse_enter)
                             self.map_widget.canvas.tag_bind(self.canvas_text, "<Leave>", self.mouse_leave)
@@ -206,7 +236,7 @@ class CanvasPositionMarker:
                         self.canvas_image = self.map_widget.canvas.create_image(canvas_pos_x, canvas_pos_y + (self.text_y_offset - 30),
                                                                                 anchor=tkinter.S,
                                                                                 image=self.image,
-                                                                                tag=("marker", "marker_image"))
+                                                                                tag=("marker", "marker_image", "map"))
                     else:
                         self.map_widget.canvas.coords(self.canvas_image, canvas_pos_x, canvas_pos_y + (self.text_y_offset - 30))
                 else:
@@ -214,11 +244,7 @@ class CanvasPositionMarker:
                         self.map_widget.canvas.delete(self.canvas_image)
                         self.canvas_image = None
             else:
-                self.map_widget.canvas.delete(self.canvas_icon)
-                self.map_widget.canvas.delete(self.canvas_text)
-                self.map_widget.canvas.delete(self.polygon)
-                self.map_widget.canvas.delete(self.big_circle)
-                self.map_widget.canvas.delete(self.canvas_image)
-                self.canvas_text, self.polygon, self.big_circle, self.canvas_image, self.canvas_icon = None, None, None, None, None
-
-            self.map_widget.manage_z_order()
+                self.remove_from_canvas()
+
+            if manage_z_order:
+                self.map_widget.manage_z_order()
@@ -23,14 +23,14 @@ class CanvasTile:
         # if CanvasTile object gets garbage collected or deleted, delete image from canvas
         self.delete()
 
-    def set_image_and_position(self, image, tile_name_position):
+    def set_image_and_position(self, image, tile_name_position, manage_z_order=True):
         self.image = image
         self.tile_name_position = tile_name_position
-        self.draw(image_update=True)
+        self.draw(image_update=True, manage_z_order=manage_z_order)
 
-    def set_image(self, image):
+    def set_image(self, image, manage_z_order=True):
         self.image = image
-        self.draw(image_update=True)
+        self.draw(image_update=True, manage_z_order=manage_z_order)
 
     def get_canvas_pos(self):
         self.widget_tile_width = self.map_widget.lower_right_tile_pos[0] - self.map_widget.upper_left_tile_pos[0]
@@ -45,11 +45,14 @@ class CanvasTile:
 
     def delete(self):
         try:
+            self.map_widget.image_load_queue.cancel(self)  # tile image is not needed anymore
             self.map_widget.canvas.delete(self.canvas_object)
         except Exception:
             pass
 
-    def draw(self, image_update=False):
+    def draw(self, image_update=False, manage_z_order=True):
+        # manage_z_order can be set to False if many tiles are drawn at once and map_widget.manage_z_order()
+        # gets called once afterwards
 
         # calculate canvas position fro OSM coordinates
         canvas_pos_x, canvas_pos_y = self.get_canvas_pos()
@@ -60,7 +63,7 @@ class CanvasTile:
                                                                          canvas_pos_y,
                                                                          image=self.image,
                                                                          anchor=tkinter.NW,
-                                                                         tags="tile")
+                                                                         tags=("tile", "map"))
         else:
             self.map_widget.canvas.coords(self.canvas_object, canvas_pos_x, canvas_pos_y)
 
@@ -71,4 +74,5 @@ class CanvasTile:
                     self.map_widget.canvas.delete(self.canvas_object)
                     self.canvas_object = None
 
-        self.map_widget.manage_z_order()
+        if manage_z_order:
+            self.map_widget.manage_z_order()
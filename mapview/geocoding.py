@@ -0,0 +1,512 @@
+import abc
+import csv
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+try:
+    import geocoder
+except ImportError:
+    geocoder = None
+
+from .tile_session import RateLimiter
+
+
+def normalize_query(query: str) -> str:
+    """ returns query in the form it is cached and matched with, case and whitespace are ignored """
+
+    return ", ".join(" ".join(part.split()) for part in query.casefold().split(",") if part.strip() != "")
+
+
+def normalize_coordinates(deg_x: float, deg_y: float) -> str:
+    # coordinates are rounded to about 1 m, so that reverse requests for the same place share one cache entry
+    return f"{deg_x:.5f},{deg_y:.5f}"
+
+
+class GeocodingResult:
+    """ result of a geocoding or reverse geocoding request, has the same attributes as the results of the
+        geocoder package which were returned before: ok, latlng, bbox, address, street, housenumber, postal,
+        city, state and country. If the request failed, error contains the reason and the result is not cached. """
+
+    address_fields = ("address", "street", "housenumber", "postal", "city", "state", "country")
+
+    def __init__(self,
+                 query: str,
+                 latlng: Union[Tuple[float, float], None] = None,
+                 bbox: Union[dict, None] = None,
+                 source: str = None,
+                 error: str = None,
+                 **address_fields):
+
+        self.query = query
+        self.latlng = tuple(latlng) if latlng is not None else None
+        self.bbox = bbox  # {"southwest": [lat, lng], "northeast": [lat, lng]} or None
+        self.source = source  # name of the backend which found the result
+        self.error = error
+
+        for field in self.address_fields:
+            setattr(self, field, address_fields.get(field))
+
+    @property
+    def ok(self) -> bool:
+        return self.latlng is not None
+
+    @property
+    def lat(self) -> Union[float, None]:
+        return self.latlng[0] if self.latlng is not None else None
+
+    @property
+    def lng(self) -> Union[float, None]:
+        return self.latlng[1] if self.latlng is not None else None
+
+    def to_dict(self) -> dict:
+        result_dict = {"query": self.query, "latlng": self.latlng, "bbox": self.bbox, "source": self.source}
+        for field in self.address_fields:
+            result_dict[field] = getattr(self, field)
+        return result_dict
+
+    @classmethod
+    def from_dict(cls, result_dict: dict) -> "GeocodingResult":
+        return cls(**result_dict)
+
+    @classmethod
+    def from_geocoder(cls, query: str, result, source: str) -> "GeocodingResult":
+        if not result.ok:
+            return cls(query, source=source)
+
+        bbox = getattr(result, "bbox", None)
+        return cls(query, latlng=result.latlng, bbox=bbox if bbox else None, source=source,
+                   **{field: getattr(result, field, None) for field in cls.address_fields})
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"GeocodingResult(query={self.query!r}, error={self.error!r})"
+        return f"GeocodingResult(query={self.query!r}, latlng={self.latlng}, address={self.address!r})"
+
+
+class GeocodingError(Exception):
+    """ raised by backends if a request failed temporarily, for example without network connection """
+
+
+class GeocodingBackend(abc.ABC):
+    """ base class for geocoding backends, backends raise GeocodingError if a request failed temporarily
+        and return a GeocodingResult with ok=False if nothing was found """
+
+    name = "backend"
+
+    @abc.abstractmethod
+    def geocode(self, query: str) -> GeocodingResult:
+        ...
+
+    @abc.abstractmethod
+    def reverse(self, deg_x: float, deg_y: float) -> GeocodingResult:
+        ...
+
+
+class OSMGeocodingBackend(GeocodingBackend):
+    """ geocode service of OpenStreetMap (Nominatim) using the geocoder package
+        https://geocoder.readthedocs.io/providers/OpenStreetMap.html
+
+        The usage policy of Nominatim allows one request per second, all threads together don't exceed
+        max_requests_per_second. """
+
+    name = "osm"
+
+    def __init__(self, max_requests_per_second: float = 1.0):
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+
+    def request(self, query: str, *args, **kwargs):
+        if geocoder is None:
+            raise GeocodingError("geocoder package is not installed, pip install geocoder")
+
+        self.rate_limiter.acquire()
+        try:
+            result = geocoder.osm(*args, **kwargs)
+        except Exception as err:
+            raise GeocodingError(str(err))
+
+        # geocoder reports connection errors and server errors as result without status code 200
+        if not result.ok and getattr(result, "status_code", None) != 200:
+            raise GeocodingError(str(getattr(result, "status", "request failed")))
+        return GeocodingResult.from_geocoder(query, result, self.name)
+
+    def geocode(self, query: str) -> GeocodingResult:
+        return self.request(query, query)
+
+    def reverse(self, deg_x: float, deg_y: float) -> GeocodingResult:
+        return self.request(normalize_coordinates(deg_x, deg_y), [deg_x, deg_y], method="reverse")
+
+
+class GazetteerBackend(GeocodingBackend):
+    """ offline geocoding with a local list of places, for example loaded from a CSV file or an SQLite table
+
+        Places are found by their name, a query like "name, city" or "name, country" also has to match the
+        other fields of the place. Reverse geocoding returns the nearest place within max_distance km. """
+
+    name = "gazetteer"
+
+    def __init__(self, places: Iterable[dict] = (), max_distance: float = 25.0):
+        self.max_distance = max_distance
+        self._places: List[dict] = []
+        self._names: Dict[str, List[dict]] = {}
+        self._cells: Dict[Tuple[int, int], List[dict]] = {}  # places in cells of one degree for reverse geocoding
+
+        for place in places:
+            self.add_place(**place)
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def add_place(self, name: str, lat: float, lng: float, **fields):
+        """ adds a place, fields can be the address fields of GeocodingResult and a bbox """
+
+        place = {"name": name, "latlng": (float(lat), float(lng)),
+                 "bbox": fields.get("bbox"),
+                 "fields": {field: fields[field] for field in GeocodingResult.address_fields if fields.get(field) not in (None, "")}}
+        place["search_text"] = normalize_query(" ".join([name] + [str(value) for value in place["fields"].values()]))
+
+        self._places.append(place)
+        self._names.setdefault(normalize_query(name), []).append(place)
+        self._cells.setdefault((math.floor(place["latlng"][0]), math.floor(place["latlng"][1])), []).append(place)
+
+    @classmethod
+    def from_csv(cls, path: str, name_column: str = "name", lat_column: str = "lat", lng_column: str = "lng",
+                 delimiter: str = ",", encoding: str = "utf-8", **kwargs) -> "GazetteerBackend":
+        """ loads places from a CSV file with a header row, columns named like address fields are used as fields """
+
+        gazetteer = cls(**kwargs)
+        with open(path, newline="", encoding=encoding) as csv_file:
+            for row in csv.DictReader(csv_file, delimiter=delimiter):
+                gazetteer.add_place(row[name_column], row[lat_column], row[lng_column],
+                                    **{field: row.get(field) for field in GeocodingResult.address_fields})
+        return gazetteer
+
+    @classmethod
+    def from_sqlite(cls, path: str, table: str = "places", name_column: str = "name", lat_column: str = "lat",
+                    lng_column: str = "lng", **kwargs) -> "GazetteerBackend":
+        """ loads places from an SQLite table, columns named like address fields are used as fields """
+
+        for identifier in (table, name_column, lat_column, lng_column):
+            if not identifier.isidentifier():
+                raise ValueError(f"invalid table or column name: {identifier}")
+
+        gazetteer = cls(**kwargs)
+        db_connection = sqlite3.connect(path)
+        try:
+            db_connection.row_factory = sqlite3.Row
+            for row in db_connection.execute(f"SELECT * FROM {table};"):
+                columns = row.keys()
+                gazetteer.add_place(row[name_column], row[lat_column], row[lng_column],
+                                    **{field: row[field] for field in GeocodingResult.address_fields if field in columns})
+        finally:
+            db_connection.close()
+        return gazetteer
+
+    def create_result(self, query: str, place: dict) -> GeocodingResult:
+        fields = dict(place["fields"])
+        fields.setdefault("address", place["name"])
+        return GeocodingResult(query, latlng=place["latlng"], bbox=place["bbox"], source=self.name, **fields)
+
+    def geocode(self, query: str) -> GeocodingResult:
+        normalized_query = normalize_query(query)
+        places = self._names.get(normalized_query)
+
+        if places is None:
+            # first part is the name, all other parts have to be found in the fields of the place
+            parts = normalized_query.split(", ")
+            places = [place for place in self._names.get(parts[0], [])
+                      if all(part in place["search_text"] for part in parts[1:])]
+
+        if len(places) > 0:
+            return self.create_result(query, places[0])
+        return GeocodingResult(query, source=self.name)
+
+    def reverse(self, deg_x: float, deg_y: float) -> GeocodingResult:
+        query = normalize_coordinates(deg_x, deg_y)
+        cell_x, cell_y = math.floor(deg_x), math.floor(deg_y)
+
+        nearest_place, nearest_distance = None, self.max_distance
+        for x in range(cell_x - 1, cell_x + 2):
+            for y in range(cell_y - 1, cell_y + 2):
+                for place in self._cells.get((x, y), ()):
+                    # equirectangular approximation, exact enough for distances of a few km
+                    lat, lng = place["latlng"]
+                    distance_x = math.radians(lng - deg_y) * math.cos(math.radians((lat + deg_x) / 2))
+                    distance = math.hypot(distance_x, math.radians(lat - deg_x)) * 6371
+                    if distance <= nearest_distance:
+                        nearest_place, nearest_distance = place, distance
+
+        if nearest_place is not None:
+            return self.create_result(query, nearest_place)
+        return GeocodingResult(query, source=self.name)
+
+
+class GeocodingCache:
+    """ cache of geocoding results in memory and optionally in an SQLite database at path
+
+        Found results are kept forever, results without a match expire after not_found_ttl seconds,
+        so that places which are added to a backend later can be found. """
+
+    create_results_table = """CREATE TABLE IF NOT EXISTS geocoding_results (
+                                      kind VARCHAR(10) NOT NULL,
+                                      query TEXT NOT NULL,
+                                      result TEXT NOT NULL,
+                                      ok INTEGER NOT NULL,
+                                      time REAL NOT NULL,
+                                      CONSTRAINT pk_geocoding_results PRIMARY KEY (kind, query));"""
+
+    def __init__(self, path: str = None, max_memory_entries: int = 10_000, not_found_ttl: float = 86_400):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.not_found_ttl = not_found_ttl
+
+        self._memory: "OrderedDict[tuple, Tuple[GeocodingResult, float]]" = OrderedDict()  # key: (result, time)
+        self._lock = threading.Lock()
+        self._db_connection = None
+
+        if path is not None:
+            self._db_connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            self._db_connection.execute("PRAGMA journal_mode=WAL;")
+            with self._db_connection:
+                self._db_connection.execute(self.create_results_table)
+
+    def close(self):
+        with self._lock:
+            if self._db_connection is not None:
+                self._db_connection.close()
+                self._db_connection = None
+
+    def is_valid(self, result: GeocodingResult, result_time: float) -> bool:
+        return result.ok or time.time() - result_time < self.not_found_ttl
+
+    def remember(self, key: tuple, result: GeocodingResult, result_time: float):
+        # must be called with self._lock
+        self._memory[key] = (result, result_time)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, kind: str, queries: Iterable[str]) -> Dict[str, GeocodingResult]:
+        """ returns the cached results of normalized queries, queries which are not cached are left out """
+
+        results = {}
+        missing_queries = []
+        with self._lock:
+            for query in queries:
+                entry = self._memory.get((kind, query))
+                if entry is not None and self.is_valid(*entry):
+                    self._memory.move_to_end((kind, query))
+                    results[query] = entry[0]
+                else:
+                    missing_queries.append(query)
+
+            # look up the remaining queries in chunks, SQLite limits the number of parameters
+            if self._db_connection is not None:
+                for i in range(0, len(missing_queries), 500):
+                    chunk = missing_queries[i:i + 500]
+                    rows = self._db_connection.execute(f"""SELECT query, result, time FROM geocoding_results
+                                                           WHERE kind=? AND query IN ({",".join("?" * len(chunk))});""",
+                                                       (kind, *chunk)).fetchall()
+                    for query, result_json, result_time in rows:
+                        result = GeocodingResult.from_dict(json.loads(result_json))
+                        if self.is_valid(result, result_time):
+                            self.remember((kind, query), result, result_time)
+                            results[query] = result
+        return results
+
+    def get(self, kind: str, query: str) -> Union[GeocodingResult, None]:
+        return self.get_many(kind, [query]).get(query)
+
+    def put(self, kind: str, query: str, result: GeocodingResult):
+        if result.error is not None:
+            return
+
+        result_time = time.time()
+        with self._lock:
+            self.remember((kind, query), result, result_time)
+            if self._db_connection is not None:
+                with self._db_connection:
+                    self._db_connection.execute("INSERT OR REPLACE INTO geocoding_results (kind, query, result, ok, time) VALUES (?, ?, ?, ?, ?);",
+                                                (kind, query, json.dumps(result.to_dict()), int(result.ok), result_time))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db_connection is not None:
+                with self._db_connection:
+                    self._db_connection.execute("DELETE FROM geocoding_results;")
+
+
+class GeocodingService:
+    """ geocoding with a result cache, backends are asked in order until one of them finds a result
+
+        Requests can be made blocking or in background threads, the async methods return a
+        concurrent.futures.Future. Concurrent requests for the same query are coalesced into one request
+        to the backends, batch requests look up all cached queries at once and only request the others.
+        Callbacks are called from background threads, they must not update tkinter widgets. """
+
+    def __init__(self,
+                 backends: List[GeocodingBackend] = None,
+                 cache_path: str = None,
+                 max_workers: int = 4,
+                 not_found_ttl: float = 86_400):
+
+        self.backends = backends if backends is not None else [OSMGeocodingBackend()]
+        self.cache = GeocodingCache(cache_path, not_found_ttl=not_found_ttl)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        # statistics, can be read at runtime or with stats()
+        self.cache_hits: int = 0
+        self.coalesced_requests: int = 0
+        self.backend_requests: int = 0
+
+        self._pending: Dict[tuple, Future] = {}  # (kind, normalized query): future of running request
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.cache.close()
+
+    def stats(self) -> dict:
+        return {"cache_hits": self.cache_hits,
+                "coalesced_requests": self.coalesced_requests,
+                "backend_requests": self.backend_requests}
+
+    def resolve(self, kind: str, query: str, args: tuple) -> GeocodingResult:
+        # ask backends in order, only results without temporary errors are cached
+        result, error = None, None
+        for backend in self.backends:
+            try:
+                self.backend_requests += 1
+                result = getattr(backend, kind)(*args)
+            except Exception as err:
+                error = err
+                continue
+
+            if result.ok:
+                break
+
+        if result is None or (not result.ok and error is not None):
+            return GeocodingResult(query, error=str(error) if error is not None else "no geocoding backend")
+
+        self.cache.put(kind, query, result)
+        return result
+
+    def submit(self, kind: str, query: str, args: tuple, callback: Callable[[GeocodingResult], None] = None) -> Future:
+        cached_result = self.cache.get(kind, query)
+
+        if cached_result is not None:
+            self.cache_hits += 1
+            future = Future()
+            future.set_result(cached_result)
+        else:
+            with self._lock:
+                future = self._pending.get((kind, query))
+                submitted = future is None
+                if submitted:
+                    future = self.executor.submit(self.resolve, kind, query, args)
+                    self._pending[(kind, query)] = future
+                else:
+                    self.coalesced_requests += 1
+
+            # registered without holding the lock, the callback runs inline if the future is already done
+            if submitted:
+                future.add_done_callback(lambda _: self.remove_pending(kind, query))
+
+        if callback is not None:
+            future.add_done_callback(lambda finished_future: callback(finished_future.result()))
+        return future
+
+    def remove_pending(self, kind: str, query: str):
+        with self._lock:
+            self._pending.pop((kind, query), None)
+
+    def geocode_async(self, query: str, callback: Callable[[GeocodingResult], None] = None) -> Future:
+        """ returns a Future of the GeocodingResult for an address, callback is called with the result """
+
+        return self.submit("geocode", normalize_query(query), (query,), callback)
+
+    def reverse_async(self, deg_x: float, deg_y: float, callback: Callable[[GeocodingResult], None] = None) -> Future:
+        """ returns a Future of the GeocodingResult for coordinates, callback is called with the result """
+
+        return self.submit("reverse", normalize_coordinates(deg_x, deg_y), (deg_x, deg_y), callback)
+
+    def geocode(self, query: str) -> GeocodingResult:
+        return self.geocode_async(query).result()
+
+    def reverse(self, deg_x: float, deg_y: float) -> GeocodingResult:
+        return self.reverse_async(deg_x, deg_y).result()
+
+    def geocode_batch_async(self, queries: Iterable[str], callback: Callable[[List[GeocodingResult]], None] = None) -> Future:
+        """ returns a Future of the list of GeocodingResults in the order of queries, duplicate queries
+            are requested once, callback is called with the list """
+
+        queries = list(queries)
+        normalized_queries = [normalize_query(query) for query in queries]
+        cached_results = self.cache.get_many("geocode", set(normalized_queries))
+        self.cache_hits += len(cached_results)
+
+        futures = {}
+        for query, normalized_query in zip(queries, normalized_queries):
+            if normalized_query not in cached_results and normalized_query not in futures:
+                futures[normalized_query] = self.submit("geocode", normalized_query, (query,))
+
+        batch_future = Future()
+        remaining = [len(futures)]
+        remaining_lock = threading.Lock()
+
+        def finish_batch():
+            results = [cached_results[query] if query in cached_results else futures[query].result()
+                       for query in normalized_queries]
+            batch_future.set_result(results)
+            if callback is not None:
+                callback(results)
+
+        def request_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if done:
+                finish_batch()
+
+        if len(futures) == 0:
+            finish_batch()
+        for future in futures.values():
+            future.add_done_callback(request_done)
+        return batch_future
+
+    def geocode_batch(self, queries: Iterable[str]) -> List[GeocodingResult]:
+        return self.geocode_batch_async(queries).result()
+
+
+_geocoding_service: Union[GeocodingService, None] = None
+_geocoding_service_lock = threading.Lock()
+
+
+def get_geocoding_service() -> GeocodingService:
+    """ returns the shared geocoding service used by TkinterMapView.set_address and the convert functions """
+
+    global _geocoding_service
+    with _geocoding_service_lock:
+        if _geocoding_service is None:
+            _geocoding_service = GeocodingService()
+        return _geocoding_service
+
+
+def configure_geocoding(backends: List[GeocodingBackend] = None, cache_path: str = None, **kwargs) -> GeocodingService:
+    """ replaces the shared geocoding service, for example to use a persistent cache at cache_path or a
+        GazetteerBackend before or instead of the OpenStreetMap backend """
+
+    global _geocoding_service
+    with _geocoding_service_lock:
+        old_geocoding_service = _geocoding_service
+        _geocoding_service = GeocodingService(backends=backends, cache_path=cache_path, **kwargs)
+
+    if old_geocoding_service is not None:
+        old_geocoding_service.close()
+    return _geocoding_service
@@ -1,4 +1,3 @@
-import requests
 import math
 import threading
 import tkinter
@@ -9,11 +8,12 @@ import PIL
 import sys
 import io
 import sqlite3
+import collections
 import pyperclip
-import geocoder
 from PIL import Image, ImageTk
 from typing import Callable, List, Dict, Union, Tuple
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 from .canvas_position_marker import CanvasPositionMarker
 from .canvas_tile import CanvasTile
@@ -21,6 +21,15 @@ from .utility_functions import decimal_to_osm, osm_to_decimal
 from .canvas_button import CanvasButton
 from .canvas_path import CanvasPath
 from .canvas_polygon import CanvasPolygon
+from .canvas_marker_cluster import CanvasMarkerCluster
+from .marker_index import MarkerGridIndex
+from .tile_cache import TileImageCache, image_size_in_bytes
+from .tile_queue import TileLoadQueue
+from .tile_session import get_tile_session, configure_tile_session
+from .tile_store import open_tile_store
+from .tile_prefetcher import TilePrefetcher
+from .tile_layer import TileLayer, composite_tile_images
+from .geocoding import GeocodingResult, get_geocoding_service
 
 
 class TkinterMapView(tkinter.Frame):
@@ -35,6 +44,7 @@ class TkinterMapView(tkinter.Frame):
                  database_path: str = None,
                  use_database_only: bool = False,
                  max_zoom: int = 19,
+                 tile_cache_size: int = 256_000_000,
                  **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -109,6 +119,15 @@ class TkinterMapView(tkinter.Frame):
         self.move_velocity: Tuple[float, float] = (0, 0)
         self.last_move_time: Union[float, None] = None
 
+        # rendering, position changes by mouse movement are drawn at most once per frame
+        self.target_fps: float = 60
+        self.render_scheduled: bool = False
+        self.last_render_time: float = 0
+        self.render_border: int = 256  # pixels around the widget in which markers are drawn, so the map can be moved with canvas.move
+        self.rendered_upper_left_tile_pos: Union[Tuple[float, float], None] = None  # position of canvas content
+        self.full_render_upper_left_tile_pos: Union[Tuple[float, float], None] = None  # position at last complete redraw
+        self.rendered_zoom: Union[int, None] = None
+
         # describes the tile layout
         self.zoom: float = 0
         self.upper_left_tile_pos: Tuple[float, float] = (0, 0)  # in OSM coords
@@ -122,30 +141,61 @@ class TkinterMapView(tkinter.Frame):
         self.canvas_path_list: List[CanvasPath] = []
         self.canvas_polygon_list: List[CanvasPolygon] = []
 
-        self.tile_image_cache: Dict[str, PIL.ImageTk.PhotoImage] = {}
+        # markers are found by a spatial index, so that only markers in the visible area get drawn
+        self.marker_index = MarkerGridIndex()
+        self.drawn_marker_set = set()  # markers which currently have objects on the canvas
+        self.marker_redraw_scheduled = False
+
+        # marker clustering, markers which are closer than marker_cluster_size pixels are drawn as one badge
+        self.marker_clustering: bool = False
+        self.marker_cluster_size: int = 60
+        self.marker_cluster_max_zoom: int = 15  # clustering is only done up to this zoom level
+        self.marker_cluster_min_markers: int = 2
+        self.canvas_marker_clusters: Dict[tuple, CanvasMarkerCluster] = {}
+
+        self.tile_image_cache = TileImageCache(max_bytes=tile_cache_size)  # LRU cache with memory budget in bytes
+        self.scaled_tile_image_cache = TileImageCache(max_bytes=64_000_000)  # tiles and placeholders scaled for fractional zoom
+        self.placeholder_zoom_levels: int = 3  # number of parent zoom levels searched for placeholder images
+        self.last_displayed_tile_size: int = 256
         self.empty_tile_image = ImageTk.PhotoImage(Image.new("RGB", (self.tile_size, self.tile_size), (190, 190, 190)))  # used for zooming and moving
         self.not_loaded_tile_image = ImageTk.PhotoImage(Image.new("RGB", (self.tile_size, self.tile_size), (250, 250, 250)))  # only used when image not found on tile server
 
         # tile server and database
         self.tile_server = "https://a.tile.openstreetmap.org/{z}/{x}/{y}.png"
         self.database_path = database_path
+        # database_path can be an OfflineLoader database, an .mbtiles file or a read-only .tilepack file
+        self.tile_store = open_tile_store(database_path) if database_path is not None else None
         self.use_database_only = use_database_only
-        self.overlay_tile_server: Union[str, None] = None
+        self.overlay_tile_server: Union[str, None] = None  # tile server of the first overlay layer, for compatibility
+        self.overlay_layers: List[TileLayer] = []
+        self.cached_tiles_have_overlays = False  # False if the cached tile images are plain base map tiles
+
+        # overlay layers are fetched concurrently to the base map, the decoded layer images are cached independently
+        # of the composited tile images, so that changing a layer does not fetch the base map or other layers again
+        self.layer_image_cache = TileImageCache(max_bytes=128_000_000)  # key: (tile_server, zoom, x, y)
+        self.layer_fetch_executor = ThreadPoolExecutor(max_workers=16)
         self.max_zoom = max_zoom  # should be set according to tile server max zoom
         self.min_zoom: int = math.ceil(math.log2(math.ceil(self.width / self.tile_size)))  # min zoom at which map completely fills widget
 
-        # pre caching for smoother movements (load tile images into cache at a certain radius around the pre_cache_position)
-        self.pre_cache_position: Union[Tuple[float, float], None] = None
-        self.pre_cache_thread = threading.Thread(daemon=True, target=self.pre_cache)
-        self.pre_cache_thread.start()
-
-        # image loading in background threads
-        self.image_load_queue_tasks: List[tuple] = []  # task: ((zoom, x, y), canvas_tile_object)
-        self.image_load_queue_results: List[tuple] = []  # result: ((zoom, x, y), canvas_tile_object, photo_image)
-        self.after(10, self.update_canvas_tile_images)
+        # prefetching for smoother movements (load tile images into cache along the movement and around the visible area)
+        self.zoom_direction: int = 0  # 1 if the map was zoomed in last, -1 if it was zoomed out
+        self.tile_prefetcher = TilePrefetcher(self)
+
+        # image loading in background threads, tiles closest to the center of the map are loaded first
+        self.image_load_queue = TileLoadQueue()
+        self.image_load_queue_results: collections.deque = collections.deque()  # result: (tile_load_task, photo_image)
+        self.image_load_results_notified = False  # True if <<TileImagesLoaded>> event is already pending
+        self.database_prefetch_area: Union[tuple, None] = None  # (zoom, x_min, x_max, y_min, y_max) for the load threads
+        self.database_prefetch_lock = threading.Lock()
+        self.bind("<<TileImagesLoaded>>", self.update_canvas_tile_images)
+
+        # results of set_address_async() are applied on the main thread by the <<GeocodingResultsReady>> event
+        self.geocoding_results: collections.deque = collections.deque()  # (result, address_string, marker, text, callback, kwargs)
+        self.bind("<<GeocodingResultsReady>>", self.apply_geocoding_results)
+        self.after_idle(self.update_canvas_tile_images)  # handle results which arrived before the mainloop started
         self.image_load_thread_pool: List[threading.Thread] = []
 
-        # add background threads which load tile images from self.image_load_queue_tasks
+        # add background threads which load tile images from self.image_load_queue
         for i in range(25):
             image_load_thread = threading.Thread(daemon=True, target=self.load_images_background)
             image_load_thread.start()
@@ -166,6 +216,11 @@ class TkinterMapView(tkinter.Frame):
 
     def destroy(self):
         self.running = False
+        self.tile_prefetcher.stop()
+        self.image_load_queue.close()  # wake up and terminate image load threads
+        self.layer_fetch_executor.shutdown(wait=False)
+        if self.tile_store is not None:
+            self.tile_store.close()
         super().destroy()
 
     def draw_rounded_corners(self):
@@ -244,18 +299,72 @@ class TkinterMapView(tkinter.Frame):
 
         m.tk_popup(event.x_root, event.y_root)  # display menu
 
-    def set_overlay_tile_server(self, overlay_server: str):
-        self.overlay_tile_server = overlay_server
+    def configure_tile_requests(self, max_connections: int = 25, timeout: Union[float, Tuple[float, float]] = (5, 15),
+                                retries: int = 3, backoff_factor: float = 0.3):
+        """ sets connection pool size, timeout in seconds and retry behaviour for tile and overlay tile requests """
+
+        for tile_server in [self.tile_server] + [layer.tile_server for layer in self.overlay_layers]:
+            if tile_server is not None:
+                configure_tile_session(tile_server, max_connections=max_connections, timeout=timeout,
+                                       retries=retries, backoff_factor=backoff_factor)
+
+    def set_overlay_tile_server(self, overlay_server: Union[str, None]):
+        """ replaces all overlay layers with one opaque layer of overlay_server, None removes all overlay layers """
+
+        self.overlay_layers = [] if overlay_server is None else [TileLayer(overlay_server)]
+        self.update_overlay_layers()
+
+    def add_overlay_layer(self, tile_server: str, opacity: float = 1.0, visible: bool = True, name: str = None) -> TileLayer:
+        """ adds an overlay layer above the base map and all other overlay layers, returns the TileLayer """
+
+        layer = TileLayer(tile_server, opacity=opacity, visible=visible, name=name)
+        self.overlay_layers.append(layer)
+        self.update_overlay_layers()
+        return layer
+
+    def remove_overlay_layer(self, layer: TileLayer):
+        if layer in self.overlay_layers:
+            self.overlay_layers.remove(layer)
+            self.update_overlay_layers()
+
+    def set_overlay_layer_opacity(self, layer: TileLayer, opacity: float):
+        layer.opacity = min(max(opacity, 0.0), 1.0)
+        self.update_overlay_layers()
+
+    def set_overlay_layer_visible(self, layer: TileLayer, visible: bool):
+        layer.visible = visible
+        self.update_overlay_layers()
+
+    def update_overlay_layers(self):
+        """ has to be called after a TileLayer was changed directly, tiles are composited again from cached layer images """
+
+        self.overlay_tile_server = self.overlay_layers[0].tile_server if len(self.overlay_layers) > 0 else None
+
+        # without overlays the base map is only cached as displayed tile, keep it as layer image before it gets cleared
+        if not self.cached_tiles_have_overlays:
+            for tile_key in self.tile_image_cache.keys():
+                source_image = self.get_tile_source_image(*tile_key)
+                if source_image is not None:
+                    self.layer_image_cache.put((self.tile_server, *tile_key), source_image)
+        self.cached_tiles_have_overlays = any(layer.is_drawn() for layer in self.overlay_layers)
+
+        self.image_load_queue.cancel_all()
+        self.tile_image_cache.clear()
+        self.scaled_tile_image_cache.clear()
+        self.image_load_queue_results.clear()
+        self.draw_initial_array()
 
     def set_tile_server(self, tile_server: str, tile_size: int = 256, max_zoom: int = 19):
-        self.image_load_queue_tasks = []
+        self.image_load_queue.cancel_all()
         self.max_zoom = max_zoom
         self.tile_size = tile_size
         self.min_zoom = math.ceil(math.log2(math.ceil(self.width / self.tile_size)))
         self.tile_server = tile_server
-        self.tile_image_cache: Dict[str, PIL.ImageTk.PhotoImage] = {}
+        self.tile_image_cache.clear()
+        self.layer_image_cache.clear()
+        self.scaled_tile_image_cache.clear()
         self.canvas.delete("tile")
-        self.image_load_queue_results = []
+        self.image_load_queue_results.clear()
         self.draw_initial_array()
 
     def get_position(self) -> tuple:
@@ -311,13 +420,17 @@ class TkinterMapView(tkinter.Frame):
     def set_position(self, deg_x, deg_y, text=None, marker=False, **kwargs) -> CanvasPositionMarker:
         """ set new middle position of map in decimal coordinates """
 
+        # the map doesn't move anymore, the prefetcher must not continue a previous heading
+        self.move_velocity = (0, 0)
+
         # convert given decimal coordinates to OSM coordinates and set corner positions accordingly
         current_tile_position = decimal_to_osm(deg_x, deg_y, round(self.zoom))
-        self.upper_left_tile_pos = (current_tile_position[0] - ((self.width / 2) / self.tile_size),
-                                    current_tile_position[1] - ((self.height / 2) / self.tile_size))
+        tile_size = self.tile_size * self.get_tile_scale()
+        self.upper_left_tile_pos = (current_tile_position[0] - ((self.width / 2) / tile_size),
+                                    current_tile_position[1] - ((self.height / 2) / tile_size))
 
-        self.lower_right_tile_pos = (current_tile_position[0] + ((self.width / 2) / self.tile_size),
-                                     current_tile_position[1] + ((self.height / 2) / self.tile_size))
+        self.lower_right_tile_pos = (current_tile_position[0] + ((self.width / 2) / tile_size),
+                                     current_tile_position[1] + ((self.height / 2) / tile_size))
 
         if marker is True:
             marker_object = self.set_marker(deg_x, deg_y, text, **kwargs)
@@ -332,14 +445,43 @@ class TkinterMapView(tkinter.Frame):
 
     def set_address(self, address_string: str, marker: bool = False, text: str = None, **kwargs) -> CanvasPositionMarker:
         """ Function uses geocode service of OpenStreetMap (Nominatim).
-            https://geocoder.readthedocs.io/providers/OpenStreetMap.html """
+            https://geocoder.readthedocs.io/providers/OpenStreetMap.html
 
-        result = geocoder.osm(address_string)
+            Results are cached, the backends and a persistent cache can be set with configure_geocoding().
+            This call blocks until the address is found, set_address_async() does not freeze the GUI. """
 
+        result = get_geocoding_service().geocode(address_string)
+        return self.show_geocoding_result(result, address_string, marker=marker, text=text, **kwargs)
+
+    def set_address_async(self, address_string: str, marker: bool = False, text: str = None,
+                          callback: Callable = None, **kwargs):
+        """ like set_address(), but the address is looked up in a background thread and the map is set when the
+            result arrived, callback is called on the main thread with the return value of set_address().
+            Returns a concurrent.futures.Future of the GeocodingResult. """
+
+        def result_ready(result: GeocodingResult):
+            self.geocoding_results.append((result, address_string, marker, text, callback, kwargs))
+            try:
+                self.event_generate("<<GeocodingResultsReady>>", when="tail")
+            except (RuntimeError, tkinter.TclError):
+                pass  # widget got destroyed
+
+        return get_geocoding_service().geocode_async(address_string, callback=result_ready)
+
+    def apply_geocoding_results(self, event=None):
+        # called by the <<GeocodingResultsReady>> event, so that the map is updated from the main thread
+        while len(self.geocoding_results) > 0 and self.running:
+            result, address_string, marker, text, callback, kwargs = self.geocoding_results.popleft()
+            return_value = self.show_geocoding_result(result, address_string, marker=marker, text=text, **kwargs)
+            if callback is not None:
+                callback(return_value)
+
+    def show_geocoding_result(self, result: GeocodingResult, address_string: str, marker: bool = False,
+                              text: str = None, **kwargs) -> CanvasPositionMarker:
         if result.ok:
 
             # determine zoom level for result by bounding box
-            if hasattr(result, "bbox"):
+            if result.bbox is not None:
                 zoom_not_possible = True
 
                 for zoom in range(self.min_zoom, self.max_zoom + 1):
@@ -358,10 +500,7 @@ class TkinterMapView(tkinter.Frame):
                 self.set_zoom(10)
 
             if text is None:
-                try:
-                    text = result.geojson['features'][0]['properties']['address']
-                except:
-                    text = address_string
+                text = result.address if result.address is not None else address_string
 
             return self.set_position(*result.latlng, marker=marker, text=text, **kwargs)
         else:
@@ -369,10 +508,85 @@ class TkinterMapView(tkinter.Frame):
 
     def set_marker(self, deg_x: float, deg_y: float, text: str = None, **kwargs) -> CanvasPositionMarker:
         marker = CanvasPositionMarker(self, (deg_x, deg_y), text=text, **kwargs)
-        marker.draw()
         self.canvas_marker_list.append(marker)
+        self.marker_index.insert(marker)
+
+        if self.marker_clustering:
+            # clusters change with every new marker, redraw all markers once after adding many of them
+            self.schedule_marker_redraw()
+        else:
+            marker.draw()
         return marker
 
+    def set_marker_clustering(self, marker_clustering: bool = True, cluster_size: int = 60, max_zoom: int = 15, min_markers: int = 2):
+        """ draws markers which are closer than cluster_size pixels to each other as one badge with the number of markers,
+            clustering is done up to zoom level max_zoom, a badge is drawn for groups of at least min_markers markers """
+
+        self.marker_clustering = marker_clustering
+        self.marker_cluster_size = cluster_size
+        self.marker_cluster_max_zoom = max_zoom
+        self.marker_cluster_min_markers = min_markers
+
+        if not marker_clustering:
+            for marker in self.canvas_marker_list:
+                marker.clustered = False
+        self.draw_markers()
+
+    def schedule_marker_redraw(self):
+        if not self.marker_redraw_scheduled:
+            self.marker_redraw_scheduled = True
+            self.after_idle(self.draw_markers)
+
+    def draw_markers(self):
+        """ draws all markers in the visible area and removes markers which left it from the canvas """
+
+        self.marker_redraw_scheduled = False
+        zoom = round(self.zoom)
+
+        # visible area in OSM coordinates at zoom 0, with a border for the marker shapes and texts around the position
+        factor = 2 ** zoom
+        border = (100 + self.render_border) * (self.lower_right_tile_pos[0] - self.upper_left_tile_pos[0]) / self.width
+        x_min, y_min = (self.upper_left_tile_pos[0] - border) / factor, (self.upper_left_tile_pos[1] - border) / factor
+        x_max, y_max = (self.lower_right_tile_pos[0] + border) / factor, (self.lower_right_tile_pos[1] + border) / factor
+
+        visible_markers = []
+        visible_clusters = {}
+        if self.marker_clustering and zoom <= self.marker_cluster_max_zoom:
+            for cluster in self.marker_index.query_clusters(zoom, x_min, y_min, x_max, y_max, self.marker_cluster_size):
+                if len(cluster.markers) >= self.marker_cluster_min_markers:
+                    visible_clusters[(zoom, cluster.cell)] = cluster
+                else:
+                    visible_markers += cluster.markers
+        else:
+            visible_markers = self.marker_index.query(x_min, y_min, x_max, y_max)
+
+        # remove markers and cluster badges which are not visible anymore
+        visible_marker_set = set(visible_markers)
+        for marker in list(self.drawn_marker_set - visible_marker_set):
+            marker.remove_from_canvas()
+        for key in list(self.canvas_marker_clusters.keys() - visible_clusters.keys()):
+            self.canvas_marker_clusters.pop(key).delete()
+
+        for key, cluster in visible_clusters.items():
+            canvas_marker_cluster = self.canvas_marker_clusters.get(key)
+            if canvas_marker_cluster is None:
+                canvas_marker_cluster = CanvasMarkerCluster(self, cluster, zoom)
+                self.canvas_marker_clusters[key] = canvas_marker_cluster
+            else:
+                canvas_marker_cluster.set_cluster(cluster)
+            canvas_marker_cluster.draw()
+
+        for marker in visible_markers:
+            marker.clustered = False
+            marker.draw(manage_z_order=False)
+
+        # markers of visible clusters are not drawn on their own, also if their draw() method is called directly
+        for cluster in visible_clusters.values():
+            for marker in cluster.markers:
+                marker.clustered = True
+
+        self.manage_z_order()
+
     def set_path(self, position_list: list, **kwargs) -> CanvasPath:
         path = CanvasPath(self, position_list, **kwargs)
         path.draw()
@@ -390,9 +604,15 @@ class TkinterMapView(tkinter.Frame):
             map_object.delete()
 
     def delete_all_marker(self):
-        for i in range(len(self.canvas_marker_list) - 1, -1, -1):
-            self.canvas_marker_list[i].delete()
+        for marker in self.canvas_marker_list:
+            marker.remove_from_canvas()
+            marker.deleted = True
         self.canvas_marker_list = []
+        self.marker_index.clear()
+
+        for canvas_marker_cluster in self.canvas_marker_clusters.values():
+            canvas_marker_cluster.delete()
+        self.canvas_marker_clusters = {}
 
     def delete_all_path(self):
         for i in range(len(self.canvas_path_list) - 1, -1, -1):
@@ -412,188 +632,323 @@ class TkinterMapView(tkinter.Frame):
         self.canvas.lift("corner")
         self.canvas.lift("button")
 
-    def pre_cache(self):
-        """ single threaded pre-chache tile images in area of self.pre_cache_position """
+    def configure_prefetching(self, lookahead_time: float = None, border: int = None,
+                              max_tiles_per_update: int = None, max_bytes: int = None, min_tiles_per_plan: int = None):
+        """ configures the tile prefetcher, lookahead_time in seconds of movement, border in tiles around the
+            visible area, max_tiles_per_update limits the requests per position update, max_bytes the memory
+            used by prefetched tiles which were not displayed yet, min_tiles_per_plan the tiles which are
+            loaded before a new position stops the running plan """
+
+        if lookahead_time is not None:
+            self.tile_prefetcher.lookahead_time = lookahead_time
+        if border is not None:
+            self.tile_prefetcher.border = border
+        if max_tiles_per_update is not None:
+            self.tile_prefetcher.max_tiles_per_update = max_tiles_per_update
+        if max_bytes is not None:
+            self.tile_prefetcher.max_bytes = max_bytes
+        if min_tiles_per_plan is not None:
+            self.tile_prefetcher.min_tiles_per_plan = min_tiles_per_plan
+        self.update_prefetch()
+
+    def get_prefetch_stats(self) -> dict:
+        """ returns number of prefetched tiles, number of prefetched tiles which were displayed and their ratio """
+
+        return self.tile_prefetcher.stats()
+
+    def update_prefetch(self):
+        # pass the visible area and the movement in tile coordinates to the prefetcher
+        tile_size = self.tile_size * self.get_tile_scale()
+        self.tile_prefetcher.update(round(self.zoom),
+                                    ((self.upper_left_tile_pos[0] + self.lower_right_tile_pos[0]) / 2,
+                                     (self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2),
+                                    (self.lower_right_tile_pos[0] - self.upper_left_tile_pos[0],
+                                     self.lower_right_tile_pos[1] - self.upper_left_tile_pos[1]),
+                                    (self.move_velocity[0] / tile_size, self.move_velocity[1] / tile_size),
+                                    self.zoom_direction)
+
+    def request_image(self, zoom: int, x: int, y: int) -> Union[Image.Image, ImageTk.PhotoImage]:
+        """ loads and decodes tile image, returns a PIL.Image or self.empty_tile_image if tile is not available
+
+            This method is called from background threads, so it must not create any tkinter objects. The
+            conversion to ImageTk.PhotoImage is done on the main thread in update_canvas_tile_images(). """
+
+        overlay_layers = [layer for layer in self.overlay_layers if layer.is_drawn()]
+        layer_futures = []
 
-        last_pre_cache_position = None
-        radius = 1
-        zoom = round(self.zoom)
+        try:
+            # overlay layers are fetched in parallel while the base map is fetched in this thread
+            layer_futures = [self.layer_fetch_executor.submit(self.request_layer_image, layer.tile_server, zoom, x, y)
+                             for layer in overlay_layers]
+            image = self.request_layer_image(self.tile_server, zoom, x, y, cache=len(overlay_layers) > 0)
+
+            if image is None:  # tile does not exist or is not stored in database
+                if not self.use_database_only:
+                    self.tile_image_cache.put((zoom, x, y), self.empty_tile_image, size=0)  # shared image, no extra memory
+                return self.empty_tile_image
 
-        if self.database_path is not None:
-            db_connection = sqlite3.connect(self.database_path)
-            db_cursor = db_connection.cursor()
-        else:
-            db_cursor = None
+            if len(overlay_layers) > 0:
+                image = composite_tile_images(image, [(future.result(), layer.opacity)
+                                                      for future, layer in zip(layer_futures, overlay_layers)])
 
-        while self.running:
-            if last_pre_cache_position != self.pre_cache_position:
-                last_pre_cache_position = self.pre_cache_position
-                zoom = round(self.zoom)
-                radius = 1
-
-            if last_pre_cache_position is not None and radius <= 8:
-
-                # pre cache top and bottom row
-                for x in range(self.pre_cache_position[0] - radius, self.pre_cache_position[0] + radius + 1):
-                    if f"{zoom}{x}{self.pre_cache_position[1] + radius}" not in self.tile_image_cache:
-                        self.request_image(zoom, x, self.pre_cache_position[1] + radius, db_cursor=db_cursor)
-                    if f"{zoom}{x}{self.pre_cache_position[1] - radius}" not in self.tile_image_cache:
-                        self.request_image(zoom, x, self.pre_cache_position[1] - radius, db_cursor=db_cursor)
-
-                # pre cache left and right column
-                for y in range(self.pre_cache_position[1] - radius, self.pre_cache_position[1] + radius + 1):
-                    if f"{zoom}{self.pre_cache_position[0] + radius}{y}" not in self.tile_image_cache:
-                        self.request_image(zoom, self.pre_cache_position[0] + radius, y, db_cursor=db_cursor)
-                    if f"{zoom}{self.pre_cache_position[0] - radius}{y}" not in self.tile_image_cache:
-                        self.request_image(zoom, self.pre_cache_position[0] - radius, y, db_cursor=db_cursor)
-
-                # raise the radius
-                radius += 1
+            self.tile_image_cache.put((zoom, x, y), image)
+            return image
 
-            else:
-                time.sleep(0.1)
+        except Exception:
+            return self.empty_tile_image
 
-            # 10_000 images = 80 MB RAM-usage
-            if len(self.tile_image_cache) > 10_000:  # delete random tiles if cache is too large
-                # create list with keys to delete
-                keys_to_delete = []
-                for key in self.tile_image_cache.keys():
-                    if len(self.tile_image_cache) - len(keys_to_delete) > 10_000:
-                        keys_to_delete.append(key)
+        finally:
+            # overlay requests which didn't start yet are not needed if the base map failed or doesn't exist
+            for future in layer_futures:
+                future.cancel()
 
-                # delete keys in list so that len(self.tile_image_cache) == 10_000
-                for key in keys_to_delete:
-                    del self.tile_image_cache[key]
+    def request_layer_image(self, tile_server: str, zoom: int, x: int, y: int, cache: bool = True) -> Union[Image.Image, None]:
+        """ loads and decodes the tile of one layer from the database or the server, returns None if the layer
+            has no tile at this position, connection errors are raised. Layer images are cached if cache is True. """
 
-    def request_image(self, zoom: int, x: int, y: int, db_cursor=None) -> ImageTk.PhotoImage:
+        image = self.layer_image_cache.get((tile_server, zoom, x, y), False)
+        if image is not False:
+            return image
 
-        # if database is available check first if tile is in database, if not try to use server
-        if db_cursor is not None:
+        # if database is available check first if tile is in database, if not try to use server,
+        # MBTiles files and tile packs only contain the tiles of the base map
+        tile_image = None
+        if self.tile_store is not None and (self.tile_store.stores_servers or tile_server == self.tile_server):
             try:
-                db_cursor.execute("SELECT t.tile_image FROM tiles t WHERE t.zoom=? AND t.x=? AND t.y=? AND t.server=?;",
-                                  (zoom, x, y, self.tile_server))
-                result = db_cursor.fetchone()
-
-                if result is not None:
-                    image = Image.open(io.BytesIO(result[0]))
-                    image_tk = ImageTk.PhotoImage(image)
-                    self.tile_image_cache[f"{zoom}{x}{y}"] = image_tk
-                    return image_tk
-                elif self.use_database_only:
-                    return self.empty_tile_image
-                else:
-                    pass
-
+                tile_image = self.tile_store.get_tile(zoom, x, y, tile_server)
             except sqlite3.OperationalError:
-                if self.use_database_only:
-                    return self.empty_tile_image
-                else:
-                    pass
+                pass
 
-            except Exception:
-                return self.empty_tile_image
+        if tile_image is None:
+            if self.use_database_only:
+                return None
+
+            # connections to the tile server are pooled and reused
+            tile_image = get_tile_session(tile_server).fetch(zoom, x, y).content
 
-        # try to get the tile from the server
         try:
-            url = self.tile_server.replace("{x}", str(x)).replace("{y}", str(y)).replace("{z}", str(zoom))
-            image = Image.open(requests.get(url, stream=True, headers={"User-Agent": "TkinterMapView"}).raw)
+            image = Image.open(io.BytesIO(tile_image))
+            image.load()  # decode image in this thread, Image.open() only reads the header
+        except PIL.UnidentifiedImageError:  # image does not exist for given coordinates
+            image = None
 
-            if self.overlay_tile_server is not None:
-                url = self.overlay_tile_server.replace("{x}", str(x)).replace("{y}", str(y)).replace("{z}", str(zoom))
-                image_overlay = Image.open(requests.get(url, stream=True, headers={"User-Agent": "TkinterMapView"}).raw)
-                image = image.convert("RGBA")
-                image_overlay = image_overlay.convert("RGBA")
+        if cache:
+            self.layer_image_cache.put((tile_server, zoom, x, y), image)
+        return image
 
-                if image_overlay.size is not (self.tile_size, self.tile_size):
-                    image_overlay = image_overlay.resize((self.tile_size, self.tile_size), Image.ANTIALIAS)
+    def get_tile_image_from_cache(self, zoom: int, x: int, y: int):
+        image = self.tile_image_cache.get((zoom, x, y), False)
+        if image is not False:
+            self.tile_prefetcher.mark_used((zoom, x, y))
+
+        # images loaded by background threads are cached as PIL.Image and converted when they are displayed first
+        if isinstance(image, Image.Image):
+            image = self.convert_tile_image((zoom, x, y), image)
+        return image
+
+    def convert_tile_image(self, tile_key: tuple, image: Image.Image) -> ImageTk.PhotoImage:
+        # must be called from the main thread, replaces decoded PIL.Image in cache with ImageTk.PhotoImage,
+        # the PIL.Image is kept to create scaled images and placeholders for other zoom levels from it
+        image_tk = ImageTk.PhotoImage(image)
+        image_tk.source_image = image
+        self.tile_image_cache.put(tile_key, image_tk, size=image_size_in_bytes(image_tk) + image_size_in_bytes(image))
+        return image_tk
+
+    def get_tile_scale(self) -> float:
+        # tiles of zoom level round(zoom) are scaled by this factor, so that fractional zoom levels are shown smoothly
+        return 2 ** (self.zoom - round(self.zoom))
+
+    def get_displayed_tile_size(self) -> int:
+        return math.ceil(self.tile_size * self.get_tile_scale())
+
+    def get_tile_source_image(self, zoom: int, x: int, y: int) -> Union[Image.Image, None]:
+        # decoded image of a cached tile, peek does not count as cache hit or miss
+        image = self.tile_image_cache.peek((zoom, x, y), None)
+        if isinstance(image, Image.Image):
+            return image
+        return getattr(image, "source_image", None)
+
+    def get_scaled_tile_image(self, zoom: int, x: int, y: int, image):
+        """ returns image scaled to the displayed tile size of a fractional zoom level, scaled images are cached """
+
+        size = self.get_displayed_tile_size()
+        if size == self.tile_size or image is self.empty_tile_image or image is self.not_loaded_tile_image:
+            return image
+
+        scaled_image = self.scaled_tile_image_cache.get((zoom, x, y, size), None)
+        if scaled_image is None:
+            source_image = self.get_tile_source_image(zoom, x, y)
+            if source_image is None:
+                return image
+
+            scaled_image = ImageTk.PhotoImage(source_image.resize((size, size), Image.BILINEAR))
+            self.scaled_tile_image_cache.put((zoom, x, y, size), scaled_image)
+        return scaled_image
+
+    def get_placeholder_image(self, zoom: int, x: int, y: int) -> Union[ImageTk.PhotoImage, None]:
+        """ creates a placeholder for a tile which is not loaded yet from cached tiles of other zoom levels,
+            either from the scaled up part of a parent tile or from the four scaled down child tiles """
+
+        size = self.get_displayed_tile_size()
+        placeholder_key = ("placeholder", zoom, x, y, size)
+        placeholder_image = self.scaled_tile_image_cache.get(placeholder_key, None)
+        if placeholder_image is not None:
+            return placeholder_image
+
+        image = None
+        for zoom_difference in range(1, self.placeholder_zoom_levels + 1):
+            if zoom - zoom_difference < 0:
+                break
 
-                image.paste(image_overlay, (0, 0), image_overlay)
+            source_image = self.get_tile_source_image(zoom - zoom_difference, x >> zoom_difference, y >> zoom_difference)
+            if source_image is not None:
+                part_width = source_image.width / 2 ** zoom_difference
+                part_height = source_image.height / 2 ** zoom_difference
+                left = (x % 2 ** zoom_difference) * part_width
+                top = (y % 2 ** zoom_difference) * part_height
+                image = source_image.resize((size, size), Image.BILINEAR, box=(left, top, left + part_width, top + part_height))
+                break
 
-            if self.running:
-                image_tk = ImageTk.PhotoImage(image)
-            else:
-                return self.empty_tile_image
+        if image is None and zoom < self.max_zoom:
+            child_size = math.ceil(size / 2)
+            for child_x in range(2):
+                for child_y in range(2):
+                    source_image = self.get_tile_source_image(zoom + 1, 2 * x + child_x, 2 * y + child_y)
+                    if source_image is not None:
+                        if image is None:
+                            image = Image.new("RGB", (size, size), (241, 239, 234))  # canvas background color
+                        image.paste(source_image.convert("RGB").resize((child_size, child_size), Image.BILINEAR),
+                                    (child_x * (size // 2), child_y * (size // 2)))
+
+        if image is None:
+            return None
+
+        placeholder_image = ImageTk.PhotoImage(image)
+        self.scaled_tile_image_cache.put(placeholder_key, placeholder_image)
+        return placeholder_image
+
+    def get_tile_image_or_placeholder(self, zoom: int, tile_name_position: tuple) -> tuple:
+        """ returns (image, loaded), if the tile is not cached a placeholder or self.not_loaded_tile_image is
+            returned and loaded is False, then the tile image has to be queued for loading """
+
+        image = self.get_tile_image_from_cache(zoom, *tile_name_position)
+        if image is False:
+            placeholder_image = self.get_placeholder_image(zoom, *tile_name_position)
+            return (self.not_loaded_tile_image if placeholder_image is None else placeholder_image), False
+        return self.get_scaled_tile_image(zoom, *tile_name_position, image), True
+
+    def prefetch_tiles_from_database(self, x_min: int, x_max: int, y_min: int, y_max: int):
+        # all stored tiles of the area are loaded with one range query by the next image load thread,
+        # so the main thread doesn't wait for the database, a newer area replaces one which wasn't loaded yet
+        if self.tile_store is not None:
+            with self.database_prefetch_lock:
+                self.database_prefetch_area = (round(self.zoom), x_min, x_max, y_min, y_max)
+
+    def run_database_prefetch(self):
+        # called by the image load threads, only one of them takes the pending area
+        with self.database_prefetch_lock:
+            area, self.database_prefetch_area = self.database_prefetch_area, None
+
+        if area is not None:
+            try:
+                self.tile_store.prefetch(*area, self.tile_server)
+            except sqlite3.Error:
+                pass
 
-            self.tile_image_cache[f"{zoom}{x}{y}"] = image_tk
-            return image_tk
+    def get_tile_cache_stats(self) -> dict:
+        """ returns hits, misses, evictions and memory usage of the tile image cache """
 
-        except PIL.UnidentifiedImageError:  # image does not exist for given coordinates
-            self.tile_image_cache[f"{zoom}{x}{y}"] = self.empty_tile_image
-            return self.empty_tile_image
+        return self.tile_image_cache.stats()
 
-        except requests.exceptions.ConnectionError:
-            return self.empty_tile_image
+    def pin_visible_tiles(self):
+        # tiles which are currently displayed are never evicted from the tile image cache
+        zoom = round(self.zoom)
+        self.tile_image_cache.pin((zoom, *canvas_tile.tile_name_position) for canvas_tile_column in self.canvas_tile_array
+                                  for canvas_tile in canvas_tile_column)
 
-        except Exception:
-            return self.empty_tile_image
+    def queue_tile_image(self, zoom: int, tile_name_position: tuple, canvas_tile: CanvasTile):
+        # tiles closer to the center of the map get a lower priority value and are loaded first
+        center_x = (self.upper_left_tile_pos[0] + self.lower_right_tile_pos[0]) / 2
+        center_y = (self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2
+        priority = (tile_name_position[0] + 0.5 - center_x) ** 2 + (tile_name_position[1] + 0.5 - center_y) ** 2
 
-    def get_tile_image_from_cache(self, zoom: int, x: int, y: int):
-        if f"{zoom}{x}{y}" not in self.tile_image_cache:
-            return False
-        else:
-            return self.tile_image_cache[f"{zoom}{x}{y}"]
+        # tiles which show a placeholder are loaded after all tiles which show nothing yet
+        if canvas_tile.image is not self.not_loaded_tile_image:
+            priority += 1_000_000
 
-    def load_images_background(self):
-        if self.database_path is not None:
-            db_connection = sqlite3.connect(self.database_path)
-            db_cursor = db_connection.cursor()
-        else:
-            db_cursor = None
+        self.image_load_queue.put(zoom, *tile_name_position, canvas_tile, priority=priority)
 
+    def load_images_background(self):
         while self.running:
-            if len(self.image_load_queue_tasks) > 0:
-                # task queue structure: [((zoom, x, y), corresponding canvas tile object), ... ]
-                task = self.image_load_queue_tasks.pop()
+            task = self.image_load_queue.get()  # blocks until a task is available
+            if task is None:  # queue was closed
+                break
 
-                zoom = task[0][0]
-                x, y = task[0][1], task[0][2]
-                canvas_tile = task[1]
+            self.run_database_prefetch()
 
-                image = self.get_tile_image_from_cache(zoom, x, y)
-                if image is False:
-                    image = self.request_image(zoom, x, y, db_cursor=db_cursor)
-                    if image is None:
-                        self.image_load_queue_tasks.append(task)
-                        continue
+            # tile could be loaded by pre-caching in the meantime, peek does not count as cache miss again
+            image = self.tile_image_cache.peek(task.tile_key, False)
+            if image is False:
+                image = self.request_image(task.zoom, task.x, task.y)
+            else:
+                self.tile_prefetcher.mark_used(task.tile_key)
 
-                # result queue structure: [((zoom, x, y), corresponding canvas tile object, tile image), ... ]
-                self.image_load_queue_results.append(((zoom, x, y), canvas_tile, image))
+            self.image_load_queue.task_done(task)
+            if task.cancelled:
+                continue
 
-            else:
-                time.sleep(0.01)
+            self.image_load_queue_results.append((task, image))
+            self.notify_tile_images_loaded()
 
-    def update_canvas_tile_images(self):
+    def notify_tile_images_loaded(self):
+        # wake up the main thread with a virtual event, only one event is pending at a time
+        if self.image_load_results_notified or not self.running:
+            return
+
+        self.image_load_results_notified = True
+        try:
+            self.event_generate("<<TileImagesLoaded>>", when="tail")
+        except (RuntimeError, tkinter.TclError):
+            # mainloop is not running yet or widget got destroyed, results are handled by the next event
+            self.image_load_results_notified = False
+
+    def update_canvas_tile_images(self, event=None):
+        # This function is called by the <<TileImagesLoaded>> event from the image load threads, so that the
+        # image updates come from the main GUI thread, because tkinter can only be updated from the main thread.
+        # All results which arrived since the last call are applied as one batch with a single z-order update.
+        self.image_load_results_notified = False
+        number_of_updated_tiles = 0
+
+        # tiles are drawn at the current position, so canvas content has to be moved there first
+        if self.rendered_upper_left_tile_pos is not None and self.rendered_upper_left_tile_pos != self.upper_left_tile_pos:
+            self.render()
 
         while len(self.image_load_queue_results) > 0 and self.running:
-            # result queue structure: [((zoom, x, y), corresponding canvas tile object, tile image), ... ]
-            result = self.image_load_queue_results.pop(0)
+            task, image = self.image_load_queue_results.popleft()
 
-            zoom, x, y = result[0][0], result[0][1], result[0][2]
-            canvas_tile = result[1]
-            image = result[2]
+            # check if result is still up to date, otherwise don't update image
+            if not task.cancelled and task.zoom == round(self.zoom):
+                if isinstance(image, Image.Image):
+                    image = self.convert_tile_image(task.tile_key, image)
+                image = self.get_scaled_tile_image(*task.tile_key, image)
 
-            # check if zoom level of result is still up to date, otherwise don't update image
-            if zoom == round(self.zoom):
-                canvas_tile.set_image(image)
+                task.canvas_tile.set_image(image, manage_z_order=False)
+                number_of_updated_tiles += 1
 
-        # This function calls itself every 10 ms with tk.after() so that the image updates come
-        # from the main GUI thread, because tkinter can only be updated from the main thread.
-        if self.running:
-            self.after(10, self.update_canvas_tile_images)
+        if number_of_updated_tiles > 0:
+            self.manage_z_order()
 
     def insert_row(self, insert: int, y_name_position: int):
 
         for x_pos in range(len(self.canvas_tile_array)):
             tile_name_position = self.canvas_tile_array[x_pos][0].tile_name_position[0], y_name_position
 
-            image = self.get_tile_image_from_cache(round(self.zoom), *tile_name_position)
-            if image is False:
-                canvas_tile = CanvasTile(self, self.not_loaded_tile_image, tile_name_position)
-                self.image_load_queue_tasks.append(((round(self.zoom), *tile_name_position), canvas_tile))
-            else:
-                canvas_tile = CanvasTile(self, image, tile_name_position)
+            image, loaded = self.get_tile_image_or_placeholder(round(self.zoom), tile_name_position)
+            canvas_tile = CanvasTile(self, image, tile_name_position)
+            if not loaded:
+                self.queue_tile_image(round(self.zoom), tile_name_position, canvas_tile)
 
-            canvas_tile.draw()
+            canvas_tile.draw(manage_z_order=False)
 
             self.canvas_tile_array[x_pos].insert(insert, canvas_tile)
 
@@ -603,23 +958,20 @@ class TkinterMapView(tkinter.Frame):
         for y_pos in range(len(self.canvas_tile_array[0])):
             tile_name_position = x_name_position, self.canvas_tile_array[0][y_pos].tile_name_position[1]
 
-            image = self.get_tile_image_from_cache(round(self.zoom), *tile_name_position)
-            if image is False:
-                # image is not in image cache, load blank tile and append position to image_load_queue
-                canvas_tile = CanvasTile(self, self.not_loaded_tile_image, tile_name_position)
-                self.image_load_queue_tasks.append(((round(self.zoom), *tile_name_position), canvas_tile))
-            else:
-                # image is already in cache
-                canvas_tile = CanvasTile(self, image, tile_name_position)
+            image, loaded = self.get_tile_image_or_placeholder(round(self.zoom), tile_name_position)
+            canvas_tile = CanvasTile(self, image, tile_name_position)
+            if not loaded:
+                # image is not in image cache, show placeholder and append position to image_load_queue
+                self.queue_tile_image(round(self.zoom), tile_name_position, canvas_tile)
 
-            canvas_tile.draw()
+            canvas_tile.draw(manage_z_order=False)
 
             canvas_tile_column.append(canvas_tile)
 
         self.canvas_tile_array.insert(insert, canvas_tile_column)
 
     def draw_initial_array(self):
-        self.image_load_queue_tasks = []
+        self.image_load_queue.cancel_all()
 
         x_tile_range = math.ceil(self.lower_right_tile_pos[0]) - math.floor(self.upper_left_tile_pos[0])
         y_tile_range = math.ceil(self.lower_right_tile_pos[1]) - math.floor(self.upper_left_tile_pos[1])
@@ -632,6 +984,9 @@ class TkinterMapView(tkinter.Frame):
             for y_pos in range(len(self.canvas_tile_array[0])):
                 self.canvas_tile_array[x_pos][y_pos].__del__()
 
+        # fetch visible tiles and a border of one tile from the database at once
+        self.prefetch_tiles_from_database(upper_left_x - 1, upper_left_x + x_tile_range, upper_left_y - 1, upper_left_y + y_tile_range)
+
         # create tile array with size (x_tile_range x y_tile_range)
         self.canvas_tile_array = []
 
@@ -641,35 +996,32 @@ class TkinterMapView(tkinter.Frame):
             for y_pos in range(y_tile_range):
                 tile_name_position = upper_left_x + x_pos, upper_left_y + y_pos
 
-                image = self.get_tile_image_from_cache(round(self.zoom), *tile_name_position)
-                if image is False:
-                    # image is not in image cache, load blank tile and append position to image_load_queue
-                    canvas_tile = CanvasTile(self, self.not_loaded_tile_image, tile_name_position)
-                    self.image_load_queue_tasks.append(((round(self.zoom), *tile_name_position), canvas_tile))
-                else:
-                    # image is already in cache
-                    canvas_tile = CanvasTile(self, image, tile_name_position)
+                image, loaded = self.get_tile_image_or_placeholder(round(self.zoom), tile_name_position)
+                canvas_tile = CanvasTile(self, image, tile_name_position)
+                if not loaded:
+                    # image is not in image cache, show placeholder and append position to image_load_queue
+                    self.queue_tile_image(round(self.zoom), tile_name_position, canvas_tile)
 
                 canvas_tile_column.append(canvas_tile)
 
             self.canvas_tile_array.append(canvas_tile_column)
 
-        # draw all canvas tiles
+        # draw all canvas tiles, z-order is only updated once afterwards
         for x_pos in range(len(self.canvas_tile_array)):
             for y_pos in range(len(self.canvas_tile_array[0])):
-                self.canvas_tile_array[x_pos][y_pos].draw()
+                self.canvas_tile_array[x_pos][y_pos].draw(manage_z_order=False)
+        self.manage_z_order()
 
         # draw other objects on canvas
-        for marker in self.canvas_marker_list:
-            marker.draw()
+        self.draw_markers()
         for path in self.canvas_path_list:
             path.draw()
         for polygon in self.canvas_polygon_list:
             polygon.draw()
 
-        # update pre-cache position
-        self.pre_cache_position = (round((self.upper_left_tile_pos[0] + self.lower_right_tile_pos[0]) / 2),
-                                   round((self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2))
+        self.update_prefetch()
+        self.pin_visible_tiles()
+        self.set_rendered_position(full_render=True)
 
     def draw_move(self, called_after_zoom: bool = False):
 
@@ -729,51 +1081,123 @@ class TkinterMapView(tkinter.Frame):
                             del self.canvas_tile_array[-1][y]
                         del self.canvas_tile_array[-1]
 
-            # draw all canvas tiles
+            # draw all canvas tiles, z-order is only updated once afterwards
             for x_pos in range(len(self.canvas_tile_array)):
                 for y_pos in range(len(self.canvas_tile_array[0])):
-                    self.canvas_tile_array[x_pos][y_pos].draw()
+                    self.canvas_tile_array[x_pos][y_pos].draw(manage_z_order=False)
+            self.manage_z_order()
 
             # draw other objects on canvas
-            for marker in self.canvas_marker_list:
-                marker.draw()
+            self.draw_markers()
             for path in self.canvas_path_list:
                 path.draw(move=not called_after_zoom)
             for polygon in self.canvas_polygon_list:
                 polygon.draw(move=not called_after_zoom)
 
-            # update pre-cache position
-            self.pre_cache_position = (round((self.upper_left_tile_pos[0] + self.lower_right_tile_pos[0]) / 2),
-                                       round((self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2))
+            self.update_prefetch()
+            self.pin_visible_tiles()
+            self.set_rendered_position(full_render=True)
 
     def draw_zoom(self):
 
         if self.canvas_tile_array:
-            # clear tile image loading queue, so that no old images from other zoom levels get displayed
-            self.image_load_queue_tasks = []
+            # cancel tile image loading tasks, so that no old images from other zoom levels get loaded or displayed
+            self.image_load_queue.cancel_all()
 
             # upper left tile name position
             upper_left_x = math.floor(self.upper_left_tile_pos[0])
             upper_left_y = math.floor(self.upper_left_tile_pos[1])
 
+            # fetch visible tiles and a border of one tile from the database at once
+            self.prefetch_tiles_from_database(upper_left_x - 1, upper_left_x + len(self.canvas_tile_array),
+                                              upper_left_y - 1, upper_left_y + len(self.canvas_tile_array[0]))
+
             for x_pos in range(len(self.canvas_tile_array)):
                 for y_pos in range(len(self.canvas_tile_array[0])):
 
                     tile_name_position = upper_left_x + x_pos, upper_left_y + y_pos
 
-                    image = self.get_tile_image_from_cache(round(self.zoom), *tile_name_position)
-                    if image is False:
-                        image = self.not_loaded_tile_image
-                        # noinspection PyCompatibility
-                        self.image_load_queue_tasks.append(((round(self.zoom), *tile_name_position), self.canvas_tile_array[x_pos][y_pos]))
+                    # tiles which are not loaded yet show a scaled part of a tile from another zoom level
+                    image, loaded = self.get_tile_image_or_placeholder(round(self.zoom), tile_name_position)
+                    self.canvas_tile_array[x_pos][y_pos].set_image_and_position(image, tile_name_position, manage_z_order=False)
+                    if not loaded:
+                        self.queue_tile_image(round(self.zoom), tile_name_position, self.canvas_tile_array[x_pos][y_pos])
 
-                    self.canvas_tile_array[x_pos][y_pos].set_image_and_position(image, tile_name_position)
-
-            self.pre_cache_position = (round((self.upper_left_tile_pos[0] + self.lower_right_tile_pos[0]) / 2),
-                                       round((self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2))
+            self.update_prefetch()
 
             self.draw_move(called_after_zoom=True)
 
+    def set_target_fps(self, target_fps: float):
+        """ sets the maximum number of redraws per second while the map is moved with the mouse or fades out """
+
+        self.target_fps = max(1.0, target_fps)
+
+    def get_frame_time(self) -> float:
+        return 1 / self.target_fps
+
+    def schedule_render(self):
+        # all position changes until the next frame are drawn with one redraw
+        if self.render_scheduled or not self.running:
+            return
+
+        self.render_scheduled = True
+        delay = max(0.0, self.get_frame_time() - (time.time() - self.last_render_time))
+        self.after(round(delay * 1000), self.render)
+
+    def render(self):
+        self.render_scheduled = False
+        if not self.running:
+            return
+
+        self.last_render_time = time.time()
+        if not self.move_canvas_content():
+            self.draw_move()
+
+    def set_rendered_position(self, full_render: bool = False):
+        self.rendered_upper_left_tile_pos = self.upper_left_tile_pos
+        if full_render:
+            self.full_render_upper_left_tile_pos = self.upper_left_tile_pos
+            self.rendered_zoom = round(self.zoom)
+
+    def move_canvas_content(self) -> bool:
+        """ moves all map objects with one canvas.move() if the position changed only slightly since the last
+            complete redraw, returns False if the map has to be redrawn with draw_move() """
+
+        if self.rendered_upper_left_tile_pos is None or self.rendered_zoom != round(self.zoom) or not self.canvas_tile_array:
+            return False
+
+        tile_x_range = self.lower_right_tile_pos[0] - self.upper_left_tile_pos[0]
+        tile_y_range = self.lower_right_tile_pos[1] - self.upper_left_tile_pos[1]
+
+        # visible area has to be covered by the canvas tiles, else tiles have to be added
+        if self.upper_left_tile_pos[0] < self.canvas_tile_array[0][0].tile_name_position[0] or \
+                self.upper_left_tile_pos[1] < self.canvas_tile_array[0][0].tile_name_position[1] or \
+                self.lower_right_tile_pos[0] > self.canvas_tile_array[-1][-1].tile_name_position[0] + 1 or \
+                self.lower_right_tile_pos[1] > self.canvas_tile_array[-1][-1].tile_name_position[1] + 1:
+            return False
+
+        # markers are only drawn in the render border around the area of the last complete redraw
+        full_render_move_x = (self.upper_left_tile_pos[0] - self.full_render_upper_left_tile_pos[0]) / tile_x_range * self.width
+        full_render_move_y = (self.upper_left_tile_pos[1] - self.full_render_upper_left_tile_pos[1]) / tile_y_range * self.height
+        if abs(full_render_move_x) >= self.render_border or abs(full_render_move_y) >= self.render_border:
+            return False
+
+        canvas_move_x = (self.rendered_upper_left_tile_pos[0] - self.upper_left_tile_pos[0]) / tile_x_range * self.width
+        canvas_move_y = (self.rendered_upper_left_tile_pos[1] - self.upper_left_tile_pos[1]) / tile_y_range * self.height
+        self.canvas.move("map", canvas_move_x, canvas_move_y)
+        self.set_rendered_position()
+
+        # paths and polygons are clipped to an area around the widget, they have to be clipped again when it is left
+        for path in self.canvas_path_list:
+            if not path.clip_area_contains_widget():
+                path.draw(move=True)
+        for polygon in self.canvas_polygon_list:
+            if not polygon.clip_area_contains_widget():
+                polygon.draw(move=True)
+
+        self.update_prefetch()
+        return True
+
     def mouse_move(self, event):
         # calculate moving difference from last mouse position
         mouse_move_x = self.last_mouse_down_position[0] - event.x
@@ -803,7 +1227,7 @@ class TkinterMapView(tkinter.Frame):
         self.upper_left_tile_pos = (self.upper_left_tile_pos[0] + tile_move_x, self.upper_left_tile_pos[1] + tile_move_y)
 
         self.check_map_border_crossing()
-        self.draw_move()
+        self.schedule_render()  # motion events are coalesced, the map is drawn at most once per frame
 
     def mouse_click(self, event):
         self.fading_possible = False
@@ -818,6 +1242,10 @@ class TkinterMapView(tkinter.Frame):
         self.fading_possible = True
         self.last_move_time = time.time()
 
+        # the velocity of a drag which stopped before the release is outdated
+        if self.last_move_time - self.last_mouse_down_time >= max(0.1, 2 * self.get_frame_time()):
+            self.move_velocity = (0, 0)
+
         # check if mouse moved after mouse click event
         if self.mouse_click_position == (event.x, event.y):
             # mouse didn't move
@@ -827,14 +1255,14 @@ class TkinterMapView(tkinter.Frame):
                 self.map_click_callback(coordinate_mouse_pos)
         else:
             # mouse was moved, start fading animation
-            self.after(1, self.fading_move)
+            self.after(round(self.get_frame_time() * 1000), self.fading_move)
 
     def fading_move(self):
         delta_t = time.time() - self.last_move_time
         self.last_move_time = time.time()
 
-        # only do fading when at least 10 fps possible and fading is possible (no mouse movement at the moment)
-        if delta_t < 0.1 and self.fading_possible is True:
+        # only do fading when at least 10 fps (or the target fps) possible and fading is possible (no mouse movement at the moment)
+        if delta_t < max(0.1, 2 * self.get_frame_time()) and self.fading_possible is True:
 
             # calculate fading velocity
             mouse_move_x = self.move_velocity[0] * delta_t
@@ -857,11 +1285,17 @@ class TkinterMapView(tkinter.Frame):
             self.upper_left_tile_pos = (self.upper_left_tile_pos[0] + tile_move_x, self.upper_left_tile_pos[1] + tile_move_y)
 
             self.check_map_border_crossing()
-            self.draw_move()
+            self.schedule_render()
 
+            # next fading step in one frame, stepping faster only creates position changes which are never drawn
             if abs(self.move_velocity[0]) > 1 or abs(self.move_velocity[1]) > 1:
                 if self.running:
-                    self.after(1, self.fading_move)
+                    self.after(round(self.get_frame_time() * 1000), self.fading_move)
+                return
+
+        # fading ended, the map doesn't move anymore
+        if self.fading_possible:
+            self.move_velocity = (0, 0)
 
     def set_zoom(self, zoom: int, relative_pointer_x: float = 0.5, relative_pointer_y: float = 0.5):
 
@@ -871,6 +1305,8 @@ class TkinterMapView(tkinter.Frame):
         current_deg_mouse_position = osm_to_decimal(mouse_tile_pos_x,
                                                     mouse_tile_pos_y,
                                                     round(self.zoom))
+        if zoom != self.zoom:
+            self.zoom_direction = 1 if zoom > self.zoom else -1
         self.zoom = zoom
 
         if self.zoom > self.max_zoom:
@@ -880,16 +1316,19 @@ class TkinterMapView(tkinter.Frame):
 
         current_tile_mouse_position = decimal_to_osm(*current_deg_mouse_position, round(self.zoom))
 
-        self.upper_left_tile_pos = (current_tile_mouse_position[0] - relative_pointer_x * (self.width / self.tile_size),
-                                    current_tile_mouse_position[1] - relative_pointer_y * (self.height / self.tile_size))
+        # at fractional zoom levels the tiles of zoom level round(zoom) are shown scaled
+        tile_size = self.tile_size * self.get_tile_scale()
+        self.upper_left_tile_pos = (current_tile_mouse_position[0] - relative_pointer_x * (self.width / tile_size),
+                                    current_tile_mouse_position[1] - relative_pointer_y * (self.height / tile_size))
 
-        self.lower_right_tile_pos = (current_tile_mouse_position[0] + (1 - relative_pointer_x) * (self.width / self.tile_size),
-                                     current_tile_mouse_position[1] + (1 - relative_pointer_y) * (self.height / self.tile_size))
+        self.lower_right_tile_pos = (current_tile_mouse_position[0] + (1 - relative_pointer_x) * (self.width / tile_size),
+                                     current_tile_mouse_position[1] + (1 - relative_pointer_y) * (self.height / tile_size))
 
-        if round(self.zoom) != round(self.last_zoom):
+        if round(self.zoom) != round(self.last_zoom) or self.get_displayed_tile_size() != self.last_displayed_tile_size:
             self.check_map_border_crossing()
             self.draw_zoom()
             self.last_zoom = round(self.zoom)
+            self.last_displayed_tile_size = self.get_displayed_tile_size()
 
     def mouse_zoom(self, event):
         relative_mouse_x = event.x / self.width  # mouse pointer position on map (x=[0..1], y=[0..1])
@@ -0,0 +1,129 @@
+import math
+from typing import TYPE_CHECKING, Dict, Iterator, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from .canvas_position_marker import CanvasPositionMarker
+
+
+class MarkerCluster:
+    """ group of markers which are close to each other at one zoom level, position is the mean of the
+        marker positions in OSM coordinates at zoom 0 """
+
+    __slots__ = ("cell", "markers", "world_position")
+
+    def __init__(self, cell: Tuple[int, int], markers: List["CanvasPositionMarker"], world_position: Tuple[float, float]):
+        self.cell = cell
+        self.markers = markers
+        self.world_position = world_position
+
+
+class MarkerGridIndex:
+    """ spatial index over markers, made for maps with many thousands of markers
+
+        Markers are sorted into a grid of cells in OSM coordinates at zoom 0, so that only the
+        markers of the cells in the visible area have to be looked at when the map is moved
+        or zoomed. For marker clustering, markers are grouped into cells of a fixed size in pixels
+        per zoom level, the groups are cached until a marker is added, removed or moved. """
+
+    def __init__(self, cell_zoom: int = 12):
+        self.cell_size = 1 / 2 ** cell_zoom  # cell has the size of one tile at cell_zoom
+        self._cells: Dict[Tuple[int, int], Set["CanvasPositionMarker"]] = {}
+        self._marker_cells: Dict["CanvasPositionMarker", Tuple[int, int]] = {}
+        self._clusters: Dict[tuple, Dict[Tuple[int, int], MarkerCluster]] = {}
+
+    def __len__(self) -> int:
+        return len(self._marker_cells)
+
+    def __contains__(self, marker: "CanvasPositionMarker") -> bool:
+        return marker in self._marker_cells
+
+    def get_cell(self, world_position: Tuple[float, float]) -> Tuple[int, int]:
+        return math.floor(world_position[0] / self.cell_size), math.floor(world_position[1] / self.cell_size)
+
+    def insert(self, marker: "CanvasPositionMarker"):
+        cell = self.get_cell(marker.get_world_position())
+        self._cells.setdefault(cell, set()).add(marker)
+        self._marker_cells[marker] = cell
+        self._clusters.clear()
+
+    def remove(self, marker: "CanvasPositionMarker"):
+        cell = self._marker_cells.pop(marker, None)
+        if cell is None:
+            return
+
+        markers = self._cells[cell]
+        markers.discard(marker)
+        if len(markers) == 0:
+            del self._cells[cell]
+        self._clusters.clear()
+
+    def update(self, marker: "CanvasPositionMarker"):
+        """ moves marker to the cell of its current position, markers which are not in the index are ignored """
+
+        if marker in self._marker_cells:
+            self.remove(marker)
+            self.insert(marker)
+
+    def clear(self):
+        self._cells.clear()
+        self._marker_cells.clear()
+        self._clusters.clear()
+
+    @staticmethod
+    def _iter_cells_in_range(cells: dict, cell_x_min: int, cell_y_min: int, cell_x_max: int, cell_y_max: int) -> Iterator[tuple]:
+        # look up the cells of the range or filter all cells, whatever is less work
+        if (cell_x_max - cell_x_min + 1) * (cell_y_max - cell_y_min + 1) <= len(cells):
+            for cell_x in range(cell_x_min, cell_x_max + 1):
+                for cell_y in range(cell_y_min, cell_y_max + 1):
+                    value = cells.get((cell_x, cell_y))
+                    if value is not None:
+                        yield value
+        else:
+            for (cell_x, cell_y), value in cells.items():
+                if cell_x_min <= cell_x <= cell_x_max and cell_y_min <= cell_y <= cell_y_max:
+                    yield value
+
+    def query(self, x_min: float, y_min: float, x_max: float, y_max: float) -> List["CanvasPositionMarker"]:
+        """ returns all markers inside the area, coordinates are OSM coordinates at zoom 0 """
+
+        cell_x_min, cell_y_min = self.get_cell((x_min, y_min))
+        cell_x_max, cell_y_max = self.get_cell((x_max, y_max))
+
+        markers = []
+        for cell_markers in self._iter_cells_in_range(self._cells, cell_x_min, cell_y_min, cell_x_max, cell_y_max):
+            for marker in cell_markers:
+                world_x, world_y = marker.get_world_position()
+                if x_min <= world_x <= x_max and y_min <= world_y <= y_max:
+                    markers.append(marker)
+        return markers
+
+    def get_clusters(self, zoom: int, cluster_size: int = 60) -> Dict[Tuple[int, int], MarkerCluster]:
+        """ groups all markers into square cells of cluster_size pixels at zoom (256 pixels per tile), the result
+            is cached until the index changes """
+
+        key = (zoom, cluster_size)
+        clusters = self._clusters.get(key)
+        if clusters is None:
+            cluster_cell_size = cluster_size / 256 / 2 ** zoom
+            cell_markers: Dict[Tuple[int, int], List["CanvasPositionMarker"]] = {}
+            for marker in self._marker_cells:
+                world_x, world_y = marker.get_world_position()
+                cell_markers.setdefault((math.floor(world_x / cluster_cell_size), math.floor(world_y / cluster_cell_size)), []).append(marker)
+
+            clusters = {}
+            for cell, markers in cell_markers.items():
+                world_position = (sum(marker.get_world_position()[0] for marker in markers) / len(markers),
+                                  sum(marker.get_world_position()[1] for marker in markers) / len(markers))
+                clusters[cell] = MarkerCluster(cell, markers, world_position)
+            self._clusters[key] = clusters
+        return clusters
+
+    def query_clusters(self, zoom: int, x_min: float, y_min: float, x_max: float, y_max: float,
+                       cluster_size: int = 60) -> List[MarkerCluster]:
+        """ returns the clusters of get_clusters() whose cells overlap the area, coordinates are OSM coordinates at zoom 0 """
+
+        clusters = self.get_clusters(zoom, cluster_size)
+        cluster_cell_size = cluster_size / 256 / 2 ** zoom
+        return list(self._iter_cells_in_range(clusters,
+                                              math.floor(x_min / cluster_cell_size), math.floor(y_min / cluster_cell_size),
+                                              math.floor(x_max / cluster_cell_size), math.floor(y_max / cluster_cell_size)))
@@ -0,0 +1,172 @@
+import ast
+from typing import Dict, Iterable, Tuple, Union
+
+from .tile_store import TileStore, open_tile_store
+
+
+class MBTilesStore(TileStore):
+    """ tile database in the standard MBTiles layout (https://github.com/mapbox/mbtiles-spec)
+
+        Can be used everywhere a TileStore is used. MBTiles files contain tiles of one tileset only,
+        so the server argument of the tile methods is ignored. Rows are stored in TMS order
+        (y axis flipped), conversion from and to the OSM tile coordinates is done here. The
+        sections, server and tile_validators tables of TileStore are added as extra tables. """
+
+    # an MBTiles file holds the tiles of one server
+    stores_servers = False
+
+    create_tiles_table = """CREATE TABLE IF NOT EXISTS tiles (
+                                    zoom_level INTEGER NOT NULL,
+                                    tile_column INTEGER NOT NULL,
+                                    tile_row INTEGER NOT NULL,
+                                    tile_data BLOB NOT NULL);"""
+    create_tiles_index = "CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row);"
+    create_metadata_table = "CREATE TABLE IF NOT EXISTS metadata (name TEXT NOT NULL, value TEXT);"
+    create_metadata_index = "CREATE UNIQUE INDEX IF NOT EXISTS name ON metadata (name);"
+
+    select_tile_cmd = "SELECT t.tile_data FROM tiles t WHERE t.zoom_level=? AND t.tile_column=? AND t.tile_row=?;"
+    select_tile_range_cmd = """SELECT t.tile_column, t.tile_row, t.tile_data FROM tiles t
+                               WHERE t.zoom_level=? AND t.tile_column BETWEEN ? AND ? AND t.tile_row BETWEEN ? AND ?;"""
+    select_tile_keys_range_cmd = """SELECT t.tile_column, t.tile_row, v.etag, v.last_modified FROM tiles t
+                                    LEFT JOIN tile_validators v ON v.zoom=t.zoom_level AND v.x=t.tile_column
+                                                                   AND v.y=(1 << t.zoom_level) - 1 - t.tile_row AND v.server=?
+                                    WHERE t.zoom_level=? AND t.tile_column BETWEEN ? AND ? AND t.tile_row BETWEEN ? AND ?;"""
+    insert_tile_cmd = "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?);"
+
+    @staticmethod
+    def flip_y(zoom: int, y: int) -> int:
+        # converts between OSM (XYZ) row and TMS row, the conversion is its own inverse
+        return (1 << zoom) - 1 - y
+
+    def create_tables(self, metadata: Dict[str, str] = None):
+        with self.connection as db_connection:
+            db_connection.execute(self.create_metadata_table)
+            db_connection.execute(self.create_metadata_index)
+            db_connection.execute(self.create_tiles_table)
+            db_connection.execute(self.create_tiles_index)
+            db_connection.execute(self.create_server_table)
+            db_connection.execute(self.create_sections_table)
+            db_connection.execute(self.create_tile_validators_table)
+            db_connection.execute(self.create_download_progress_table)
+
+        default_metadata = {"name": "offline_tiles", "format": "png", "type": "baselayer", "version": "1.1"}
+        self.set_metadata({**default_metadata, **self.get_metadata(), **(metadata or {})})
+
+    def get_metadata(self) -> Dict[str, str]:
+        return dict(self.connection.execute("SELECT m.name, m.value FROM metadata m;").fetchall())
+
+    def set_metadata(self, metadata: Dict[str, Union[str, int, float]]):
+        with self.connection as db_connection:
+            db_connection.executemany("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?);",
+                                      [(name, str(value)) for name, value in metadata.items()])
+
+    def add_section(self, position_a, position_b, zoom_a: int, zoom_b: int, server: str):
+        super().add_section(position_a, position_b, zoom_a, zoom_b, server)
+
+        # extend bounds (west, south, east, north) and zoom range in metadata to contain the new section
+        metadata = self.get_metadata()
+        bounds = [min(position_a[1], position_b[1]), min(position_a[0], position_b[0]),
+                  max(position_a[1], position_b[1]), max(position_a[0], position_b[0])]
+        if "bounds" in metadata:
+            old_bounds = [float(value) for value in metadata["bounds"].split(",")]
+            bounds = [min(bounds[0], old_bounds[0]), min(bounds[1], old_bounds[1]),
+                      max(bounds[2], old_bounds[2]), max(bounds[3], old_bounds[3])]
+
+        self.set_metadata({"bounds": ",".join(str(value) for value in bounds),
+                           "minzoom": min(round(zoom_a), int(metadata.get("minzoom", zoom_a))),
+                           "maxzoom": max(round(zoom_b), int(metadata.get("maxzoom", zoom_b)))})
+
+    def get_tile(self, zoom: int, x: int, y: int, server: str = None) -> Union[bytes, None]:
+        return super().get_tile(zoom, x, y, server)
+
+    def query_tile(self, zoom: int, x: int, y: int, server: str = None) -> Union[bytes, None]:
+        result = self.connection.execute(self.select_tile_cmd, (zoom, x, self.flip_y(zoom, y))).fetchone()
+        return None if result is None else result[0]
+
+    def get_tiles_in_range(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str = None) -> Dict[Tuple[int, int], bytes]:
+        self.range_queries += 1
+        result = self.connection.execute(self.select_tile_range_cmd,
+                                         (zoom, x_min, x_max, self.flip_y(zoom, y_max), self.flip_y(zoom, y_min)))
+        return {(x, self.flip_y(zoom, tile_row)): tile_data for x, tile_row, tile_data in result}
+
+    def get_tile_keys_in_range(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str = None) -> Dict[Tuple[int, int], tuple]:
+        self.range_queries += 1
+        result = self.connection.execute(self.select_tile_keys_range_cmd,
+                                         (server, zoom, x_min, x_max, self.flip_y(zoom, y_max), self.flip_y(zoom, y_min)))
+        return {(x, self.flip_y(zoom, tile_row)): (etag, last_modified) for x, tile_row, etag, last_modified in result}
+
+    def insert_tiles(self, tiles: Iterable[tuple]):
+        """ inserts many tiles in one transaction, tiles: (zoom, x, y, server, tile_image), server is ignored """
+
+        with self.connection as db_connection:
+            db_connection.executemany(self.insert_tile_cmd,
+                                      ((zoom, x, self.flip_y(zoom, y), tile_image) for zoom, x, y, _, tile_image in tiles))
+
+    def iter_tiles(self, server: str = None) -> Iterable[Tuple[int, int, int, bytes]]:
+        result = self.connection.execute("SELECT t.zoom_level, t.tile_column, t.tile_row, t.tile_data FROM tiles t "
+                                         "ORDER BY t.zoom_level, t.tile_column, t.tile_row DESC;")
+        for zoom, x, tile_row, tile_data in result:
+            yield zoom, x, self.flip_y(zoom, tile_row), tile_data
+
+    def count_tiles(self, server: str = None) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM tiles;").fetchone()[0]
+
+
+def copy_tiles(source_store: TileStore, target_store: TileStore, server: str, batch_size: int = 1_000) -> int:
+    """ copies all tiles of server from source_store to target_store in batches, returns number of copied tiles """
+
+    number_of_tiles = 0
+    batch = []
+    for zoom, x, y, tile_image in source_store.iter_tiles(server):
+        batch.append((zoom, x, y, server, tile_image))
+
+        if len(batch) >= batch_size:
+            target_store.insert_tiles(batch)
+            number_of_tiles += len(batch)
+            batch = []
+
+    if len(batch) > 0:
+        target_store.insert_tiles(batch)
+        number_of_tiles += len(batch)
+    return number_of_tiles
+
+
+def export_mbtiles(db_path: str, mbtiles_path: str, server: str, metadata: Dict[str, str] = None) -> int:
+    """ exports all tiles of server from an OfflineLoader database into an MBTiles file """
+
+    source_store = open_tile_store(db_path)
+    target_store = MBTilesStore(mbtiles_path)
+    try:
+        target_store.create_tables(metadata)
+        number_of_tiles = copy_tiles(source_store, target_store, server)
+
+        # take over sections of server, so that the metadata bounds are set
+        for position_a, position_b, zoom_a, zoom_b, section_server in source_store.get_sections():
+            if section_server == server:
+                target_store.add_section(ast.literal_eval(position_a), ast.literal_eval(position_b), zoom_a, zoom_b, server)
+        return number_of_tiles
+    finally:
+        source_store.close()
+        target_store.close()
+
+
+def import_mbtiles(mbtiles_path: str, db_path: str, server: str, max_zoom: int = 19) -> int:
+    """ imports all tiles of an MBTiles file into an OfflineLoader database under the given server url """
+
+    source_store = MBTilesStore(mbtiles_path)
+    target_store = open_tile_store(db_path)
+    try:
+        target_store.create_tables()
+        target_store.add_server(server, max_zoom)
+        number_of_tiles = copy_tiles(source_store, target_store, server)
+
+        # register the bounds of the MBTiles file as section
+        metadata = source_store.get_metadata()
+        if "bounds" in metadata:
+            west, south, east, north = (float(value) for value in metadata["bounds"].split(","))
+            target_store.add_section((north, west), (south, east), int(metadata.get("minzoom", 0)),
+                                     int(metadata.get("maxzoom", max_zoom)), server)
+        return number_of_tiles
+    finally:
+        source_store.close()
+        target_store.close()
@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable, Tuple, Union
+
+
+def image_size_in_bytes(image) -> int:
+    """ estimates the memory usage of a PIL.Image or PIL.ImageTk.PhotoImage in bytes """
+
+    if hasattr(image, "getbands"):  # PIL.Image
+        return image.width * image.height * len(image.getbands())
+    elif hasattr(image, "width") and callable(image.width):  # PIL.ImageTk.PhotoImage or tkinter.PhotoImage
+        return image.width() * image.height() * 4  # tk stores photo images with 32 bit per pixel
+    else:
+        return 0
+
+
+class TileImageCache:
+    """ thread-safe LRU cache for tile images with a memory budget in bytes
+
+        Keys are (zoom, x, y) tuples. When the budget is exceeded, the least recently used
+        tiles are evicted first, except for pinned tiles (usually the tiles currently visible). """
+
+    def __init__(self, max_bytes: int = 256_000_000):
+        self.max_bytes = max_bytes
+        self.current_bytes: int = 0
+
+        # statistics, can be read at runtime or with stats()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._entries: "OrderedDict[tuple, Tuple[object, int]]" = OrderedDict()  # key: (image, size in bytes)
+        self._pinned_keys: frozenset = frozenset()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        # membership check does not count as hit or miss and does not change the LRU order
+        with self._lock:
+            return key in self._entries
+
+    def keys(self) -> list:
+        """ returns the keys from least to most recently used """
+
+        with self._lock:
+            return list(self._entries.keys())
+
+    def get(self, key: tuple, default=None):
+        """ returns image for key and marks it as recently used, counts a hit or a miss """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: tuple, default=None):
+        """ returns image for key without changing the LRU order or the statistics """
+
+        with self._lock:
+            entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: tuple, image, size: Union[int, None] = None):
+        """ inserts image for key, size in bytes is estimated from the image if not given """
+
+        if size is None:
+            size = image_size_in_bytes(image)
+
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self.current_bytes -= old_entry[1]
+
+            self._entries[key] = (image, size)
+            self.current_bytes += size
+            self._evict()
+
+    def pop(self, key: tuple, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def pin(self, keys: Iterable[tuple]):
+        """ replaces the set of pinned keys, pinned tiles are never evicted """
+
+        self._pinned_keys = frozenset(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned_keys = frozenset()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {"entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / requests if requests > 0 else 0.0}
+
+    def _evict(self):
+        if self.current_bytes <= self.max_bytes:
+            return
+
+        # walk from least to most recently used and skip pinned tiles
+        keys_to_delete = []
+        freed_bytes = 0
+        for key, (_, size) in self._entries.items():
+            if self.current_bytes - freed_bytes <= self.max_bytes:
+                break
+            if key not in self._pinned_keys:
+                keys_to_delete.append(key)
+                freed_bytes += size
+
+        for key in keys_to_delete:
+            del self._entries[key]
+
+        self.current_bytes -= freed_bytes
+        self.evictions += len(keys_to_delete)
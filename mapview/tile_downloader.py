@@ -0,0 +1,259 @@
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Tuple, Union
+
+from .utility_functions import decimal_to_osm
+from .tile_session import TileSession
+
+
+def get_tile_range(position_a: Tuple[float, float], position_b: Tuple[float, float], zoom: int) -> Tuple[int, int, int, int]:
+    """ returns (x_min, x_max, y_min, y_max) of the tiles which cover the bounding box at zoom, bounds are inclusive """
+
+    tile_position_a = decimal_to_osm(*position_a, zoom)
+    tile_position_b = decimal_to_osm(*position_b, zoom)
+    max_tile = 2 ** zoom - 1
+
+    x_min = max(0, math.floor(min(tile_position_a[0], tile_position_b[0])))
+    x_max = min(max_tile, math.floor(max(tile_position_a[0], tile_position_b[0])))
+    y_min = max(0, math.floor(min(tile_position_a[1], tile_position_b[1])))
+    y_max = min(max_tile, math.floor(max(tile_position_a[1], tile_position_b[1])))
+    return x_min, x_max, y_min, y_max
+
+
+def count_tile_positions(position_a: Tuple[float, float], position_b: Tuple[float, float], zoom_a: int, zoom_b: int) -> int:
+    """ returns the number of tiles in a bounding box and zoom range without creating them """
+
+    number_of_tiles = 0
+    for zoom in range(round(zoom_a), round(zoom_b) + 1):
+        x_min, x_max, y_min, y_max = get_tile_range(position_a, position_b, zoom)
+        number_of_tiles += (x_max - x_min + 1) * (y_max - y_min + 1)
+    return number_of_tiles
+
+
+def iter_tile_positions(position_a: Tuple[float, float], position_b: Tuple[float, float], zoom_a: int, zoom_b: int,
+                        start_after: Tuple[int, int, int] = None) -> Iterator[Tuple[int, int, int]]:
+    """ yields (zoom, x, y) of all tiles in a bounding box and zoom range ordered by zoom, x, y,
+        if start_after is given, all tiles up to and including start_after are skipped without iterating them """
+
+    for zoom in range(round(zoom_a), round(zoom_b) + 1):
+        if start_after is not None and zoom < start_after[0]:
+            continue
+
+        x_min, x_max, y_min, y_max = get_tile_range(position_a, position_b, zoom)
+        for x in range(x_min, x_max + 1):
+            first_y = y_min
+            if start_after is not None and zoom == start_after[0]:
+                if x < start_after[1]:
+                    continue
+                elif x == start_after[1]:
+                    first_y = max(y_min, start_after[2] + 1)
+
+            for y in range(first_y, y_max + 1):
+                yield zoom, x, y
+
+
+class DownloadProgress:
+    """ progress of a TileDownloader download, passed to callbacks and yielded by TileDownloader.iter_download() """
+
+    def __init__(self, tiles_total: int):
+        self.tiles_total = tiles_total
+        self.tiles_done: int = 0  # downloaded, skipped and failed tiles, including tiles done before a resume
+        self.tiles_downloaded: int = 0
+        self.tiles_not_modified: int = 0  # stored tiles which were revalidated with a 304 Not Modified answer
+        self.tiles_skipped: int = 0  # stored tiles or tiles which don't exist on the server
+        self.tiles_failed: int = 0
+        self.bytes_downloaded: int = 0
+        self.zoom: Union[int, None] = None
+        self.last_tile_position: Union[Tuple[int, int, int], None] = None
+        self.resumed: bool = False
+        self.stopped: bool = False
+        self.finished: bool = False
+        self.start_time = time.time()
+
+    @property
+    def percent(self) -> float:
+        return 100.0 if self.tiles_total == 0 else self.tiles_done / self.tiles_total * 100
+
+    @property
+    def elapsed_time(self) -> float:
+        return time.time() - self.start_time
+
+    def __repr__(self):
+        return (f"DownloadProgress(zoom={self.zoom}, done={self.tiles_done}/{self.tiles_total}, downloaded={self.tiles_downloaded}, "
+                f"skipped={self.tiles_skipped}, failed={self.tiles_failed}, bytes={self.bytes_downloaded})")
+
+
+def print_download_progress(progress: DownloadProgress):
+    """ callback for TileDownloader and OfflineLoader which writes the progress to stdout """
+
+    print(f"\r[save_offline_tiles] zoom: {progress.zoom}  tiles: {progress.tiles_done:>8}/{progress.tiles_total:<8}"
+          f"  progress: {progress.percent:5.1f}%  downloaded: {progress.bytes_downloaded / 1024 ** 2:8.1f} MB",
+          end="\n" if progress.finished or progress.stopped else "", flush=True)
+
+
+class TileDownloader:
+    """ downloads all tiles of a bounding box and zoom range into a TileStore
+
+        Tiles are created lazily and processed in chunks of chunk_size tiles. After each chunk the tiles
+        are inserted in one transaction and the position of the last tile is saved, so that a killed or
+        stopped download continues there when it is started again. The request rate is limited by the
+        rate limit of the TileSession. Progress is reported to callback and by iter_download(). """
+
+    def __init__(self,
+                 tile_store,
+                 tile_session: TileSession,
+                 number_of_threads: int = 8,
+                 chunk_size: int = 500,
+                 revalidate: bool = False,
+                 max_zoom: int = 19,
+                 callback: Callable[[DownloadProgress], None] = None):
+
+        self.tile_store = tile_store
+        self.tile_session = tile_session
+        self.server = tile_session.tile_server
+        self.number_of_threads = number_of_threads
+        self.chunk_size = chunk_size
+        self.revalidate = revalidate
+        self.max_zoom = max_zoom
+        self.callback = callback
+
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """ stops the download after the current chunk, it can be resumed later """
+
+        self._stop_event.set()
+
+    def download(self, position_a: Tuple[float, float], position_b: Tuple[float, float], zoom_a: int, zoom_b: int) -> DownloadProgress:
+        """ downloads all tiles and returns the final progress """
+
+        progress = None
+        for progress in self.iter_download(position_a, position_b, zoom_a, zoom_b):
+            pass
+        return progress
+
+    def iter_download(self, position_a: Tuple[float, float], position_b: Tuple[float, float],
+                      zoom_a: int, zoom_b: int) -> Iterator[DownloadProgress]:
+        """ downloads all tiles and yields the progress after every chunk """
+
+        self._stop_event.clear()
+        self.tile_store.create_tables()
+        self.tile_store.add_server(self.server, self.max_zoom)
+
+        section = (position_a, position_b, zoom_a, zoom_b, self.server)
+        progress = DownloadProgress(count_tile_positions(position_a, position_b, zoom_a, zoom_b))
+
+        if self.tile_store.has_section(*section) and not self.revalidate:
+            progress.tiles_done = progress.tiles_skipped = progress.tiles_total
+            progress.finished = True
+            self.report(progress)
+            yield progress
+            return
+
+        # continue after the last saved tile of an unfinished download
+        start_after = self.tile_store.get_download_progress(*section)
+        if start_after is not None:
+            progress.resumed = True
+            progress.tiles_done = progress.tiles_skipped = self.count_tiles_up_to(position_a, position_b, zoom_a, start_after)
+
+        with ThreadPoolExecutor(max_workers=self.number_of_threads) as executor:
+            for chunk in self.iter_chunks(iter_tile_positions(position_a, position_b, zoom_a, zoom_b, start_after=start_after)):
+                self.process_chunk(chunk, executor, progress)
+
+                # tiles of the chunk are saved, so the download can be resumed after the last tile of the chunk
+                progress.last_tile_position = chunk[-1]
+                self.tile_store.set_download_progress(*section, chunk[-1])
+
+                self.report(progress)
+                yield progress
+
+                if self._stop_event.is_set():
+                    progress.stopped = True
+                    self.report(progress)
+                    yield progress
+                    return
+
+        # download is complete, failed tiles are retried when the section is downloaded again
+        self.tile_store.set_download_progress(*section, None)
+        if progress.tiles_failed == 0:
+            self.tile_store.add_section(*section)
+
+        progress.finished = True
+        self.report(progress)
+        yield progress
+
+    def report(self, progress: DownloadProgress):
+        if self.callback is not None:
+            self.callback(progress)
+
+    @staticmethod
+    def count_tiles_up_to(position_a, position_b, zoom_a: int, tile_position: Tuple[int, int, int]) -> int:
+        # number of tiles which are ordered before and including tile_position
+        zoom, x, y = tile_position
+        number_of_tiles = count_tile_positions(position_a, position_b, zoom_a, zoom - 1) if zoom > round(zoom_a) else 0
+        x_min, x_max, y_min, y_max = get_tile_range(position_a, position_b, zoom)
+        return number_of_tiles + (x - x_min) * (y_max - y_min + 1) + (y - y_min + 1)
+
+    def iter_chunks(self, tile_positions: Iterator[Tuple[int, int, int]]) -> Iterator[List[Tuple[int, int, int]]]:
+        # chunks only contain tiles of one zoom level, so that stored tiles can be found with one range query
+        chunk = []
+        for tile_position in tile_positions:
+            if len(chunk) >= self.chunk_size or (len(chunk) > 0 and chunk[-1][0] != tile_position[0]):
+                yield chunk
+                chunk = []
+            chunk.append(tile_position)
+
+        if len(chunk) > 0:
+            yield chunk
+
+    def process_chunk(self, chunk: List[Tuple[int, int, int]], executor: ThreadPoolExecutor, progress: DownloadProgress):
+        zoom = chunk[0][0]
+        progress.zoom = zoom
+
+        # get stored tiles of the chunk with one range query
+        x_values = [x for _, x, _ in chunk]
+        y_values = [y for _, _, y in chunk]
+        stored_tiles = self.tile_store.get_tile_keys_in_range(zoom, min(x_values), max(x_values), min(y_values), max(y_values), self.server)
+
+        tasks = []
+        for _, x, y in chunk:
+            if (x, y) not in stored_tiles:
+                tasks.append((zoom, x, y, None, None))
+            elif self.revalidate:
+                tasks.append((zoom, x, y, *stored_tiles[(x, y)]))
+            else:
+                progress.tiles_skipped += 1
+                progress.tiles_done += 1
+
+        tiles, validators = [], []
+        for task, result in zip(tasks, executor.map(self.fetch_tile, tasks)):
+            progress.tiles_done += 1
+
+            if result is None:
+                progress.tiles_failed += 1
+            elif result.ok:
+                tiles.append((zoom, task[1], task[2], self.server, result.content))
+                if result.etag is not None or result.last_modified is not None:
+                    validators.append((zoom, task[1], task[2], self.server, result.etag, result.last_modified))
+                progress.tiles_downloaded += 1
+                progress.bytes_downloaded += len(result.content)
+            elif result.not_modified:
+                progress.tiles_not_modified += 1
+            else:
+                progress.tiles_skipped += 1  # tile does not exist on server
+
+        if len(tiles) > 0:
+            self.tile_store.insert_tiles(tiles)
+        if len(validators) > 0:
+            self.tile_store.insert_tile_validators(validators)
+
+    def fetch_tile(self, task: tuple):
+        zoom, x, y, etag, last_modified = task
+        try:
+            return self.tile_session.fetch(zoom, x, y, etag=etag, last_modified=last_modified)
+        except Exception as err:
+            sys.stderr.write(f"[TileDownloader] tile {zoom}/{x}/{y}: {err}\n")
+            return None
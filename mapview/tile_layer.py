@@ -0,0 +1,49 @@
+from typing import List, Tuple, Union
+
+from PIL import Image
+
+
+class TileLayer:
+    """ overlay tile server which is drawn over the base map, layers are drawn in the order they were added """
+
+    def __init__(self,
+                 tile_server: str,
+                 opacity: float = 1.0,
+                 visible: bool = True,
+                 name: str = None):
+
+        self.tile_server = tile_server
+        self.opacity = min(max(opacity, 0.0), 1.0)
+        self.visible = visible
+        self.name = name
+
+    def is_drawn(self) -> bool:
+        return self.visible and self.opacity > 0
+
+    def __repr__(self):
+        return f"TileLayer(tile_server={self.tile_server!r}, opacity={self.opacity}, visible={self.visible}, name={self.name!r})"
+
+
+def composite_tile_images(base_image: Image.Image,
+                          layer_images: List[Tuple[Union[Image.Image, None], float]]) -> Image.Image:
+    """ draws the layer images with their opacity over the base image, layer_images: (image or None, opacity),
+        layer images of another size are scaled to the size of the base image """
+
+    image = base_image.convert("RGBA")
+
+    for layer_image, opacity in layer_images:
+        if layer_image is None:  # layer has no tile at this position
+            continue
+
+        layer_image = layer_image.convert("RGBA")
+        if layer_image.size != image.size:
+            layer_image = layer_image.resize(image.size, Image.LANCZOS)
+
+        if opacity < 1:
+            alpha = layer_image.getchannel("A").point(lambda value: round(value * opacity))
+            layer_image.putalpha(alpha)
+
+        image = Image.alpha_composite(image, layer_image)
+
+    # tiles are opaque, so the alpha channel is not needed anymore
+    return image.convert("RGB")
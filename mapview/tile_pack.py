@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Tuple, Union
+
+
+class TilePack:
+    """ read-only tile archive which is memory-mapped, made for shipping large regional tile sets
+
+        Opening a pack only reads the header, tiles are found with a binary search in the index
+        and read directly from the memory-mapped file, so no database has to be scanned. It can be
+        used by TkinterMapView like a TileStore, the server argument of the tile methods is ignored.
+
+        File layout (little endian):
+            header: magic b"FTKTPACK", version (uint32), number of tiles (uint64), index offset (uint64)
+            data:   tile images one after another
+            index:  one entry per tile sorted by key: key (uint64), data offset (uint64), data length (uint32)
+
+        The key of a tile is (zoom << 58) | (x << 29) | y, so all tiles of one column are next to each other. """
+
+    stores_servers = False
+
+    magic = b"FTKTPACK"
+    version = 1
+    header_struct = struct.Struct("<8sIQQ")
+    index_struct = struct.Struct("<QQI")
+    key_struct = struct.Struct("<Q")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = None
+        try:
+            # empty files can't be mapped and files shorter than the header can't be unpacked
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.number_of_tiles, self._index_offset = self.header_struct.unpack_from(self._mmap, 0)
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError(f"TilePack: {path} is not a tile pack file") from None
+
+        if magic != self.magic:
+            self.close()
+            raise ValueError(f"TilePack: {path} is not a tile pack file")
+        if version != self.version:
+            self.close()
+            raise ValueError(f"TilePack: unsupported tile pack version {version}")
+
+        # statistics, can be read at runtime or with stats()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.range_queries: int = 0
+
+    @staticmethod
+    def tile_key(zoom: int, x: int, y: int) -> int:
+        return (zoom << 58) | (x << 29) | y
+
+    @classmethod
+    def build(cls, path: str, tiles: Iterable[Tuple[int, int, int, bytes]]) -> int:
+        """ writes a tile pack from (zoom, x, y, tile_image) tuples, tiles are streamed to the file and only
+            the index is kept in memory. Returns the number of tiles in the pack. """
+
+        index = {}
+        with open(path, "wb") as file:
+            file.write(cls.header_struct.pack(cls.magic, cls.version, 0, 0))  # placeholder, written again at the end
+            offset = cls.header_struct.size
+
+            for zoom, x, y, tile_image in tiles:
+                file.write(tile_image)
+                index[cls.tile_key(zoom, x, y)] = (offset, len(tile_image))  # later duplicates replace earlier ones
+                offset += len(tile_image)
+
+            for key in sorted(index):
+                file.write(cls.index_struct.pack(key, *index[key]))
+
+            file.seek(0)
+            file.write(cls.header_struct.pack(cls.magic, cls.version, len(index), offset))
+        return len(index)
+
+    def _key_at(self, position: int) -> int:
+        return self.key_struct.unpack_from(self._mmap, self._index_offset + position * self.index_struct.size)[0]
+
+    def _bisect(self, key: int) -> int:
+        # returns position of the first index entry with a key >= key
+        low, high = 0, self.number_of_tiles
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _read_entry(self, position: int) -> Tuple[int, bytes]:
+        key, offset, length = self.index_struct.unpack_from(self._mmap, self._index_offset + position * self.index_struct.size)
+        return key, self._mmap[offset:offset + length]
+
+    def query_tile(self, zoom: int, x: int, y: int, server: str = None) -> Union[bytes, None]:
+        key = self.tile_key(zoom, x, y)
+        position = self._bisect(key)
+
+        if position < self.number_of_tiles and self._key_at(position) == key:
+            return self._read_entry(position)[1]
+        return None
+
+    def get_tile(self, zoom: int, x: int, y: int, server: str = None) -> Union[bytes, None]:
+        if x < 0 or y < 0:
+            self.misses += 1
+            return None
+
+        tile_image = self.query_tile(zoom, x, y)
+        if tile_image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return tile_image
+
+    def get_tiles_in_range(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str = None) -> Dict[Tuple[int, int], bytes]:
+        self.range_queries += 1
+        tiles = {}
+
+        for x in range(max(x_min, 0), x_max + 1):
+            # tiles of one column are stored next to each other, so one binary search per column is enough
+            end_key = self.tile_key(zoom, x, y_max)
+            position = self._bisect(self.tile_key(zoom, x, max(y_min, 0)))
+
+            while position < self.number_of_tiles:
+                key, tile_image = self._read_entry(position)
+                if key > end_key:
+                    break
+                tiles[(x, key & ((1 << 29) - 1))] = tile_image
+                position += 1
+        return tiles
+
+    def get_tile_keys_in_range(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str = None) -> Dict[Tuple[int, int], tuple]:
+        # tile packs store no validators for conditional requests
+        return {tile_position: (None, None) for tile_position in self.get_tiles_in_range(zoom, x_min, x_max, y_min, y_max)}
+
+    def prefetch(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str = None) -> int:
+        # tiles are read from the memory-mapped file directly, the operating system caches the pages
+        return 0
+
+    def iter_tiles(self, server: str = None) -> Iterable[Tuple[int, int, int, bytes]]:
+        for position in range(self.number_of_tiles):
+            key, tile_image = self._read_entry(position)
+            yield key >> 58, (key >> 29) & ((1 << 29) - 1), key & ((1 << 29) - 1), tile_image
+
+    def count_tiles(self, server: str = None) -> int:
+        return self.number_of_tiles
+
+    def reset_stats(self):
+        self.hits, self.misses, self.range_queries = 0, 0, 0
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {"file_size": os.path.getsize(self.path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "prefetch_hits": 0,
+                "range_queries": self.range_queries,
+                "hit_rate": self.hits / requests if requests > 0 else 0.0}
+
+    def close(self):
+        try:
+            self._mmap.close()
+        except (AttributeError, ValueError, BufferError):
+            pass
+        self._file.close()
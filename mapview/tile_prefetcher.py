@@ -0,0 +1,181 @@
+import math
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, List, Set, Tuple
+
+from .tile_cache import image_size_in_bytes
+
+if TYPE_CHECKING:
+    from .map_widget import TkinterMapView
+
+
+class TilePrefetcher:
+    """ loads tile images into the tile image cache of a map widget before they become visible
+
+        The next visible area is predicted from the current move velocity of the map, tiles are
+        prefetched along this heading first, then around the visible area and for the zoom level
+        the map was zoomed to last. A new position only changes the plan after the first
+        min_tiles_per_plan tiles of the running plan are loaded, so that updates in every frame
+        don't stop each plan after one tile. Tiles which are already cached or queued by the map
+        widget are skipped, so a long movement never loads the same tiles again. The number of
+        tiles per position update and the memory used by unused prefetched tiles are limited. """
+
+    def __init__(self,
+                 map_widget: "TkinterMapView",
+                 lookahead_time: float = 1.0,
+                 border: int = 2,
+                 max_tiles_per_update: int = 64,
+                 min_tiles_per_plan: int = 8,
+                 max_bytes: int = 48_000_000):
+
+        self.map_widget = map_widget
+        self.lookahead_time = lookahead_time  # seconds of movement which are prefetched in advance
+        self.border = border  # tiles around the visible and the predicted area
+        self.max_tiles_per_update = max_tiles_per_update
+        self.min_tiles_per_plan = min_tiles_per_plan  # tiles which are loaded before a new position stops a plan
+        self.max_bytes = max_bytes  # memory budget of prefetched tiles which were not displayed yet
+
+        # statistics, can be read at runtime or with stats()
+        self.prefetched_tiles: int = 0
+        self.used_tiles: int = 0
+
+        self._view = None  # (zoom, center, size, velocity, zoom_direction) of the last update
+        self._generation = 0  # incremented with every update, a running plan stops if it changes (after min_tiles_per_plan)
+        self._unused_tiles: dict = {}  # tile key: size in bytes of prefetched tiles which were not displayed yet
+        self._lock = threading.Lock()
+        self._update_event = threading.Event()
+        self._running = True
+
+        self._thread = threading.Thread(daemon=True, target=self.run)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._update_event.set()
+
+    def update(self, zoom: int, center: Tuple[float, float], size: Tuple[float, float],
+               velocity: Tuple[float, float] = (0, 0), zoom_direction: int = 0):
+        """ sets the visible area, center and size are in tile coordinates at zoom, velocity in tiles per second
+            is the movement of the visible area, zoom_direction is 1 or -1 if the map was zoomed in or out last """
+
+        with self._lock:
+            self._view = (zoom, center, size, velocity, zoom_direction)
+            self._generation += 1
+        self._update_event.set()
+
+    def mark_used(self, tile_key: tuple):
+        """ has to be called when a tile gets displayed, counts prefetched tiles which were actually used """
+
+        with self._lock:
+            if self._unused_tiles.pop(tile_key, None) is not None:
+                self.used_tiles += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.prefetched_tiles, self.used_tiles = 0, 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"prefetched_tiles": self.prefetched_tiles,
+                    "used_tiles": self.used_tiles,
+                    "unused_bytes": sum(self._unused_tiles.values()),
+                    "usage_rate": self.used_tiles / self.prefetched_tiles if self.prefetched_tiles > 0 else 0.0}
+
+    @staticmethod
+    def get_area_tiles(zoom: int, center: Tuple[float, float], size: Tuple[float, float], border: int) -> List[tuple]:
+        # tiles of an area sorted by distance to its center
+        x_min, x_max = math.floor(center[0] - size[0] / 2) - border, math.floor(center[0] + size[0] / 2) + border
+        y_min, y_max = math.floor(center[1] - size[1] / 2) - border, math.floor(center[1] + size[1] / 2) + border
+        max_tile = 2 ** zoom - 1
+
+        tiles = [(zoom, x, y) for x in range(max(x_min, 0), min(x_max, max_tile) + 1)
+                 for y in range(max(y_min, 0), min(y_max, max_tile) + 1)]
+        tiles.sort(key=lambda tile: (tile[1] + 0.5 - center[0]) ** 2 + (tile[2] + 0.5 - center[1]) ** 2)
+        return tiles
+
+    def plan(self, zoom: int, center: Tuple[float, float], size: Tuple[float, float],
+             velocity: Tuple[float, float], zoom_direction: int) -> List[tuple]:
+        """ returns the tiles to prefetch in the order they are loaded """
+
+        planned_tiles: List[tuple] = []
+        planned_set: Set[tuple] = set()
+
+        def add_tiles(tiles: List[tuple]):
+            for tile in tiles:
+                if tile not in planned_set:
+                    planned_set.add(tile)
+                    planned_tiles.append(tile)
+
+        # areas which become visible along the heading, nearest in time first
+        if velocity[0] != 0 or velocity[1] != 0:
+            for step in (0.25, 0.5, 0.75, 1.0):
+                predicted_center = (center[0] + velocity[0] * self.lookahead_time * step,
+                                    center[1] + velocity[1] * self.lookahead_time * step)
+                add_tiles(self.get_area_tiles(zoom, predicted_center, size, 0))
+
+        # border around the visible area
+        add_tiles(self.get_area_tiles(zoom, center, size, self.border))
+
+        # visible area at the zoom level the map is zoomed to next, zooming out is cheap, so it is always done
+        if zoom_direction > 0 and zoom < self.map_widget.max_zoom:
+            add_tiles(self.get_area_tiles(zoom + 1, (center[0] * 2, center[1] * 2), size, 0))
+        if zoom > 0:
+            add_tiles(self.get_area_tiles(zoom - 1, (center[0] / 2, center[1] / 2), size, 0))
+
+        return planned_tiles
+
+    def prefetch_from_database(self, planned_tiles: List[tuple]):
+        # load stored tiles of the planned area with one range query per zoom level
+        tile_store = self.map_widget.tile_store
+        if tile_store is None:
+            return
+
+        for zoom in {tile[0] for tile in planned_tiles}:
+            tiles = [tile for tile in planned_tiles if tile[0] == zoom]
+            try:
+                tile_store.prefetch(zoom, min(tile[1] for tile in tiles), max(tile[1] for tile in tiles),
+                                    min(tile[2] for tile in tiles), max(tile[2] for tile in tiles), self.map_widget.tile_server)
+            except sqlite3.Error:
+                pass
+
+    def remove_evicted_tiles(self):
+        # prefetched tiles which were evicted from the tile image cache are not counted for the memory budget anymore
+        with self._lock:
+            for tile_key in [tile_key for tile_key in self._unused_tiles if tile_key not in self.map_widget.tile_image_cache]:
+                del self._unused_tiles[tile_key]
+
+    def run(self):
+        while self._running and self.map_widget.running:
+            self._update_event.wait()
+            self._update_event.clear()
+
+            with self._lock:
+                view, generation = self._view, self._generation
+            if view is None or not self._running:
+                continue
+
+            planned_tiles = self.plan(*view)
+            self.prefetch_from_database(planned_tiles)
+            self.remove_evicted_tiles()
+
+            number_of_requests = 0
+            for tile_key in planned_tiles:
+                # stop if the map moved, the next plan starts from the new position
+                if not self._running or (generation != self._generation and number_of_requests >= self.min_tiles_per_plan):
+                    break
+                if number_of_requests >= self.max_tiles_per_update:
+                    break
+                with self._lock:
+                    if sum(self._unused_tiles.values()) >= self.max_bytes:
+                        break
+
+                if tile_key in self.map_widget.tile_image_cache or tile_key in self.map_widget.image_load_queue:
+                    continue
+
+                image = self.map_widget.request_image(*tile_key)
+                number_of_requests += 1
+
+                if image is not self.map_widget.empty_tile_image:
+                    with self._lock:
+                        self._unused_tiles[tile_key] = image_size_in_bytes(image)
+                        self.prefetched_tiles += 1
@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import threading
+from typing import Dict, List, Union
+
+
+class TileLoadTask:
+    """ request to load the image of tile (zoom, x, y) into a canvas tile """
+
+    __slots__ = ("zoom", "x", "y", "canvas_tile", "priority", "cancelled")
+
+    def __init__(self, zoom: int, x: int, y: int, canvas_tile, priority: float = 0):
+        self.zoom = zoom
+        self.x = x
+        self.y = y
+        self.canvas_tile = canvas_tile
+        self.priority = priority
+        self.cancelled = False
+
+    @property
+    def tile_key(self) -> tuple:
+        return self.zoom, self.x, self.y
+
+
+class TileLoadQueue:
+    """ blocking, thread-safe priority queue for tile load tasks
+
+        Tasks with the lowest priority value are returned first. Cancelled tasks are dropped
+        from the queue and are marked as cancelled, so that workers which already took them
+        can discard their result. """
+
+    def __init__(self):
+        self._heap: List[tuple] = []  # entries: (priority, insertion counter, task)
+        self._pending: Dict[object, TileLoadTask] = {}  # canvas tile -> queued or in-flight task
+        self._pending_tile_keys: Dict[tuple, int] = {}  # tile key -> number of queued or in-flight tasks
+        self._counter = itertools.count()  # keeps insertion order for tasks with equal priority
+        self._condition = threading.Condition()
+        self.closed = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, tile_key: tuple) -> bool:
+        """ True if the image of tile_key is queued or being loaded """
+
+        with self._condition:
+            return tile_key in self._pending_tile_keys
+
+    def _add_pending(self, task: TileLoadTask):
+        self._pending[task.canvas_tile] = task
+        self._pending_tile_keys[task.tile_key] = self._pending_tile_keys.get(task.tile_key, 0) + 1
+
+    def _remove_pending(self, task: TileLoadTask):
+        del self._pending[task.canvas_tile]
+        count = self._pending_tile_keys.pop(task.tile_key) - 1
+        if count > 0:
+            self._pending_tile_keys[task.tile_key] = count
+
+    def put(self, zoom: int, x: int, y: int, canvas_tile, priority: float = 0) -> TileLoadTask:
+        task = TileLoadTask(zoom, x, y, canvas_tile, priority)
+
+        with self._condition:
+            # a canvas tile only waits for one image at a time
+            old_task = self._pending.get(canvas_tile)
+            if old_task is not None:
+                old_task.cancelled = True
+                self._remove_pending(old_task)
+
+            self._add_pending(task)
+            heapq.heappush(self._heap, (priority, next(self._counter), task))
+            self._condition.notify()
+
+        return task
+
+    def get(self, timeout: Union[float, None] = None) -> Union[TileLoadTask, None]:
+        """ blocks until a task is available, returns None if queue got closed or timeout expired """
+
+        with self._condition:
+            while True:
+                while len(self._heap) > 0:
+                    task = heapq.heappop(self._heap)[2]
+                    if not task.cancelled:
+                        return task
+
+                if self.closed:
+                    return None
+                if not self._condition.wait(timeout) and timeout is not None:
+                    return None
+
+    def task_done(self, task: TileLoadTask):
+        with self._condition:
+            if self._pending.get(task.canvas_tile) is task:
+                self._remove_pending(task)
+
+    def cancel(self, canvas_tile):
+        """ cancels the task of a canvas tile, for example when the tile got deleted """
+
+        with self._condition:
+            task = self._pending.get(canvas_tile)
+            if task is not None:
+                task.cancelled = True
+                self._remove_pending(task)
+
+    def cancel_all(self):
+        """ cancels all queued and in-flight tasks, for example after a zoom level change """
+
+        with self._condition:
+            for task in self._pending.values():
+                task.cancelled = True
+            self._pending.clear()
+            self._pending_tile_keys.clear()
+            self._heap.clear()
+
+    def close(self):
+        """ cancels all tasks and wakes up all waiting workers, get() returns None afterwards """
+
+        with self._condition:
+            self.closed = True
+            self.cancel_all()
+            self._condition.notify_all()
@@ -0,0 +1,156 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Tuple, Union
+
+
+class TileResponse:
+    """ result of a tile request, content is None if the server answered with 304 Not Modified """
+
+    __slots__ = ("status_code", "content", "etag", "last_modified")
+
+    def __init__(self, status_code: int, content: Union[bytes, None], etag: str = None, last_modified: str = None):
+        self.status_code = status_code
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200 and self.content is not None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+
+class RateLimiter:
+    """ thread-safe token bucket, acquire() blocks until a request is allowed """
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_time) * self.requests_per_second)
+            self._last_time = now
+
+            # reserve a token, if none is available wait until the reserved token is refilled
+            self._tokens -= 1
+            wait_time = -self._tokens / self.requests_per_second if self._tokens < 0 else 0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class TileSession:
+    """ pooled HTTP session for one tile server
+
+        Connections are kept alive and reused between tile requests. The number of concurrent
+        connections is limited by max_connections, requests which fail with a connection error
+        or a 429/5xx status code are retried with exponential backoff. If max_requests_per_second
+        is set, all threads using this session together don't exceed this request rate. """
+
+    def __init__(self,
+                 tile_server: str,
+                 max_connections: int = 25,
+                 timeout: Union[float, Tuple[float, float]] = (5, 15),
+                 retries: int = 3,
+                 backoff_factor: float = 0.3,
+                 user_agent: str = "TkinterMapView",
+                 max_requests_per_second: float = None):
+
+        self.tile_server = tile_server
+        self.max_connections = max_connections
+        self.timeout = timeout  # seconds, either one value or (connect timeout, read timeout)
+        self.rate_limiter: Union[RateLimiter, None] = None
+        self.set_rate_limit(max_requests_per_second)
+
+        retry = Retry(total=retries,
+                      backoff_factor=backoff_factor,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET"]),
+                      raise_on_status=False)
+
+        # pool_block=True makes threads wait for a free connection instead of opening additional ones
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, pool_block=True, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def set_rate_limit(self, max_requests_per_second: Union[float, None]):
+        """ limits the request rate to the tile server, None disables the limit """
+
+        if max_requests_per_second is None:
+            self.rate_limiter = None
+        else:
+            self.rate_limiter = RateLimiter(max_requests_per_second)
+
+    def get_url(self, zoom: int, x: int, y: int) -> str:
+        return self.tile_server.replace("{x}", str(x)).replace("{y}", str(y)).replace("{z}", str(zoom))
+
+    def fetch(self, zoom: int, x: int, y: int, etag: str = None, last_modified: str = None) -> TileResponse:
+        """ requests tile (zoom, x, y), if etag or last_modified of a stored tile are given, the request is
+            conditional and the server can answer with 304 Not Modified instead of sending the tile again """
+
+        headers = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        response = self.session.get(self.get_url(zoom, x, y), headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304:
+            return TileResponse(304, None, etag=response.headers.get("ETag", etag),
+                                last_modified=response.headers.get("Last-Modified", last_modified))
+
+        return TileResponse(response.status_code, response.content,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"))
+
+    def close(self):
+        self.session.close()
+
+
+_tile_sessions: Dict[str, TileSession] = {}
+_tile_sessions_lock = threading.Lock()
+
+
+def get_tile_session(tile_server: str, **kwargs) -> TileSession:
+    """ returns the shared session for tile_server, kwargs are only used when the session gets created """
+
+    with _tile_sessions_lock:
+        tile_session = _tile_sessions.get(tile_server)
+        if tile_session is None:
+            tile_session = TileSession(tile_server, **kwargs)
+            _tile_sessions[tile_server] = tile_session
+        return tile_session
+
+
+def configure_tile_session(tile_server: str, **kwargs) -> TileSession:
+    """ replaces the shared session for tile_server with a new one using the given options
+
+        max_connections, timeout, retries, backoff_factor, user_agent and max_requests_per_second can be set. """
+
+    with _tile_sessions_lock:
+        old_tile_session = _tile_sessions.get(tile_server)
+        tile_session = TileSession(tile_server, **kwargs)
+        _tile_sessions[tile_server] = tile_session
+
+    if old_tile_session is not None:
+        old_tile_session.close()
+    return tile_session
@@ -0,0 +1,273 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple, Union
+
+
+class TileStore:
+    """ SQLite database for offline tiles, used by TkinterMapView and OfflineLoader
+
+        The database is opened in WAL mode, so that the map widget can read tiles while the
+        OfflineLoader writes. Every thread gets its own connection. Tiles of a whole visible
+        area can be fetched with one range query and downloaded tiles are inserted in batches. """
+
+    # tiles of several servers are stored, the server argument of the tile methods selects them
+    stores_servers = True
+
+    create_server_table = """CREATE TABLE IF NOT EXISTS server (
+                                    url VARCHAR(300) PRIMARY KEY NOT NULL,
+                                    max_zoom INTEGER NOT NULL);"""
+
+    create_tiles_table = """CREATE TABLE IF NOT EXISTS tiles (
+                                    zoom INTEGER NOT NULL,
+                                    x INTEGER NOT NULL,
+                                    y INTEGER NOT NULL,
+                                    server VARCHAR(300) NOT NULL,
+                                    tile_image BLOB NOT NULL,
+                                    CONSTRAINT fk_server FOREIGN KEY (server) REFERENCES server (url),
+                                    CONSTRAINT pk_tiles PRIMARY KEY (zoom, x, y, server));"""
+
+    create_sections_table = """CREATE TABLE IF NOT EXISTS sections (
+                                        position_a VARCHAR(100) NOT NULL,
+                                        position_b VARCHAR(100) NOT NULL,
+                                        zoom_a INTEGER NOT NULL,
+                                        zoom_b INTEGER NOT NULL,
+                                        server VARCHAR(300) NOT NULL,
+                                        CONSTRAINT fk_server FOREIGN KEY (server) REFERENCES server (url),
+                                        CONSTRAINT pk_tiles PRIMARY KEY (position_a, position_b, zoom_a, zoom_b, server));"""
+
+    # validators (ETag, Last-Modified) of stored tiles for conditional requests
+    create_tile_validators_table = """CREATE TABLE IF NOT EXISTS tile_validators (
+                                              zoom INTEGER NOT NULL,
+                                              x INTEGER NOT NULL,
+                                              y INTEGER NOT NULL,
+                                              server VARCHAR(300) NOT NULL,
+                                              etag VARCHAR(300),
+                                              last_modified VARCHAR(100),
+                                              CONSTRAINT pk_tile_validators PRIMARY KEY (zoom, x, y, server));"""
+
+    # position after the last saved tile of an unfinished OfflineLoader download, used to resume it
+    create_download_progress_table = """CREATE TABLE IF NOT EXISTS download_progress (
+                                                position_a VARCHAR(100) NOT NULL,
+                                                position_b VARCHAR(100) NOT NULL,
+                                                zoom_a INTEGER NOT NULL,
+                                                zoom_b INTEGER NOT NULL,
+                                                server VARCHAR(300) NOT NULL,
+                                                zoom INTEGER NOT NULL,
+                                                x INTEGER NOT NULL,
+                                                y INTEGER NOT NULL,
+                                                CONSTRAINT pk_download_progress PRIMARY KEY (position_a, position_b, zoom_a, zoom_b, server));"""
+
+    # statements are constant strings, so that sqlite3 can reuse its prepared statements
+    select_tile_cmd = "SELECT t.tile_image FROM tiles t WHERE t.zoom=? AND t.x=? AND t.y=? AND t.server=?;"
+    select_tile_range_cmd = """SELECT t.x, t.y, t.tile_image FROM tiles t
+                               WHERE t.zoom=? AND t.x BETWEEN ? AND ? AND t.y BETWEEN ? AND ? AND t.server=?;"""
+    select_tile_keys_range_cmd = """SELECT t.x, t.y, v.etag, v.last_modified FROM tiles t
+                                    LEFT JOIN tile_validators v ON v.zoom=t.zoom AND v.x=t.x AND v.y=t.y AND v.server=t.server
+                                    WHERE t.zoom=? AND t.x BETWEEN ? AND ? AND t.y BETWEEN ? AND ? AND t.server=?;"""
+    insert_tile_cmd = "INSERT OR REPLACE INTO tiles (zoom, x, y, server, tile_image) VALUES (?, ?, ?, ?, ?);"
+    insert_tile_validator_cmd = """INSERT OR REPLACE INTO tile_validators (zoom, x, y, server, etag, last_modified)
+                                   VALUES (?, ?, ?, ?, ?, ?);"""
+
+    def __init__(self, db_path: str, timeout: float = 10, max_prefetched_tiles: int = 2_000):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.max_prefetched_tiles = max_prefetched_tiles
+
+        self._local = threading.local()  # one connection per thread
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        # tiles loaded by prefetch(), (zoom, x, y, server) -> tile image data
+        self._prefetched_tiles: Dict[tuple, bytes] = {}
+
+        # statistics, can be read at runtime or with stats()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.prefetch_hits: int = 0
+        self.range_queries: int = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        db_connection = getattr(self._local, "connection", None)
+        if db_connection is None:
+            db_connection = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            db_connection.execute("PRAGMA journal_mode=WAL;")  # readers don't block the writer and vice versa
+            db_connection.execute("PRAGMA synchronous=NORMAL;")  # safe in WAL mode and much faster for bulk inserts
+            self._local.connection = db_connection
+
+            with self._lock:
+                self._connections.append(db_connection)
+        return db_connection
+
+    def close(self):
+        with self._lock:
+            for db_connection in self._connections:
+                try:
+                    db_connection.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+    def create_tables(self):
+        with self.connection as db_connection:
+            db_connection.execute(self.create_server_table)
+            db_connection.execute(self.create_tiles_table)
+            db_connection.execute(self.create_sections_table)
+            db_connection.execute(self.create_tile_validators_table)
+            db_connection.execute(self.create_download_progress_table)
+
+    def add_server(self, url: str, max_zoom: int):
+        with self.connection as db_connection:
+            db_connection.execute("INSERT OR IGNORE INTO server (url, max_zoom) VALUES (?, ?);", (url, max_zoom))
+
+    def get_sections(self) -> list:
+        return self.connection.execute("SELECT * FROM sections;").fetchall()
+
+    def has_section(self, position_a, position_b, zoom_a: int, zoom_b: int, server: str) -> bool:
+        result = self.connection.execute("SELECT 1 FROM sections s WHERE s.position_a=? AND s.position_b=? AND s.zoom_a=? AND s.zoom_b=? AND s.server=?;",
+                                         (str(position_a), str(position_b), zoom_a, zoom_b, server))
+        return result.fetchone() is not None
+
+    def add_section(self, position_a, position_b, zoom_a: int, zoom_b: int, server: str):
+        with self.connection as db_connection:
+            db_connection.execute("INSERT OR IGNORE INTO sections (position_a, position_b, zoom_a, zoom_b, server) VALUES (?, ?, ?, ?, ?);",
+                                  (str(position_a), str(position_b), zoom_a, zoom_b, server))
+
+    def get_download_progress(self, position_a, position_b, zoom_a: int, zoom_b: int, server: str) -> Union[Tuple[int, int, int], None]:
+        """ returns (zoom, x, y) of the last saved tile of an unfinished download or None """
+
+        result = self.connection.execute("""SELECT p.zoom, p.x, p.y FROM download_progress p
+                                            WHERE p.position_a=? AND p.position_b=? AND p.zoom_a=? AND p.zoom_b=? AND p.server=?;""",
+                                         (str(position_a), str(position_b), zoom_a, zoom_b, server))
+        return result.fetchone()
+
+    def set_download_progress(self, position_a, position_b, zoom_a: int, zoom_b: int, server: str, tile_position: Union[Tuple[int, int, int], None]):
+        """ saves (zoom, x, y) of the last saved tile of a download, None deletes the progress of a finished download """
+
+        with self.connection as db_connection:
+            if tile_position is None:
+                db_connection.execute("""DELETE FROM download_progress
+                                         WHERE position_a=? AND position_b=? AND zoom_a=? AND zoom_b=? AND server=?;""",
+                                      (str(position_a), str(position_b), zoom_a, zoom_b, server))
+            else:
+                db_connection.execute("""INSERT OR REPLACE INTO download_progress (position_a, position_b, zoom_a, zoom_b, server, zoom, x, y)
+                                         VALUES (?, ?, ?, ?, ?, ?, ?, ?);""",
+                                      (str(position_a), str(position_b), zoom_a, zoom_b, server, *tile_position))
+
+    def get_tile(self, zoom: int, x: int, y: int, server: str) -> Union[bytes, None]:
+        """ returns image data of tile or None if tile is not in database """
+
+        with self._lock:
+            tile_image = self._prefetched_tiles.pop((zoom, x, y, server), None)
+        if tile_image is not None:
+            self.prefetch_hits += 1
+            self.hits += 1
+            return tile_image
+
+        tile_image = self.query_tile(zoom, x, y, server)
+        if tile_image is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return tile_image
+
+    def query_tile(self, zoom: int, x: int, y: int, server: str) -> Union[bytes, None]:
+        result = self.connection.execute(self.select_tile_cmd, (zoom, x, y, server)).fetchone()
+        return None if result is None else result[0]
+
+    def iter_tiles(self, server: str = None) -> Iterable[Tuple[int, int, int, bytes]]:
+        """ yields (zoom, x, y, tile_image) of all stored tiles ordered by zoom, x, y without loading all at once """
+
+        if server is None:
+            result = self.connection.execute("SELECT t.zoom, t.x, t.y, t.tile_image FROM tiles t ORDER BY t.zoom, t.x, t.y;")
+        else:
+            result = self.connection.execute("SELECT t.zoom, t.x, t.y, t.tile_image FROM tiles t WHERE t.server=? ORDER BY t.zoom, t.x, t.y;",
+                                             (server,))
+        yield from result
+
+    def get_tiles_in_range(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str) -> Dict[Tuple[int, int], bytes]:
+        """ returns image data of all tiles in the rectangle (inclusive bounds) with one query, key is (x, y) """
+
+        self.range_queries += 1
+        result = self.connection.execute(self.select_tile_range_cmd, (zoom, x_min, x_max, y_min, y_max, server))
+        return {(x, y): tile_image for x, y, tile_image in result}
+
+    def get_tile_keys_in_range(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str) -> Dict[Tuple[int, int], tuple]:
+        """ returns (etag, last_modified) of all stored tiles in the rectangle without loading image data, key is (x, y) """
+
+        self.range_queries += 1
+        result = self.connection.execute(self.select_tile_keys_range_cmd, (zoom, x_min, x_max, y_min, y_max, server))
+        return {(x, y): (etag, last_modified) for x, y, etag, last_modified in result}
+
+    def prefetch(self, zoom: int, x_min: int, x_max: int, y_min: int, y_max: int, server: str) -> int:
+        """ loads all tiles in the rectangle with one range query, following get_tile() calls for these
+            tiles are answered from memory. Returns number of prefetched tiles. """
+
+        tiles = self.get_tiles_in_range(zoom, x_min, x_max, y_min, y_max, server)
+
+        # get_tile() is called by other threads at the same time, the query above runs without the lock
+        with self._lock:
+            # only keep tiles of the latest prefetched areas
+            if len(self._prefetched_tiles) + len(tiles) > self.max_prefetched_tiles:
+                self._prefetched_tiles = {}
+
+            for (x, y), tile_image in tiles.items():
+                self._prefetched_tiles[(zoom, x, y, server)] = tile_image
+        return len(tiles)
+
+    def insert_tiles(self, tiles: Iterable[tuple]):
+        """ inserts many tiles in one transaction, tiles: (zoom, x, y, server, tile_image) """
+
+        with self.connection as db_connection:
+            db_connection.executemany(self.insert_tile_cmd, tiles)
+
+    def insert_tile_validators(self, validators: Iterable[tuple]):
+        """ inserts many tile validators in one transaction, validators: (zoom, x, y, server, etag, last_modified) """
+
+        with self.connection as db_connection:
+            db_connection.executemany(self.insert_tile_validator_cmd, validators)
+
+    def count_tiles(self, server: str = None) -> int:
+        if server is None:
+            return self.connection.execute("SELECT COUNT(*) FROM tiles;").fetchone()[0]
+        else:
+            return self.connection.execute("SELECT COUNT(*) FROM tiles t WHERE t.server=?;", (server,)).fetchone()[0]
+
+    def reset_stats(self):
+        self.hits, self.misses, self.prefetch_hits, self.range_queries = 0, 0, 0, 0
+
+    def stats(self) -> dict:
+        """ returns database file size in bytes, hits and misses of tile lookups and hit rate """
+
+        requests = self.hits + self.misses
+        file_size = 0
+        for path in (self.db_path, self.db_path + "-wal"):
+            if os.path.exists(path):
+                file_size += os.path.getsize(path)
+
+        return {"file_size": file_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "prefetch_hits": self.prefetch_hits,
+                "range_queries": self.range_queries,
+                "hit_rate": self.hits / requests if requests > 0 else 0.0}
+
+
+def open_tile_store(path: str):
+    """ opens the offline tile storage at path depending on its file extension:
+        .mbtiles -> MBTilesStore, .tilepack -> TilePack (read-only), otherwise TileStore """
+
+    # imported here, because MBTilesStore is a subclass of TileStore
+    from .mbtiles import MBTilesStore
+    from .tile_pack import TilePack
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".mbtiles":
+        return MBTilesStore(path)
+    elif extension == ".tilepack":
+        return TilePack(path)
+    else:
+        return TileStore(path)
@@ -1,6 +1,13 @@
-import geocoder
 import math
-from typing import Union
+from collections import OrderedDict
+from typing import Union, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # batch functions fall back to plain python loops
+
+from .geocoding import GeocodingResult, get_geocoding_service
 
 
 def decimal_to_osm(lat_deg: float, lon_deg: float, zoom: int) -> tuple:
@@ -27,14 +34,250 @@ def osm_to_decimal(tile_x: Union[int, float], tile_y: Union[int, float], zoom: i
     return lat_deg, lon_deg
 
 
-def convert_coordinates_to_address(deg_x: float, deg_y: float) -> geocoder.osm_reverse.OsmReverse:
+def decimal_to_osm_array(positions: Sequence[Tuple[float, float]], zoom: int = 0):
+    """ converts a sequence of (lat, lon) decimal coordinates to internal OSM coordinates in one step,
+        returns a numpy array with shape (n, 2) or a list of (x, y) tuples if numpy is not installed """
+
+    if np is None:
+        return [decimal_to_osm(lat_deg, lon_deg, zoom) for lat_deg, lon_deg in positions]
+
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    lat_rad = np.radians(positions[:, 0])
+    n = 2.0 ** zoom
+
+    tile_positions = np.empty_like(positions)
+    tile_positions[:, 0] = (positions[:, 1] + 180.0) / 360.0 * n
+    tile_positions[:, 1] = (1.0 - np.log(np.tan(lat_rad) + (1 / np.cos(lat_rad))) / math.pi) / 2.0 * n
+    return tile_positions
+
+
+def scale_osm_array(tile_positions, factor: float):
+    """ multiplies OSM coordinates returned by decimal_to_osm_array() with factor, converts them to another
+        zoom level with factor = 2 ** (new_zoom - zoom) """
+
+    if np is not None and isinstance(tile_positions, np.ndarray):
+        return tile_positions * factor
+    return [(x * factor, y * factor) for x, y in tile_positions]
+
+
+def osm_array_to_canvas_coords(tile_positions, upper_left_tile_pos: tuple, lower_right_tile_pos: tuple,
+                               width: float, height: float) -> list:
+    """ converts OSM coordinates returned by decimal_to_osm_array() to canvas coordinates of a map widget
+        showing the area from upper_left_tile_pos to lower_right_tile_pos, returns a flat
+        [x0, y0, x1, y1, ...] list which can be passed to canvas.create_line() or canvas.coords() """
+
+    scale_x = width / (lower_right_tile_pos[0] - upper_left_tile_pos[0])
+    scale_y = height / (lower_right_tile_pos[1] - upper_left_tile_pos[1])
+
+    if np is not None and isinstance(tile_positions, np.ndarray):
+        canvas_positions = np.empty_like(tile_positions)
+        canvas_positions[:, 0] = (tile_positions[:, 0] - upper_left_tile_pos[0]) * scale_x
+        canvas_positions[:, 1] = (tile_positions[:, 1] - upper_left_tile_pos[1]) * scale_y
+        return canvas_positions.ravel().tolist()
+
+    canvas_positions = []
+    for tile_x, tile_y in tile_positions:
+        canvas_positions.append((tile_x - upper_left_tile_pos[0]) * scale_x)
+        canvas_positions.append((tile_y - upper_left_tile_pos[1]) * scale_y)
+    return canvas_positions
+
+
+def douglas_peucker_ranks(tile_positions):
+    """ returns for every position the largest Douglas-Peucker tolerance at which the position is still kept,
+        simplifying with tolerance t keeps all positions with rank > t, the first and the last position
+        have an infinite rank. Ranks are calculated once for all tolerances. """
+
+    number_of_positions = len(tile_positions)
+    if np is None or not isinstance(tile_positions, np.ndarray):
+        return _douglas_peucker_ranks_python(tile_positions)
+
+    ranks = np.zeros(number_of_positions)
+    if number_of_positions == 0:
+        return ranks
+    ranks[[0, -1]] = math.inf
+    if number_of_positions < 3:
+        return ranks
+
+    # all segments of one recursion depth are split at once
+    starts, ends, parent_ranks = np.array([0]), np.array([number_of_positions - 1]), np.array([math.inf])
+    while len(starts) > 0:
+        has_inner_positions = ends - starts >= 2
+        starts, ends, parent_ranks = starts[has_inner_positions], ends[has_inner_positions], parent_ranks[has_inner_positions]
+        if len(starts) == 0:
+            break
+
+        # indices of all inner positions and the segment they belong to
+        lengths = ends - starts - 1
+        segment_starts = np.cumsum(lengths) - lengths
+        segment_ids = np.repeat(np.arange(len(starts)), lengths)
+        indices = np.arange(lengths.sum()) - np.repeat(segment_starts, lengths) + np.repeat(starts + 1, lengths)
+
+        # distances of inner positions to the line segment between start and end position
+        a, b, p = tile_positions[starts][segment_ids], tile_positions[ends][segment_ids], tile_positions[indices]
+        ab, ap = b - a, p - a
+        ab_length = (ab ** 2).sum(axis=1)
+        t = np.clip((ap * ab).sum(axis=1) / np.where(ab_length > 0, ab_length, 1), 0, 1)
+        distances = np.hypot(ap[:, 0] - t * ab[:, 0], ap[:, 1] - t * ab[:, 1])
+
+        # split every segment at its position with the largest distance
+        max_distances = np.maximum.reduceat(distances, segment_starts)
+        max_positions = np.flatnonzero(distances == max_distances[segment_ids])
+        _, first_max_positions = np.unique(segment_ids[max_positions], return_index=True)
+        split_indices = indices[max_positions[first_max_positions]]
+
+        split_ranks = np.minimum(max_distances, parent_ranks)
+        ranks[split_indices] = split_ranks
+
+        starts, ends = np.concatenate((starts, split_indices)), np.concatenate((split_indices, ends))
+        parent_ranks = np.concatenate((split_ranks, split_ranks))
+
+    return ranks
+
+
+def _douglas_peucker_ranks_python(tile_positions) -> list:
+    number_of_positions = len(tile_positions)
+    ranks = [0.0] * number_of_positions
+    if number_of_positions == 0:
+        return ranks
+    ranks[0] = ranks[-1] = math.inf
+
+    stack = [(0, number_of_positions - 1, math.inf)]
+    while stack:
+        start, end, parent_rank = stack.pop()
+        if end - start < 2:
+            continue
+
+        (a_x, a_y), (b_x, b_y) = tile_positions[start], tile_positions[end]
+        ab_x, ab_y = b_x - a_x, b_y - a_y
+        ab_length = ab_x ** 2 + ab_y ** 2
+
+        max_distance, split_index = -1.0, start + 1
+        for index in range(start + 1, end):
+            ap_x, ap_y = tile_positions[index][0] - a_x, tile_positions[index][1] - a_y
+            t = min(max((ap_x * ab_x + ap_y * ab_y) / ab_length, 0.0), 1.0) if ab_length > 0 else 0.0
+            distance = math.hypot(ap_x - t * ab_x, ap_y - t * ab_y)
+            if distance > max_distance:
+                max_distance, split_index = distance, index
+
+        rank = min(max_distance, parent_rank)
+        ranks[split_index] = rank
+        stack.append((start, split_index, rank))
+        stack.append((split_index, end, rank))
+
+    return ranks
+
+
+def clip_osm_array(tile_positions, x_min: float, y_min: float, x_max: float, y_max: float, min_positions: int = 2):
+    """ removes positions of a line or polygon which can't change what is drawn inside the area
+
+        A position is removed if it and both neighbours are outside the same edge of the area, the
+        connection of the neighbours stays outside of this edge then. The first and the last position
+        are always kept, so lines and polygons outside the area collapse to min_positions positions. """
+
+    for axis, limit, outside_is_lower in ((0, x_min, True), (0, x_max, False), (1, y_min, True), (1, y_max, False)):
+        if len(tile_positions) < 3:
+            break
+
+        if np is not None and isinstance(tile_positions, np.ndarray):
+            coordinates = tile_positions[:, axis]
+            outside = coordinates < limit if outside_is_lower else coordinates > limit
+
+            keep = np.ones(len(tile_positions), dtype=bool)
+            keep[1:-1] = ~(outside[:-2] & outside[1:-1] & outside[2:])
+            if np.count_nonzero(keep) >= min_positions:
+                tile_positions = tile_positions[keep]
+        else:
+            outside = [position[axis] < limit if outside_is_lower else position[axis] > limit for position in tile_positions]
+            clipped_positions = [tile_positions[0]] + [tile_positions[i] for i in range(1, len(tile_positions) - 1)
+                                                       if not (outside[i - 1] and outside[i] and outside[i + 1])] + [tile_positions[-1]]
+            if len(clipped_positions) >= min_positions:
+                tile_positions = clipped_positions
+    return tile_positions
+
+
+class ProjectedPositionList:
+    """ caches the OSM coordinates of a list of decimal positions per zoom level
+
+        The positions are projected only once with decimal_to_osm_array(), the coordinates of a zoom
+        level are created by scaling and kept for the last max_zoom_levels zoom levels. The list is
+        compared with a shallow copy on every get(), so appended, removed and replaced positions
+        (position_list[i] = (lat, lon)) are detected, the comparison mostly compares references.
+        Positions which are changed in place (a list position modified by item assignment) have to
+        be reported with invalidate().
+
+        If a tolerance in pixels is passed to get(), the positions are simplified with Douglas-Peucker
+        for this zoom level. The ranks of all positions are calculated once, so simplifying for a new
+        zoom level only filters them. Simplified lists keep at least min_positions positions. """
+
+    def __init__(self, position_list: list, max_zoom_levels: int = 4, min_positions: int = 2):
+        self.position_list = position_list
+        self.max_zoom_levels = max_zoom_levels
+        self.min_positions = min_positions
+
+        self._positions = None  # shallow copy of the projected position list
+        self._world_positions = None  # OSM coordinates at zoom 0
+        self._ranks = None  # Douglas-Peucker ranks of the positions at zoom 0
+        self._zoom_positions = OrderedDict()
+
+    def set_position_list(self, position_list: list):
+        self.position_list = position_list
+        self.invalidate()
+
+    def invalidate(self):
+        self._positions = None
+        self._world_positions = None
+        self._ranks = None
+        self._zoom_positions.clear()
+
+    def get(self, zoom: int, tolerance: float = None):
+        """ returns the OSM coordinates of all positions at zoom, see decimal_to_osm_array(), if tolerance is
+            given, positions which are closer than tolerance pixels (256 pixels per tile) to the line are left out """
+
+        if self._positions != self.position_list:
+            self.invalidate()
+            self._positions = list(self.position_list)
+            self._world_positions = decimal_to_osm_array(self._positions, 0)
+
+        tile_positions = self._zoom_positions.get((zoom, tolerance))
+        if tile_positions is None:
+            world_positions = self._world_positions
+            if tolerance is not None and len(world_positions) > self.min_positions:
+                world_positions = self.simplify(world_positions, tolerance / 256 / 2.0 ** zoom)
+
+            tile_positions = scale_osm_array(world_positions, 2.0 ** zoom)
+            self._zoom_positions[(zoom, tolerance)] = tile_positions
+            if len(self._zoom_positions) > self.max_zoom_levels:
+                self._zoom_positions.popitem(last=False)
+        else:
+            self._zoom_positions.move_to_end((zoom, tolerance))
+        return tile_positions
+
+    def simplify(self, world_positions, world_tolerance: float):
+        if self._ranks is None:
+            self._ranks = douglas_peucker_ranks(world_positions)
+
+        if np is not None and isinstance(world_positions, np.ndarray):
+            keep = self._ranks > world_tolerance
+            if np.count_nonzero(keep) < self.min_positions:
+                keep[np.argsort(self._ranks)[-self.min_positions:]] = True
+            return world_positions[keep]
+
+        keep = [rank > world_tolerance for rank in self._ranks]
+        if sum(keep) < self.min_positions:
+            for index in sorted(range(len(self._ranks)), key=self._ranks.__getitem__)[-self.min_positions:]:
+                keep[index] = True
+        return [position for position, keep_position in zip(world_positions, keep) if keep_position]
+
+
+def convert_coordinates_to_address(deg_x: float, deg_y: float) -> GeocodingResult:
     """ returns address object with the following attributes:
         street, housenumber, postal, city, state, country, latlng
+        Results are cached, the backends can be set with configure_geocoding().
         Geocoder docs: https://geocoder.readthedocs.io/api.html#reverse-geocoding 
 
         Author: Tom Schimansky | https://github.com/TomSchimansky"""
 
-    result = geocoder.osm([deg_x, deg_y], method="reverse")
+    result = get_geocoding_service().reverse(deg_x, deg_y)
     return result
 
 
@@ -42,14 +285,14 @@ def convert_coordinates_to_city(deg_x: float, deg_y: float) -> str:
     """ returns city name 
     
     Author: Tom Schimansky | https://github.com/TomSchimansky"""
-    return geocoder.osm([deg_x, deg_y], method="reverse").city
+    return get_geocoding_service().reverse(deg_x, deg_y).city
 
 
 def convert_coordinates_to_country(deg_x: float, deg_y: float) -> str:
     """ returns country name 
     
     Author: Tom Schimansky | https://github.com/TomSchimansky"""
-    return geocoder.osm([deg_x, deg_y], method="reverse").country
+    return get_geocoding_service().reverse(deg_x, deg_y).country
 
 
 def convert_address_to_coordinates(address_string: str) -> tuple:
@@ -57,9 +300,15 @@ def convert_address_to_coordinates(address_string: str) -> tuple:
     
     Author: Tom Schimansky | https://github.com/TomSchimansky"""
 
-    result = geocoder.osm(address_string)
+    result = get_geocoding_service().geocode(address_string)
 
     if result.ok:
         return tuple(result.latlng)
     else:
         return None
+
+
+def convert_addresses_to_coordinates(address_strings: Sequence[str]) -> list:
+    """ returns coordinates or None for every address, duplicates and cached addresses are not requested again """
+
+    return [tuple(result.latlng) if result.ok else None for result in get_geocoding_service().geocode_batch(address_strings)]
@@ -2,6 +2,7 @@ from PIL import Image, ImageDraw, ImageFont
 import customtkinter as ctk
 import random
 import math
+from .imageCanvas import ImageCanvas
 
 class CTkPieChart(ctk.CTkLabel):
     """
@@ -74,6 +75,9 @@ root.mainloop()
 - **.get(tag)**: return data/color of the chart sections, tag is optional
 - **.configure(*args)**: change parameters of the pie chart
 - **.cget(parameter)**: return the required parameter from the chart
+- **.to_image()**: return the chart as a PIL image
+
+Use `render_pie_chart(values)` to draw a pie chart without a window.
 
 Author: Akash Bora | https://github.com/Akascape
     """
@@ -118,45 +122,9 @@ Author: Akash Bora | https://github.com/Akascape
         
     def draw_pie_chart(self, *args):
         
-        width = self.width *10
         del self.im
-        self.im = Image.new('RGBA', (1000, 1000))
-        draw = ImageDraw.Draw(self.im)
-        draw.arc((0,0, 990, 990), 0, 360, self.widget._apply_appearance_mode(self.border_color), self.border_width)
-        new_angle = -90
-        sum_ = 0
-        
-        for i in self.values.values():
-            sum_ += i["value"]
-            
-        for value in self.values.values():
-            old_angle = new_angle
-            new_angle = old_angle + (value['value']/sum_) * 360
-                
-            draw.arc((self.border_width, self.border_width, 990-self.border_width, 990-self.border_width), old_angle, new_angle, value['color'], width)
-            
-            midpoint_angle = (old_angle + new_angle)/2
-            
-            xn = yn = (900 - self.border_width)/2
-            radians = (990 - self.border_width)/2
-            arc_pos = radians / 3
-            textpos = arc_pos/1.5
-            perc = int(round(value['value']/sum_ * 100))
-            
-            midpoint1_x = xn + (radians - textpos) * math.cos(math.radians(midpoint_angle))
-            midpoint1_y = yn + (radians - textpos) * math.sin(math.radians(midpoint_angle))
-            
-            draw.text((midpoint1_x, midpoint1_y), text=str(perc)+"%", fill=value['text_color'],
-                      font=ImageFont.load_default(size=70))
-            
-        x0 = width+self.border_width
-        x1 = 990-width-self.border_width
-        
-        if x0>x1:
-            x1=x0
-
-        draw.arc((x0,x0,x1,x1), 0, 360,
-                 self.widget._apply_appearance_mode(self.border_color), self.border_width)
+        self.im = draw_pie_chart_image(self.values, self.width, self.border_width,
+                                       self.widget._apply_appearance_mode(self.border_color))
         self.arc = ctk.CTkImage(self.im.resize((self.size, self.size), Image.LANCZOS), size=(self.size, self.size))
 
         super().configure(image=self.arc)
@@ -167,19 +135,8 @@ Author: Akash Bora | https://github.com/Akascape
         if tag in self.values:
             self.update(tag, value, color, text_color)
             return
-        
-        if color is None:
-            color = "#"+''.join([random.choice('ABCDEF0123456789') for i in range(6)])
-            
-        if text_color is None:
-            if self.is_color_too_bright(color):
-                text_color = "black"
-            else:
-                text_color = "white"
-            if self.text_color:
-                text_color = self.text_color
                 
-        self.values.update({tag:{'color': color, 'value': value, 'text_color': text_color}})
+        self.values.update({tag: create_section(value, color, text_color, self.text_color)})
         
         if draw:
             self.draw_pie_chart()
@@ -256,7 +213,14 @@ Author: Akash Bora | https://github.com/Akascape
         super().configure(**kwargs)
         self.draw_pie_chart()
 
-    def is_color_too_bright(self, hex_color, threshold=100):
+    def to_image(self):
+        # the chart as a PIL image of the displayed size
+        image = ImageCanvas(self.size, self.size, bg=self.background, appearance_mode=ctk.get_appearance_mode(), antialias=1)
+        image.create_image(self.size / 2, self.size / 2, image=self.im.resize((self.size, self.size), Image.LANCZOS))
+        return image.to_image()
+
+    @staticmethod
+    def is_color_too_bright(hex_color, threshold=100):
         if not hex_color.startswith("#"): return False
         
         hex_color = hex_color.lstrip("#")
@@ -268,4 +232,82 @@ Author: Akash Bora | https://github.com/Akascape
     def get(self, tag=None):
         if tag:
             return self.values[tag]
-        return self.values
\ No newline at end of file
+        return self.values
+
+
+def create_section(value, color=None, text_color=None, default_text_color=None):
+    # data of one section, a random color and a readable text color are chosen if they are not given
+    if color is None:
+        color = "#"+''.join([random.choice('ABCDEF0123456789') for i in range(6)])
+        
+    if text_color is None:
+        if CTkPieChart.is_color_too_bright(color):
+            text_color = "black"
+        else:
+            text_color = "white"
+        if default_text_color:
+            text_color = default_text_color
+
+    return {'color': color, 'value': value, 'text_color': text_color}
+
+
+def draw_pie_chart_image(values, line_width, border_width, border_color):
+    # draws the sections on a 1000x1000 image, which is scaled down to the size of the chart
+    width = line_width *10
+    im = Image.new('RGBA', (1000, 1000))
+    draw = ImageDraw.Draw(im)
+    draw.arc((0,0, 990, 990), 0, 360, border_color, border_width)
+    new_angle = -90
+    sum_ = 0
+    
+    for i in values.values():
+        sum_ += i["value"]
+        
+    for value in values.values():
+        old_angle = new_angle
+        new_angle = old_angle + (value['value']/sum_) * 360
+            
+        draw.arc((border_width, border_width, 990-border_width, 990-border_width), old_angle, new_angle, value['color'], width)
+        
+        midpoint_angle = (old_angle + new_angle)/2
+        
+        xn = yn = (900 - border_width)/2
+        radians = (990 - border_width)/2
+        arc_pos = radians / 3
+        textpos = arc_pos/1.5
+        perc = int(round(value['value']/sum_ * 100))
+        
+        midpoint1_x = xn + (radians - textpos) * math.cos(math.radians(midpoint_angle))
+        midpoint1_y = yn + (radians - textpos) * math.sin(math.radians(midpoint_angle))
+        
+        draw.text((midpoint1_x, midpoint1_y), text=str(perc)+"%", fill=value['text_color'],
+                  font=ImageFont.load_default(size=70))
+        
+    x0 = width+border_width
+    x1 = 990-width-border_width
+    
+    if x0>x1:
+        x1=x0
+
+    draw.arc((x0,x0,x1,x1), 0, 360, border_color, border_width)
+    return im
+
+
+def render_pie_chart(values, radius=200, line_width=20, border_width=0, border_color=None, text_color=None,
+                     bg_color=None, appearance_mode="light"):
+    """
+    Draws a pie chart without a window and returns the ImageCanvas, use .to_image() or .to_png() to render it.
+
+    values: {tag: {"value": value, "color": color, "text_color": text_color}}, like the values argument of
+    CTkPieChart, color and text_color are optional.
+    """
+
+    theme = ctk.ThemeManager.theme
+    image = ImageCanvas(radius, radius, bg=theme["CTkFrame"]["fg_color"] if bg_color is None else bg_color,
+                        appearance_mode=appearance_mode, antialias=1)
+    border_color = image._apply_appearance_mode(theme["CTkButton"]["border_color"] if border_color is None else border_color)
+
+    sections = {tag: create_section(default_text_color=text_color, **section) for tag, section in values.items()}
+    chart = draw_pie_chart_image(sections, line_width, border_width, border_color)
+    image.create_image(radius / 2, radius / 2, image=chart.resize((radius, radius), Image.LANCZOS))
+    return image
@@ -10,6 +10,7 @@ import random
 import customtkinter
 from customtkinter.windows.widgets.appearance_mode import CTkAppearanceModeBaseClass
 from customtkinter.windows.widgets.scaling import CTkScalingBaseClass
+from .imageCanvas import ImageCanvas
 
 class CTkRadarChart(tk.Canvas, CTkAppearanceModeBaseClass, CTkScalingBaseClass):
     """ 
@@ -60,6 +61,9 @@ _Note: data should be in a list, maximum value: 100, minimum value: 0_
 - **.get(tag)**: return data and color of the chart, tag is optional
 - **.configure(*args)**: change parameters of the radar chart
 - **.cget(parameter)**: return the required parameter from the chart
+- **.to_image()**: return the chart as a PIL image
+
+Use `render_radar_chart(data, labels)` to draw a radar chart without a window.
 
 Author: Akash Bora | https://github.com/Akascape
     """
@@ -307,6 +311,15 @@ Author: Akash Bora | https://github.com/Akascape
             return self.padding
         return super().cget(params)
 
+    def to_image(self, antialias=2):
+        # render the chart to a PIL image with the same drawing methods
+        image = _RadarChartImage(max(self.winfo_width(), 1), max(self.winfo_height(), 1), self.bg_color,
+                                 customtkinter.get_appearance_mode(), antialias)
+        for name in _RadarChartImage.OPTIONS:
+            setattr(image, name, getattr(self, name))
+        image.draw_chart()
+        return image.to_image()
+
     def get(self, tag=None):
         # get values from the chart
         if tag:
@@ -317,4 +330,75 @@ Author: Akash Bora | https://github.com/Akascape
         for tag in self.tags:
             index = self.tags.index(tag)
             data.update({tag:{'data':self.data[index],'color':self.colors[index]}})
-        return data
\ No newline at end of file
+        return data
+
+
+class _RadarChartImage(ImageCanvas):
+    """ off-screen radar chart, it draws with the methods of CTkRadarChart on an ImageCanvas """
+
+    OPTIONS = ("radius", "center", "font", "border_width", "fg_color", "text_color", "num_axes", "radial_lines",
+               "labels", "data", "colors", "fills", "tags")
+
+    draw_chart = CTkRadarChart.draw_chart
+    draw_background = CTkRadarChart.draw_background
+    draw_polygon = CTkRadarChart.draw_polygon
+    draw_dataset = CTkRadarChart.draw_dataset
+    draw_labels = CTkRadarChart.draw_labels
+
+    def __init__(self, width, height, bg_color, appearance_mode, antialias):
+        super().__init__(width, height, bg=bg_color, appearance_mode=appearance_mode, antialias=antialias)
+        self.master = self  # colors are resolved with self.master._apply_appearance_mode()
+
+
+def render_radar_chart(data: dict = None,
+                       labels: list = [],
+                       width: int = None,
+                       height: int = None,
+                       radius: int = 400,
+                       num_axes: int = 6,
+                       radial_lines: int = 5,
+                       border_width: int = 2,
+                       padding: int = 30,
+                       font: Optional[tuple] = None,
+                       bg_color: Optional[Union[str, Tuple[str, str]]] = None,
+                       fg_color: Optional[Union[str, Tuple[str, str]]] = None,
+                       text_color: Optional[Union[str, Tuple[str, str]]] = None,
+                       appearance_mode: str = "light",
+                       antialias: int = 2) -> ImageCanvas:
+    """
+    Draws a radar chart without a window and returns the ImageCanvas, use .to_image() or .to_png() to render it.
+
+    data: {tag: {"data": values, "color": color, "fill": bool}} like the result of CTkRadarChart.get(),
+    values are clamped to 0 - 100. The chart is laid out like a CTkRadarChart of size width x height, which
+    is radius x radius if not given.
+    """
+
+    if num_axes <= 2:
+        raise ValueError("Axes number must be greater or equal to 3")
+
+    width = radius if width is None else width
+    height = radius if height is None else height
+    theme = customtkinter.ThemeManager.theme
+    image = _RadarChartImage(width, height, theme["CTkFrame"]["fg_color"] if bg_color is None else bg_color,
+                             appearance_mode, antialias)
+
+    # same layout as CTkRadarChart.resize()
+    image.radius = min(width - padding * 2, height - padding * 2) // 2
+    image.center = (width // 2, height // 2)
+    image.font = font
+    image.border_width = border_width
+    image.fg_color = theme["CTkButton"]["border_color"] if fg_color is None else fg_color
+    image.text_color = theme["CTkLabel"]["text_color"] if text_color is None else text_color
+    image.num_axes = num_axes
+    image.radial_lines = max(radial_lines, 1)
+    image.labels = labels
+
+    image.data, image.colors, image.fills, image.tags = [], [], [], []
+    for tag, values in (data or {}).items():
+        image.data.append([min(max(value, 0), 100) for value in values["data"]])
+        image.colors.append(values.get("color") or "#"+''.join([random.choice('ABCDEF0123456789') for i in range(6)]))
+        image.fills.append(values.get("fill", True))
+        image.tags.append(tag)
+
+    image.draw_chart()
+    return image
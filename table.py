@@ -3,7 +3,14 @@
 # Author: Akash Bora
 
 import customtkinter
+import bisect
+import contextlib
 import copy
+import csv
+import itertools
+import json
+import os
+from .tableModel import TableModel
 
 class CTkTable(customtkinter.CTkFrame):
 
@@ -46,17 +53,32 @@ root.mainloop()
 - **.get_selected_column()**: get the values of selected column
 - **.deselect_column(column)**: deselect a column
 - **.update_values(values)**: update all values at once
+- **.apply_values(values, highlight_color, highlight_time)**: update all values, only the changed cells are configured
+- **.patch(changes, highlight_color, highlight_time)**: change single values, `{(row, column): value}`
+- **.begin_update()**, **.end_update()**: add, delete and edit rows or columns in between, the table is laid out once at the end
+- **.batch_update()**: context manager, `with table.batch_update(): ...` is the same as begin_update() and end_update()
 - **.delete(row, column, *args)**: delete the data from specific index
 - **.get()**: get all values
+- **.load_csv(file)**, **.load_jsonl(file)**, **.load_sqlite(cursor)**: load rows in chunks without blocking the window
+- **.load_rows(rows)**: load the rows of any iterable in chunks, **.cancel_loading()** stops it
+- **.export_csv(file)**: write the values to a csv file
+- **.sort_by(column, reverse)**: show the rows sorted by a column, the header row stays on top
+- **.filter_rows(predicate, column)**: show only the rows where `predicate(value)` or `predicate(row)` is true
+- **.reset_view()**: show all rows in their original order
+- **.create_index(column)**: hash index of a column, used by find()
+- **.find(column, value)**: get the indices of the shown rows where the column has the value
 - **.get(row, column)**: get specific cell value
 - **.get_row(row)**: get all values of a specific row
 - **.get_column(column)**: get all values of a specific column
 - **.configure(arguments)**: change other table attributes
+- **.scroll_to(row)**: show a row at the top of the table in virtual mode
 
 _here, **args** means ctkbutton parameters which can also be passed_
 
 **Note: treat all the table cells as a ctkbutton class**
 
+The values are stored by column in `table.model` (a TableModel), sorting and filtering only change which rows of the model are shown.
+
 ## Arguments
 | Parameter | Description |
 |-----------| ------------|
@@ -74,6 +96,9 @@ _here, **args** means ctkbutton parameters which can also be passed_
 | hover_color | enable hover effect on the cells |
 | wraplength | set the width of cell text |
 | justify | anchor the position of the cell text |
+| virtual | create cells only for the visible rows and reuse them when the table is scrolled, for tables with many rows |
+| visible_rows | number of rows shown in virtual mode, it changes with the height of the table |
+| overscan | extra rows drawn below the visible rows in virtual mode |
 | **command** | specify a command when a table cell is pressed, [returns row, column, value] |
 | **other button parameters* | all other ctk button parameters can be passed |
     
@@ -106,6 +131,9 @@ Author: Akash Bora | https://github.com/Akascape
         hover: bool = False,
         justify: str = "center",
         wraplength: int = 1000,
+        virtual: bool = False,
+        visible_rows: int = 20,
+        overscan: int = 2,
         **kwargs):
         
         super().__init__(master, fg_color="transparent")
@@ -121,7 +149,11 @@ Author: Akash Bora | https://github.com/Akascape
         self.padx = padx # internal padding between the rows/columns
         self.pady = pady
         self.command = command
-        self.values = values # the default values of the table
+        self.model = TableModel(values, 1 if header_color else 0) # the values of the table, stored by column
+        self.view = None # model rows in the order they are shown, None shows all rows
+        self.view_index = None # shown row of every model row in the view
+        self.sort_key = None # (column, reverse) of sort_by()
+        self.row_filter = None # (predicate, column) of filter_rows()
         self.colors = colors # colors of the table if required
         self.header_color = header_color # specify the topmost row color
         self.phase = color_phase
@@ -162,186 +194,449 @@ Author: Akash Bora | https://github.com/Akascape
             
         self.frame = {}
         self.corner_buttons = {}
+        self.cell_index = {} # table position (row, column) of every cell widget
+        
+        self.virtual = virtual # only the visible rows are drawn, with a pool of recycled cells
+        self.visible_rows = visible_rows
+        self.overscan = overscan
+        self.first_row = 0 # first scrolled row shown in virtual mode
+        self.fixed_rows = 0 # header rows which are not scrolled in virtual mode
+        self.grid_rows = 0 # number of rows in the grid
+        self.pool = {} # cells of the virtual mode by their grid position
+        self.pool_args = {} # args of the cell shown by a pooled cell
+        self.cell_kwargs = {} # default args of the cells
+        self.grid_columns = 0
+        
+        self.batch_depth = 0 # open begin_update() calls
+        self.dirty_row = None # first row and column which were changed during a batch update
+        self.dirty_column = None
+        self.pending_redraw = False
+        self.redraw_kwargs = {}
+        
+        self.pending_cells = {} # cells changed by patch(): (highlight color, highlight time)
+        self.flush_id = None # idle callback which configures the pending cells
+        self.highlights = {} # highlighted cells and the token of their highlight
+        self.highlight_token = 0
+        self.loading_id = None # idle callback of the next chunk of load_rows()
+        self.loading_close = None
+        if self.virtual:
+            self.create_viewport()
         self.draw_table(**kwargs)
         
     def draw_table(self, **kwargs):
 
         """ draw the table """
+        self.cell_index = {}
+        self.cell_kwargs = kwargs
+        if self.virtual:
+            self.draw_virtual_table(**kwargs)
+            return
+        
+        self.grid_rows = self.rows
+        self.grid_columns = self.columns
         for i in range(self.rows):
             for j in range(self.columns):
                 self.inside_frame.grid_rowconfigure(i, weight=1)
                 self.inside_frame.grid_columnconfigure(j, weight=1)
-                if self.phase=="horizontal":
-                    if i%2==0:
-                        fg = self.fg_color
-                    else:
-                        fg = self.fg_color2
-                else:
-                    if j%2==0:
-                        fg = self.fg_color
-                    else:
-                        fg = self.fg_color2
-                        
-                if self.header_color:
-                    if self.orient=="horizontal":
-                        if i==0:
-                            fg = self.header_color
-                    else:
-                        if j==0:
-                            fg = self.header_color
+                self.create_cell(i, j, i, **kwargs)
+                self.rowconfigure(i, weight=1)
+                self.columnconfigure(j, weight=1)
+        for x in self.frame:
+            for y in self.binded_objects:
+                self.frame[x].bind(*y)
+                
+    def cell_color(self, i, j):
+        """ default fg_color of a cell """
+        if self.phase=="horizontal":
+            if i%2==0:
+                fg = self.fg_color
+            else:
+                fg = self.fg_color2
+        else:
+            if j%2==0:
+                fg = self.fg_color
+            else:
+                fg = self.fg_color2
+                
+        if self.header_color:
+            if self.orient=="horizontal":
+                if i==0:
+                    fg = self.header_color
+            else:
+                if j==0:
+                    fg = self.header_color
+        return fg
+    
+    def cell_corners(self, i, j, fg):
+        """ background corner colors, corner radius and hover state of a cell """
+        corner_radius = self.corner
+        if (self.border_width>=5) and (self.corner>=5):
+            tr = self.border_color
+        else:
+            tr = ""
+        if i==0 and j==0:
+            corners = [tr, fg, fg, fg]
+            hover_modify = self.hover
 
-                corner_radius = self.corner
-                if (self.border_width>=5) and (self.corner>=5):
-                    tr = self.border_color
-                else:
-                    tr = ""
-                if i==0 and j==0:
-                    corners = [tr, fg, fg, fg]
-                    hover_modify = self.hover
-        
-                elif i==self.rows-1 and j==self.columns-1:
-                    corners = [fg ,fg, tr, fg]
-                    hover_modify = self.hover
-        
-                elif i==self.rows-1 and j==0:
-                    corners = [fg ,fg, fg, tr]
-                    hover_modify = self.hover
-       
-                elif i==0 and j==self.columns-1:
-                    corners = [fg, tr, fg, fg]
-                    hover_modify = self.hover
- 
-                else:
-                    corners = [fg, fg, fg, fg]
-                    corner_radius = 0
-                    hover_modify = False
+        elif i==self.rows-1 and j==self.columns-1:
+            corners = [fg ,fg, tr, fg]
+            hover_modify = self.hover
+
+        elif i==self.rows-1 and j==0:
+            corners = [fg ,fg, fg, tr]
+            hover_modify = self.hover
+
+        elif i==0 and j==self.columns-1:
+            corners = [fg, tr, fg, fg]
+            hover_modify = self.hover
+
+        else:
+            corners = [fg, fg, fg, fg]
+            corner_radius = 0
+            hover_modify = False
+        return corners, corner_radius, hover_modify
+    
+    def cell_padding(self, grid_row, j):
+        """ padding of a cell in the grid """
+        if grid_row==0:
+            pady = (0, self.pady)
+        else:
+            pady = self.pady
+            
+        if j==0:
+            padx = (0, self.padx)
+        else:
+            padx = self.padx
+            
+        if grid_row==self.grid_rows-1:
+            pady = (self.pady,0)
+        
+        if j==self.columns-1:
+            padx = (self.padx,0)
+        return padx, pady
+    
+    def cell_value(self, i, j):
+        """ value of a cell in the model """
+        row, column = (i, j) if self.orient=="horizontal" else (j, i)
+        try:
+            value = self.model.get(self.model_row(row), column)
+        except IndexError: value = " "
+            
+        if value=="":
+            value = " "
+        return value
+    
+    def model_row(self, row):
+        """ model index of a shown row of values """
+        if self.view is None:
+            return row
+        return self.view[row]
+    
+    def shown_rows(self):
+        """ model indices of the shown rows of values """
+        if self.view is None:
+            return range(self.model.row_count)
+        return self.view
+    
+    def value_rows(self):
+        """ number of shown rows of values """
+        return len(self.shown_rows())
+    
+    @property
+    def values(self):
+        """ the shown values as list of row lists """
+        return self.model.to_rows(self.shown_rows())
+    
+    @values.setter
+    def values(self, values):
+        indexed_columns = list(self.model.indexes)
+        self.model = TableModel(values, 1 if self.header_color else 0)
+        for column in indexed_columns:
+            self.model.create_index(column)
+        self.view = self.compute_view()
+        self.view_index = None
+    
+    def prepare_args(self, args, fg):
+        """ remove the table arguments and add the defaults to the args of a cell """
+        if "text_color" not in args:
+            args["text_color"] = self.text_color
+        if "height" not in args:
+            args["height"] = self.height
+        if "width" not in args:
+            args["width"] = self.width
+        if "fg_color" not in args:
+            args["fg_color"] = fg
+        if args["fg_color"]!=fg:
+            args["fg_color"] = fg
+        if "corner_radius" in args:
+            del args["corner_radius"]
+        if "border_color" in args:
+            del args["border_color"]
+        if "border_width" in args:
+            del args["border_width"]
+        if "color_phase" in args:
+            del args["color_phase"]
+        if "orientation" in args:
+            del args["orientation"]
+        if "write" in args:
+            del args["write"]
+
+        if self.write:
+            if "anchor" in args:
+                del args["anchor"] 
+            if "hover_color" in args:
+                del args["hover_color"] 
+            if "hover" in args:
+                del args["hover"]
+            if "justify" not in args:
+                args["justify"] = self.justify
+        else:
+            if "anchor" not in args:
+                args["anchor"] = self.anchor
+            if "hover_color" not in args:
+                args["hover_color"] = self.hover_color
+            if "hover" not in args:
+                args["hover"] = self.hover
+            if "justify" in args:
+                anchor =  args["justify"]
+                if anchor=="center":
+                    anchor="c"
+                elif anchor=="left":
+                    anchor="w"
+                elif anchor=="right":
+                    anchor="e"
+                args.update({"anchor": anchor})
+                del args["justify"]
+        return args
+    
+    def cell_data(self, i, j):
+        """ data of a cell, in virtual mode it is created when the cell is used first """
+        if (i,j) not in self.data:
+            self.new_cell_data(i, j)
+        return self.data[i,j]
+    
+    def new_cell_data(self, i, j, kwargs=None):
+        """ data of a new cell, with the default args if no args are given """
+        args = self.prepare_args(copy.deepcopy(kwargs if kwargs else self.cell_kwargs), self.cell_color(i, j))
+        self.data[i,j] = {"row": i, "column" : j, "value" : self.cell_value(i, j), "args": args}
+    
+    def create_cell(self, i, j, grid_row, **kwargs):
+        """ create the widget of the cell [i, j] in a row of the grid """
+        fg = self.cell_color(i, j)
+        corners, corner_radius, hover_modify = self.cell_corners(i, j, fg)
+        padx, pady = self.cell_padding(grid_row, j)
+        value = self.cell_value(i, j)
+        
+        if (i,j) in self.data.keys():
+            if self.data[i,j]["args"]:
+                args = self.data[i,j]["args"]
+            else:
+                args = copy.deepcopy(kwargs)
+        else:
+            args = copy.deepcopy(kwargs)
+        
+        self.data[i,j] = {"row": i, "column" : j, "value" : value, "args": args}
+        args = self.prepare_args(args, fg)
+        if value is None:
+            value = " "
+        
+        if self.write:
+            cell = customtkinter.CTkEntry(self.inside_frame,
+                                          font=self.font,
+                                          corner_radius=0,
+                                          **args)
+            cell.insert(0, str(value))
+            cell.bind("<Key>", lambda e: self.after(100, lambda: self.manipulate_cell(cell)))
+            cell.grid(column=j, row=grid_row, padx=padx, pady=pady, sticky="nsew")
             
+            if self.header_color:
                 if i==0:
-                    pady = (0, self.pady)
-                else:
-                    pady = self.pady
-                    
-                if j==0:
-                    padx = (0, self.padx)
-                else:
-                    padx = self.padx
-                    
-                if i==self.rows-1:
-                    pady = (self.pady,0)
-                
-                if j==self.columns-1:
-                    padx = (self.padx,0)
+                    cell.configure(state="readonly")
 
-                if self.values:
-                    try:
-                        if self.orient=="horizontal":
-                            value = self.values[i][j]
-                        else:
-                            value = self.values[j][i]
-                    except IndexError: value = " "
-                else:
-                    value = " "
-                    
-                if value=="":
-                    value = " "
-                
-                if (i,j) in self.data.keys():
-                    if self.data[i,j]["args"]:
-                        args = self.data[i,j]["args"]
-                    else:
-                        args = copy.deepcopy(kwargs)
-                else:
-                    args = copy.deepcopy(kwargs)
-                
-                
-                self.data[i,j] = {"row": i, "column" : j, "value" : value, "args": args}
+        else:
+            cell = customtkinter.CTkButton(self.inside_frame, background_corner_colors=corners,
+                                           font=self.font, 
+                                           corner_radius=corner_radius,
+                                           text=value,
+                                           border_width=0,
+                                           command=(lambda: self.command(self.data[self.cell_index[cell]])) if self.command else None,
+                                           **args)
+            cell.grid(column=j, row=grid_row, padx=padx, pady=pady, sticky="nsew")
+            if cell._text_label is not None:
+                cell._text_label.config(wraplength=self.wraplength)
                 
-                args = self.data[i,j]["args"]
+        self.frame[i,j] = cell
+        self.cell_index[cell] = (i, j)
+        if self.virtual:
+            self.pool[grid_row, j] = cell
+            self.pool_args[cell] = args
+            self.bind_scrolling(cell)
+        
+        if hover_modify and not self.write:
+            self.dynamic_hover(cell, i, j)
+        return cell
+    
+    def remove_cell(self, cell):
+        """ destroy the widget of a cell """
+        position = self.cell_index.pop(cell)
+        if self.frame.get(position) is cell:
+            del self.frame[position]
+        if self.corner_buttons.get(position) is cell:
+            del self.corner_buttons[position]
+        self.pool_args.pop(cell, None)
+        cell.destroy()
+        
+    def manipulate_cell(self, cell):
+        """ entry callback of a cell widget """
+        if cell in self.cell_index:
+            self.manipulate_data(*self.cell_index[cell])
+            
+    def create_viewport(self):
+        """ create the scrollbar of the virtual mode, rows below the table are clipped """
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self.scroll)
+        self.scrollbar.pack(side="right", fill="y", pady=self.border_width, before=self.inside_frame)
+        self.inside_frame.configure(height=self.visible_rows*(self.height+2*self.pady))
+        self.inside_frame.grid_propagate(False)
+        self.inside_frame.bind("<Configure>", self.fit_rows)
+        self.bind_scrolling(self.inside_frame)
+        
+    def bind_scrolling(self, widget):
+        """ scroll the virtual table with the mouse wheel """
+        widget.bind("<MouseWheel>", self.scroll_wheel)
+        widget.bind("<Button-4>", self.scroll_wheel)
+        widget.bind("<Button-5>", self.scroll_wheel)
+        
+    def draw_virtual_table(self, **kwargs):
+        """ draw the visible rows, the cells are reused for other rows when the table is scrolled """
+        self.pool = {}
+        self.pool_args = {}
+        self.fixed_rows = 1 if self.header_color and self.orient=="horizontal" and self.rows>0 else 0 # header stays on top
+        self.first_row = min(self.first_row, self.max_first_row())
+        self.grid_rows = min(self.rows, self.fixed_rows+self.visible_rows+self.overscan)
+        self.grid_columns = self.columns
+        
+        # cells which are not shown keep their args, but get the new values
+        for (i,j) in list(self.data):
+            if i>=self.rows or j>=self.columns:
+                del self.data[i,j]
+            else:
+                self.data[i,j]["value"] = self.cell_value(i, j)
                 
-                if "text_color" not in args:
-                    args["text_color"] = self.text_color
-                if "height" not in args:
-                    args["height"] = self.height
-                if "width" not in args:
-                    args["width"] = self.width
-                if "fg_color" not in args:
-                    args["fg_color"] = fg
-                if args["fg_color"]!=fg:
-                    args["fg_color"] = fg
-                if "corner_radius" in args:
-                    del args["corner_radius"]
-                if "border_color" in args:
-                    del args["border_color"]
-                if "border_width" in args:
-                    del args["border_width"]
-                if "color_phase" in args:
-                    del args["color_phase"]
-                if "orientation" in args:
-                    del args["orientation"]
-                if "write" in args:
-                    del args["write"]
-       
-                if self.write:
-                    if "anchor" in args:
-                        del args["anchor"] 
-                    if "hover_color" in args:
-                        del args["hover_color"] 
-                    if "hover" in args:
-                        del args["hover"]
-                    if "justify" not in args:
-                        args["justify"] = self.justify
-                    
-                    self.frame[i,j] = customtkinter.CTkEntry(self.inside_frame,
-                                                             font=self.font,
-                                                             corner_radius=0,
-                                                             **args)
-                    if value is None:
-                        value = " "
-                    self.frame[i,j].insert(0, str(value))
-                    self.frame[i,j].bind("<Key>", lambda e, row=i, column=j, data=self.data: self.after(100, lambda: self.manipulate_data(row, column)))
-                    self.frame[i,j].grid(column=j, row=i, padx=padx, pady=pady, sticky="nsew")
-                    
-                    if self.header_color:
-                        if i==0:
-                            self.frame[i,j].configure(state="readonly")
+        self.inside_frame.configure(width=self.columns*(self.width+2*self.padx))
+        for j in range(self.columns):
+            self.inside_frame.grid_columnconfigure(j, weight=1)
+        for r in range(self.grid_rows):
+            self.inside_frame.grid_rowconfigure(r, weight=0)
+            for j in range(self.columns):
+                cell = self.create_cell(self.display_row(r), j, r, **kwargs)
+                for y in self.binded_objects:
+                    cell.bind(*y)
+        self.update_scrollbar()
+        
+    def display_row(self, grid_row):
+        """ table row shown in a row of the grid """
+        if grid_row<self.fixed_rows:
+            return grid_row
+        return grid_row+self.first_row
     
-                else:
-                    if "anchor" not in args:
-                        args["anchor"] = self.anchor
-                    if "hover_color" not in args:
-                        args["hover_color"] = self.hover_color
-                    if "hover" not in args:
-                        args["hover"] = self.hover
-                    if "justify" in args:
-                        anchor =  args["justify"]
-                        if anchor=="center":
-                            anchor="c"
-                        elif anchor=="left":
-                            anchor="w"
-                        elif anchor=="right":
-                            anchor="e"
-                        args.update({"anchor": anchor})
-                        del args["justify"]
-                    if value is None:
-                        value = " "
-                    self.frame[i,j] = customtkinter.CTkButton(self.inside_frame, background_corner_colors=corners,
-                                                              font=self.font, 
-                                                              corner_radius=corner_radius,
-                                                              text=value,
-                                                              border_width=0,
-                                                              command=(lambda e=self.data[i,j]: self.command(e)) if self.command else None, **args)
-                    self.frame[i,j].grid(column=j, row=i, padx=padx, pady=pady, sticky="nsew")
-                    if self.frame[i,j]._text_label is not None:
-                        self.frame[i,j]._text_label.config(wraplength=self.wraplength)
-                    
-                    if hover_modify:
-                        self.dynamic_hover(self.frame[i,j], i, j)
-                        
-                self.rowconfigure(i, weight=1)
-                self.columnconfigure(j, weight=1)
-        for x in self.frame:
-            for y in self.binded_objects:
-                self.frame[x].bind(*y)
+    def max_first_row(self):
+        return max(0, self.rows-self.fixed_rows-self.visible_rows)
+        
+    def fit_rows(self, event):
+        """ change the number of pooled rows when the size of the table changes """
+        bbox = self.inside_frame.grid_bbox(0, self.fixed_rows)
+        if not bbox or bbox[3]<=1:
+            return
+        visible_rows = max(1, event.height//bbox[3]-self.fixed_rows)
+        if visible_rows==self.visible_rows:
+            return
+        self.visible_rows = visible_rows
+        self.first_row = min(self.first_row, self.max_first_row())
+        self.rebind_rows()
+        
+        grid_rows = min(self.rows, self.fixed_rows+self.visible_rows+self.overscan)
+        for r in range(self.grid_rows, grid_rows):
+            self.inside_frame.grid_rowconfigure(r, weight=0)
+            for j in range(self.columns):
+                cell = self.create_cell(self.display_row(r), j, r, **self.cell_kwargs)
+                for y in self.binded_objects:
+                    cell.bind(*y)
+        for r in range(grid_rows, self.grid_rows):
+            for j in range(self.columns):
+                self.remove_cell(self.pool.pop((r, j)))
+        self.grid_rows = grid_rows
+        self.update_scrollbar()
+        
+    def scroll(self, action, value, unit=None):
+        """ scrollbar command of the virtual mode """
+        if action=="moveto":
+            first_row = round(float(value)*(self.rows-self.fixed_rows))
+        elif unit=="pages":
+            first_row = self.first_row+int(value)*self.visible_rows
+        else:
+            first_row = self.first_row+int(value)
+        self.scroll_to(first_row+self.fixed_rows)
+        
+    def scroll_wheel(self, event):
+        if event.num==4 or event.delta>0:
+            self.scroll("scroll", -1, "units")
+        else:
+            self.scroll("scroll", 1, "units")
+            
+    def scroll_to(self, row):
+        """ show a row at the top of the virtual table """
+        if not self.virtual:
+            return
+        first_row = max(0, min(row-self.fixed_rows, self.max_first_row()))
+        if first_row==self.first_row:
+            return
+        if self.write:
+            self.update_data()
+        self.first_row = first_row
+        self.rebind_rows()
+        self.update_scrollbar()
+        
+    def update_scrollbar(self):
+        scrolled_rows = max(self.rows-self.fixed_rows, 1)
+        self.scrollbar.set(self.first_row/scrolled_rows, min(1, (self.first_row+self.visible_rows)/scrolled_rows))
+        
+    def rebind_rows(self, force=False):
+        """ show the rows from self.first_row with the pooled cells """
+        self.frame = {}
+        for (r,j), cell in self.pool.items():
+            i = self.display_row(r)
+            if force or self.cell_index[cell]!=(i,j):
+                self.rebind_cell(cell, i, j)
+            self.frame[i,j] = cell
+            
+    def rebind_cell(self, cell, i, j):
+        """ show the data of another cell with a pooled cell widget """
+        position = self.cell_index[cell]
+        if self.corner_buttons.get(position) is cell:
+            self.reset_hover(cell, position)
+        self.cell_index[cell] = (i, j)
+        
+        data = self.cell_data(i, j)
+        args = data["args"]
+        value = data["value"]
+        if value is None:
+            value = " "
+        changed_args = args if self.pool_args.get(cell)!=args else {"fg_color": args["fg_color"]}
+        self.pool_args[cell] = args
+        
+        if self.write:
+            cell.configure(state="normal")
+            cell.delete(0, customtkinter.END)
+            cell.insert(0, str(value))
+            cell.configure(state="readonly" if self.header_color and i==0 else "normal", **changed_args)
+        else:
+            corners, corner_radius, hover_modify = self.cell_corners(i, j, args["fg_color"])
+            if corner_radius!=cell.cget("corner_radius"):
+                # changing the corner radius rebuilds the button
+                changed_args = dict(changed_args, corner_radius=corner_radius)
+            cell.configure(text=value, background_corner_colors=corners, **changed_args)
+            if hover_modify:
+                self.dynamic_hover(cell, i, j)
         
     def dynamic_hover(self, frame, i, j):
         """ internal function to change corner cell colors """
@@ -375,167 +670,705 @@ Author: Akash Bora | https://github.com/Akascape
         
     def manipulate_data(self, row, column):
         """ entry callback """
-        self.update_data()
+        value = self.frame[row,column].get()
+        self.data[row,column]["value"] = value
+        self.set_value(row, column, value)
         data = self.data[row,column]
         if self.command: self.command(data)
         
     def update_data(self):
-        """ update the data when values are changes """
-        for i in self.frame:
+        """ update the data and the model with the texts of the shown cells """
+        if self.flush_id is not None:
+            # show the patched values first, otherwise the old texts would overwrite them
+            self.after_cancel(self.flush_id)
+            self.flush_cells()
+        for (i,j), cell in self.frame.items():
             if self.write:
-                self.data[i]["value"]=self.frame[i].get()
+                value = cell.get()
             else:
-                self.data[i]["value"]=self.frame[i].cget("text")
-
-        self.values = []
-        for i in range(self.rows):
-            row_data = []
-            for j in range(self.columns):
-                row_data.append(self.data[i,j]["value"])
-            self.values.append(row_data)
+                value = cell.cget("text")
+            if self.data[i,j]["value"]!=value:
+                self.data[i,j]["value"] = value
+                self.set_value(i, j, value)
+            
+    def set_value(self, i, j, value):
+        """ change a value in the model """
+        row, column = (i, j) if self.orient=="horizontal" else (j, i)
+        if self.view is None:
+            while self.model.row_count<=row:
+                self.model.insert_row(self.model.row_count, [])
+            while self.model.column_count<=column:
+                self.model.insert_column(self.model.column_count, [])
+        elif row>=len(self.view):
+            return
+        self.model.set(self.model_row(row), column, value)
             
     def edit_row(self, row, value=None, **kwargs):
         """ edit all parameters of a single row """
         for i in range(self.columns):
-            self.frame[row, i].configure(require_redraw=True, **kwargs)
-            self.data[row, i]["args"].update(kwargs)
+            if (row, i) in self.frame:
+                self.frame[row, i].configure(require_redraw=True, **kwargs)
+            self.cell_data(row, i)["args"].update(kwargs)
             if value is not None:
                 self.insert(row, i, value)
             if (row,i) in self.corner_buttons.keys():
                 self.dynamic_hover(self.corner_buttons[row,i],row,i)
-        self.update_data()
        
     def edit_column(self, column, value=None, **kwargs):
         """ edit all parameters of a single column """
         for i in range(self.rows):
-            self.frame[i, column].configure(require_redraw=True, **kwargs)
-            self.data[i, column]["args"].update(kwargs)
+            if (i, column) in self.frame:
+                self.frame[i, column].configure(require_redraw=True, **kwargs)
+            self.cell_data(i, column)["args"].update(kwargs)
             if value is not None:
                 self.insert(i, column, value)
             if (i, column) in self.corner_buttons.keys():
                 self.dynamic_hover(self.corner_buttons[i, column], i, column)
-        self.update_data()
         
     def update_values(self, values, **kwargs):
         """ update all values at once """
-        for i in self.frame.values():
+        self.values = values
+        if kwargs or self.orient!="horizontal":
+            self.redraw(**kwargs)
+            return
+        
+        # the cells are kept, only the changed texts are configured
+        self.show_view(self.value_rows() if self.view is not None else self.rows)
+        
+    def apply_values(self, values, highlight_color=None, highlight_time=500):
+        """
+        show new values, only the changed cells are configured, in one idle callback,
+        rows and columns are added or deleted to match the size of the new values
+        """
+        with self.batch_update():
+            shown_rows = self.value_rows()
+            if len(values)<shown_rows:
+                self.delete_rows(range(len(values), shown_rows))
+                
+            # the columns are changed before rows are added, so that the new rows fit
+            column_count = max((len(row_values) for row_values in values), default=self.model.column_count)
+            for column in range(self.model.column_count, column_count):
+                self.add_column([row_values[column] if column<len(row_values) else " " for row_values in values])
+            if 0<column_count<self.model.column_count:
+                self.delete_columns(range(column_count, self.model.column_count))
+                
+            for row_values in values[shown_rows:]:
+                self.add_row(row_values)
+                
+        changes = {}
+        rows = self.shown_rows()
+        for column in range(self.model.column_count):
+            column_values = self.model.get_column(column, rows)
+            for row, row_values in enumerate(values):
+                if column<len(row_values) and column_values[row]!=row_values[column]:
+                    changes[row, column] = row_values[column]
+        self.patch(changes, highlight_color, highlight_time)
+        
+    def patch(self, changes, highlight_color=None, highlight_time=500):
+        """
+        change single values, changes is a dict {(row, column): value} or a list of (row, column, value),
+        the changed cells are configured in one idle callback and highlighted for highlight_time ms
+        """
+        if isinstance(changes, dict):
+            changes = changes.items()
+        else:
+            changes = (((row, column), value) for row, column, value in changes)
+            
+        for (row, column), value in changes:
+            self.model.set(self.model_row(row), column, value)
+            position = (row, column) if self.orient=="horizontal" else (column, row)
+            if position in self.data:
+                self.data[position]["value"] = self.cell_value(*position)
+            self.pending_cells[position] = (highlight_color, highlight_time)
+            
+        if self.pending_cells and self.flush_id is None:
+            self.flush_id = self.after_idle(self.flush_cells)
+            
+    def flush_cells(self):
+        """ configure the cells which were changed since the last idle callback """
+        self.flush_id = None
+        pending, self.pending_cells = self.pending_cells, {}
+        if not self.winfo_exists():
+            return
+        
+        self.highlight_token += 1
+        highlighted = {}
+        for position, (color, time) in pending.items():
+            cell = self.frame.get(position)
+            if cell is None:
+                # a row of the virtual table which is not shown
+                continue
+            self.set_cell_text(cell, self.cell_data(*position)["value"])
+            if color is not None:
+                cell.configure(fg_color=color)
+                self.highlights[position] = self.highlight_token
+                highlighted.setdefault(time, []).append(position)
+                
+        for time, positions in highlighted.items():
+            self.after(time, lambda positions=positions, token=self.highlight_token: self.clear_highlight(positions, token))
+            
+    def clear_highlight(self, positions, token):
+        """ restore the colors of cells which were not highlighted again since """
+        if not self.winfo_exists():
+            return
+        for position in positions:
+            if self.highlights.get(position)!=token:
+                continue
+            del self.highlights[position]
+            if position in self.frame:
+                self.frame[position].configure(fg_color=self.data[position]["args"]["fg_color"])
+        
+    def append_rows(self, rows, **kwargs):
+        """
+        add rows at the end of the table, the other cells are not moved,
+        with a filter only the matching rows are shown and a sorted view shows them at the end until apply_view()
+        """
+        first_model_row = self.model.row_count
+        for values in rows:
+            self.model.insert_row(self.model.row_count, values)
+        new_rows = range(first_model_row, self.model.row_count)
+        if self.view is not None:
+            if self.row_filter is not None:
+                new_rows = self.model.filter(self.row_filter[0], self.row_filter[1], new_rows)
+            self.view.extend(new_rows)
+            self.view_index = None
+        if not new_rows:
+            return
+        old_rows = self.rows
+        self.rows += len(new_rows)
+        if self.orient!="horizontal":
+            self.schedule_redraw(**kwargs)
+            return
+        
+        if not self.virtual or kwargs:
+            for i in range(old_rows, self.rows):
+                for j in range(self.columns):
+                    self.new_cell_data(i, j, kwargs)
+        self.relayout(first_row=old_rows)
+        
+    def replace_rows(self, rows):
+        """ show new rows with the number of rows and columns of the new values """
+        self.values = rows
+        self.rows = self.value_rows()
+        self.columns = self.model.column_count
+        self.data = {}
+        self.first_row = 0
+        self.redraw(**self.cell_kwargs)
+        
+    def load_rows(self, rows, chunk_size=1000, clear=True, progress=None, done=None, error=None, fraction=None,
+                  close=None):
+        """
+        add the rows of an iterable in chunks, one chunk per idle callback so that the window stays responsive,
+        progress(loaded_rows, fraction) is called after every chunk and done(loaded_rows) at the end,
+        if reading the rows fails, loading stops and error(exception) is called or the exception is raised
+        """
+        self.cancel_loading()
+        iterator = iter(rows)
+        loaded_rows = 0
+        
+        def load_chunk():
+            nonlocal clear, loaded_rows
+            try:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if clear:
+                    clear = False
+                    self.replace_rows(chunk)
+                else:
+                    self.append_rows(chunk)
+            except Exception as exception:
+                self.loading_id = None
+                self.close_loading()
+                if error is None:
+                    raise
+                error(exception)
+                return
+            loaded_rows += len(chunk)
+            if progress:
+                progress(loaded_rows, fraction() if fraction else None)
+                
+            if len(chunk)<chunk_size:
+                self.loading_id = None
+                self.close_loading()
+                if self.sort_key is not None:
+                    self.apply_view()
+                if done:
+                    done(loaded_rows)
+            else:
+                self.loading_id = self.after_idle(load_chunk)
+                
+        self.loading_close = close
+        self.loading_id = self.after_idle(load_chunk)
+        
+    def cancel_loading(self):
+        """ stop load_rows(), the rows which were loaded are kept """
+        if self.loading_id is not None:
+            self.after_cancel(self.loading_id)
+            self.loading_id = None
+        self.close_loading()
+        
+    def close_loading(self):
+        if self.loading_close:
+            self.loading_close()
+            self.loading_close = None
+            
+    def open_file(self, file, encoding, newline=None):
+        """ open a path, file objects are used as they are and not closed """
+        if isinstance(file, (str, os.PathLike)):
+            file = open(file, newline=newline, encoding=encoding)
+            return file, file.close
+        return file, None
+    
+    @staticmethod
+    def read_fraction(file):
+        """ lines of a file and a function that returns the read part of the file """
+        try:
+            size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            size = 0
+        read = 0
+        
+        def lines():
+            nonlocal read
+            for line in file:
+                read += len(line)
+                yield line
+        return lines(), (lambda: min(read/size, 1.0)) if size else None
+        
+    def load_csv(self, file, chunk_size=1000, clear=True, progress=None, done=None, error=None, encoding="utf-8",
+                 **fmtparams):
+        """ load the rows of a csv file or path in chunks, fmtparams are passed to csv.reader """
+        file, close = self.open_file(file, encoding, newline="")
+        lines, fraction = self.read_fraction(file)
+        self.load_rows(csv.reader(lines, **fmtparams), chunk_size, clear, progress, done, error, fraction, close)
+        
+    def load_jsonl(self, file, columns=None, header=False, chunk_size=1000, clear=True, progress=None, done=None,
+                   error=None, encoding="utf-8"):
+        """
+        load a JSON Lines file or path in chunks, every line is a list of values or an object,
+        columns are the keys of the objects in their order, the keys of the first object by default,
+        header=True adds the columns as first row
+        """
+        file, close = self.open_file(file, encoding)
+        lines, fraction = self.read_fraction(file)
+        
+        def rows():
+            keys = columns
+            if header and keys is not None:
+                yield list(keys)
+            for line in lines:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    if keys is None:
+                        keys = list(item)
+                        if header:
+                            yield list(keys)
+                    yield [item.get(key, " ") for key in keys]
+                else:
+                    yield item
+        self.load_rows(rows(), chunk_size, clear, progress, done, error, fraction, close)
+        
+    def load_sqlite(self, cursor, header=True, chunk_size=1000, clear=True, progress=None, done=None, error=None):
+        """ load the rows of an executed sqlite3 (or other DB-API) cursor in chunks, header adds the column names """
+        def rows():
+            if header and cursor.description:
+                yield [column[0] for column in cursor.description]
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    return
+                yield from chunk
+        self.load_rows(rows(), chunk_size, clear, progress, done, error)
+        
+    def iter_rows(self):
+        """ iterate over the shown rows of values without copying the table """
+        for row in self.shown_rows():
+            yield self.model.get_row(row)
+            
+    def export_csv(self, file, encoding="utf-8", **fmtparams):
+        """ write the shown values to a csv file or path, row by row, fmtparams are passed to csv.writer """
+        file, close = self.open_file(file, encoding, newline="")
+        try:
+            csv.writer(file, **fmtparams).writerows(self.iter_rows())
+        finally:
+            if close:
+                close()
+        
+    def redraw(self, **kwargs):
+        """ destroy all cells and draw the table again """
+        for i in set(self.frame.values()) | set(self.pool.values()):
             i.destroy()
         self.frame = {}
-        self.values = values
         self.draw_table(**kwargs)
-        self.update_data()
+        
+    def set_cell_text(self, cell, value):
+        """ show a value in a cell widget """
+        if value is None:
+            value = " "
+        if self.write:
+            state = cell.cget("state")
+            cell.configure(state="normal")
+            cell.delete(0, customtkinter.END)
+            cell.insert(0, str(value))
+            cell.configure(state=state)
+        else:
+            cell.configure(text=value)
         
     def add_row(self, values, index=None, **kwargs):
         """ add a new row """
-        for i in self.frame.values():
-            i.destroy()
-        self.frame = {}
         if index is None:
-            index = len(self.values)      
-        try:
-            self.values.insert(index, values)
-            self.rows+=1
-        except IndexError: pass
- 
-        self.draw_table(**kwargs)
-        self.update_data()
+            index = self.value_rows()
+        index = max(0, min(index, self.value_rows()))
+        if self.view is None:
+            self.model.insert_row(index, values)
+        else:
+            # the new row is added at the end of the model and shown at the index
+            self.model.insert_row(self.model.row_count, values)
+            self.view.insert(index, self.model.row_count-1)
+            self.view_index = None
+        self.rows+=1
+        if self.orient!="horizontal":
+            self.schedule_redraw(**kwargs)
+            return
+        
+        index = min(index, self.rows-1)
+        if index<self.rows-1:
+            self.remap_cells(row_map=lambda i: i+1 if i>=index else i)
+        for j in range(self.columns):
+            self.new_cell_data(index, j, kwargs)
+        self.relayout(first_row=index)
         
     def add_column(self, values, index=None, **kwargs):
         """ add a new column """
-        for i in self.frame.values():
-            i.destroy()
-        self.frame = {}
         if index is None:
-            index = len(self.values[0])
-        x = 0
-        for i in self.values:
-            try:
-                i.insert(index, values[x])
-                x+=1
-            except IndexError: pass
+            index = self.model.column_count
+        # the values are given in the order of the shown rows
+        column_values = [" "]*self.model.row_count
+        for x, row in enumerate(self.shown_rows()):
+            if x<len(values):
+                column_values[row] = values[x]
+        self.model.insert_column(index, column_values)
         self.columns+=1
-        self.draw_table(**kwargs)
-        self.update_data()
+        if self.orient!="horizontal":
+            self.schedule_redraw(**kwargs)
+            return
+        
+        index = min(index, self.columns-1)
+        self.remap_cells(column_map=lambda j: j+1 if j>=index else j)
+        for i in range(self.rows):
+            self.new_cell_data(i, index, kwargs)
+        self.relayout(first_column=index)
         
     def delete_row(self, index=None):
         """ delete a particular row """
-        if len(self.values)==1:
+        if self.value_rows()==1:
             return
-        if index is None or index>=len(self.values):
-            index = len(self.values)-1
-        self.values.pop(index)
-        for i in self.frame.values():
-            i.destroy()
-        self.rows-=1
-        self.frame = {}
-        self.draw_table()
-        self.update_data()
-
+        if index is None or index>=self.value_rows():
+            index = self.value_rows()-1
+        self.delete_rows([index])
         
     def delete_column(self, index=None):
         """ delete a particular column """
-        if len(self.values[0])==1:
+        if self.model.column_count==1:
             return
-        if index is None or index>=len(self.values[0]):
-            try:
-                index = len(self.values)-1
-            except IndexError:
-                return
-        for i in self.values:
-            i.pop(index)
-        for i in self.frame.values():
-            i.destroy()
-        self.columns-=1
-        self.frame = {}
-        self.draw_table()
-        self.update_data()
-
+        if index is None or index>=self.model.column_count:
+            index = self.model.column_count-1
+        self.delete_columns([index])
         
     def delete_rows(self, indices=[]):
         """ delete a particular row """
         if len(indices)==0:
             return
-        self.values = [v for i, v in enumerate(self.values) if i not in indices]
-        for i in indices:
-            for j in range(self.columns):
-                self.data[i, j]["args"] = ""
-        for i in self.frame.values():
-            i.destroy()
-        self.rows -= len(set(indices))
-        self.frame = {}
-        self.draw_table()
-        self.update_data()
+        indices = set(indices)
+        deleted = sorted(set(self.model_row(i) for i in indices if i<self.value_rows()))
+        self.model.delete_rows(deleted)
+        if self.view is not None:
+            deleted_rows = set(deleted)
+            self.view = [row-bisect.bisect_left(deleted, row) for row in self.view if row not in deleted_rows]
+            self.view_index = None
+        self.rows -= len(indices)
+        if self.orient!="horizontal":
+            self.schedule_redraw()
+            return
+        
+        # new index of every row, deleted rows have none
+        row_map = {}
+        for i in range(self.rows+len(indices)):
+            if i not in indices:
+                row_map[i] = len(row_map)
+        self.remove_cells(lambda i, j: i in indices)
+        self.remap_cells(row_map=row_map.get)
+        self.relayout(first_row=min(indices))
         
     def delete_columns(self, indices=[]):
         """ delete a particular column """
         if len(indices)==0:
             return
-        x = 0
-        
-        for k in self.values:
-            self.values[x] = [v for i, v in enumerate(k) if i not in indices]
-            x+=1
-        for i in indices:
-            for j in range(self.rows):
-                self.data[j, i]["args"] = ""
+        indices = set(indices)
+        self.model.delete_columns(indices)
+        self.columns -= len(indices)
+        if self.orient!="horizontal":
+            self.schedule_redraw()
+            return
+        
+        column_map = {}
+        for j in range(self.columns+len(indices)):
+            if j not in indices:
+                column_map[j] = len(column_map)
+        self.remove_cells(lambda i, j: j in indices)
+        self.remap_cells(column_map=column_map.get)
+        self.relayout(first_column=min(indices))
+        
+    def remove_cells(self, removed):
+        """ destroy the widgets of the removed cells, the pooled cells of the virtual mode are kept """
+        if self.virtual:
+            return
+        for position, cell in list(self.frame.items()):
+            if removed(*position):
+                self.remove_cell(cell)
+        
+    def remap_cells(self, row_map=None, column_map=None):
+        """ move data and cell widgets to new positions, cells without a new position are dropped """
+        def new_position(i, j):
+            row = row_map(i) if row_map else i
+            column = column_map(j) if column_map else j
+            if row is None or column is None:
+                return None
+            return row, column
+        
+        data = {}
+        for (i,j), cell_data in self.data.items():
+            position = new_position(i, j)
+            if position is None:
+                continue
+            if position!=(i,j):
+                # cells with the default color get the default color of their new position
+                args = cell_data["args"]
+                if args and args.get("fg_color")==self.cell_color(i, j):
+                    args["fg_color"] = self.cell_color(*position)
+                cell_data["row"], cell_data["column"] = position
+            data[position] = cell_data
+        self.data = data
+        
+        frame = {}
+        for (i,j), cell in self.frame.items():
+            position = new_position(i, j)
+            if position is not None:
+                frame[position] = cell
+                self.cell_index[cell] = position
+        self.frame = frame
+        self.corner_buttons = {new_position(*position): cell for position, cell in self.corner_buttons.items()
+                               if new_position(*position) is not None}
+        
+    def begin_update(self):
+        """ defer the layout and recoloring of the cells until end_update() is called """
+        self.batch_depth += 1
+        
+    def end_update(self):
+        """ lay out the cells which were changed since begin_update() """
+        self.batch_depth = max(self.batch_depth-1, 0)
+        self.relayout()
+        
+    @contextlib.contextmanager
+    def batch_update(self):
+        """ with table.batch_update(): ... lays out the table once at the end of the block """
+        self.begin_update()
+        try:
+            yield self
+        finally:
+            self.end_update()
+            
+    def schedule_redraw(self, **kwargs):
+        """ draw the table again, when the batch update ends if there is one """
+        self.pending_redraw = True
+        self.redraw_kwargs = kwargs
+        self.relayout()
+        
+    def relayout(self, first_row=None, first_column=None):
+        """ create, re-grid and recolor the cells from a row or column, deferred during a batch update """
+        if first_row is not None:
+            self.dirty_row = first_row if self.dirty_row is None else min(self.dirty_row, first_row)
+        if first_column is not None:
+            self.dirty_column = first_column if self.dirty_column is None else min(self.dirty_column, first_column)
+        if self.batch_depth:
+            return
+        
+        if self.pending_redraw:
+            self.pending_redraw = False
+            self.redraw(**self.redraw_kwargs)
+        elif self.dirty_row is not None or self.dirty_column is not None:
+            if self.virtual:
+                self.refresh_virtual_table()
+            else:
+                # the row and column before the change can have lost their last row or column padding and corners
+                self.layout_cells(None if self.dirty_row is None else max(self.dirty_row-1, 0),
+                                  None if self.dirty_column is None else max(self.dirty_column-1, 0))
+        self.dirty_row = None
+        self.dirty_column = None
+        
+    def layout_cells(self, first_row, first_column):
+        """ create the missing cells and update the position and colors of the other cells """
+        old_rows, old_columns = self.grid_rows, self.grid_columns
+        self.grid_rows, self.grid_columns = self.rows, self.columns
+        for i in range(self.rows, old_rows):
+            self.inside_frame.grid_rowconfigure(i, weight=0)
+        for j in range(self.columns, old_columns):
+            self.inside_frame.grid_columnconfigure(j, weight=0)
+            
+        for i in range(0 if first_column is not None else first_row, self.rows):
+            if first_row is not None and i>=first_row:
+                columns = range(self.columns)
+            else:
+                columns = range(first_column, self.columns)
+            for j in columns:
+                if (i,j) in self.frame:
+                    self.layout_cell(i, j)
+                    continue
+                self.inside_frame.grid_rowconfigure(i, weight=1)
+                self.inside_frame.grid_columnconfigure(j, weight=1)
+                cell = self.create_cell(i, j, i, **self.cell_kwargs)
+                for y in self.binded_objects:
+                    cell.bind(*y)
+                self.rowconfigure(i, weight=1)
+                self.columnconfigure(j, weight=1)
                 
-        for i in self.frame.values():
-            i.destroy()
-        self.columns -= len(set(indices))
-        self.frame = {}
-        self.draw_table()
-        self.update_data()
+    def layout_cell(self, i, j):
+        """ move a cell to its grid position and update its colors and corners """
+        cell = self.frame[i,j]
+        args = self.data[i,j]["args"]
+        padx, pady = self.cell_padding(i, j)
+        cell.grid(column=j, row=i, padx=padx, pady=pady)
+        
+        if self.write:
+            if cell.cget("fg_color")!=args["fg_color"]:
+                cell.configure(fg_color=args["fg_color"])
+            state = "readonly" if self.header_color and i==0 else "normal"
+            if cell.cget("state")!=state:
+                cell.configure(state=state)
+            return
+        
+        corners, corner_radius, hover_modify = self.cell_corners(i, j, args["fg_color"])
+        was_corner = self.corner_buttons.get((i,j)) is cell
+        if was_corner:
+            self.reset_hover(cell, (i,j))
+        if was_corner or corner_radius!=cell.cget("corner_radius") or corners!=[args["fg_color"]]*4:
+            cell.configure(background_corner_colors=corners, corner_radius=corner_radius, fg_color=args["fg_color"])
+        elif cell.cget("fg_color")!=args["fg_color"]:
+            cell.configure(fg_color=args["fg_color"])
+        if hover_modify:
+            self.dynamic_hover(cell, i, j)
+            
+    def reset_hover(self, cell, position):
+        """ remove the corner hover bindings of a cell """
+        del self.corner_buttons[position]
+        for sequence in ("<Enter>", "<Leave>"):
+            cell.unbind(sequence)
+            for y in self.binded_objects:
+                if y[0]==sequence:
+                    cell.bind(*y)
+                    
+    def refresh_virtual_table(self):
+        """ show the changed rows and columns with the pooled cells """
+        fixed_rows = 1 if self.header_color and self.orient=="horizontal" and self.rows>0 else 0
+        grid_rows = min(self.rows, fixed_rows+self.visible_rows+self.overscan)
+        if (grid_rows, self.columns, fixed_rows)!=(self.grid_rows, self.grid_columns, self.fixed_rows):
+            # the pool has another size
+            self.redraw(**self.cell_kwargs)
+            return
+        self.first_row = min(self.first_row, self.max_first_row())
+        self.rebind_rows(force=True)
+        self.update_scrollbar()
         
     def get_row(self, row):
         """ get values of one row """
-        return self.values[row]
+        return self.model.get_row(self.model_row(row))
     
     def get_column(self, column):
         """ get values of one column """
-        column_list = []
-        for i in self.values:
-            column_list.append(i[column])
-        return column_list
+        return self.model.get_column(column, self.shown_rows())
+    
+    def sort_by(self, column, reverse=False):
+        """ show the rows sorted by the values of a column, the header row stays on top """
+        self.sort_key = (column, reverse)
+        self.apply_view()
+        
+    def filter_rows(self, predicate, column=None):
+        """ show only the rows where predicate(value of the column) or predicate(row values) is true """
+        self.row_filter = (predicate, column)
+        self.apply_view()
+        
+    def reset_view(self):
+        """ show all rows in the order of the model """
+        self.sort_key = None
+        self.row_filter = None
+        self.apply_view()
+        
+    def create_index(self, column):
+        """ create a hash index of a column for find() """
+        self.model.create_index(column)
+        
+    def find(self, column, value):
+        """ shown rows where the column has the value """
+        rows = self.model.lookup(column, value)
+        if self.view is None:
+            return rows
+        if self.view_index is None:
+            self.view_index = {row: i for i, row in enumerate(self.view)}
+        return sorted(self.view_index[row] for row in rows if row in self.view_index)
+    
+    def compute_view(self):
+        """ model rows of the current filter and sort, the header row is not sorted or filtered """
+        if self.sort_key is None and self.row_filter is None:
+            return None
+        header_rows = min(1 if self.header_color else 0, self.model.row_count)
+        rows = range(header_rows, self.model.row_count)
+        if self.row_filter is not None:
+            rows = self.model.filter(self.row_filter[0], self.row_filter[1], rows)
+        if self.sort_key is not None:
+            rows = self.model.sort(self.sort_key[0], self.sort_key[1], rows)
+        return list(range(header_rows))+list(rows)
+    
+    def apply_view(self):
+        """ show the model rows of the current filter and sort in the existing cells """
+        self.view = self.compute_view()
+        self.view_index = None
+        self.show_view(self.value_rows())
+        
+    def show_view(self, count):
+        """ show count rows of values, only cells for the changed number of rows are created or destroyed """
+        if self.orient!="horizontal":
+            self.columns = count
+            self.schedule_redraw()
+            return
+        
+        old_rows = self.rows
+        if count<old_rows:
+            self.remove_cells(lambda i, j: i>=count)
+            self.remap_cells(row_map=lambda i: i if i<count else None)
+        self.rows = count
+        if not self.virtual:
+            # the data of the virtual mode is created when a row is shown
+            for i in range(old_rows, count):
+                for j in range(self.columns):
+                    self.new_cell_data(i, j)
+        self.refresh_cells()
+        if count!=old_rows:
+            self.relayout(first_row=min(old_rows, count))
+            
+    def refresh_cells(self):
+        """ show the values of the model in the cells, only the changed texts are configured """
+        if self.virtual:
+            for (i,j), data in self.data.items():
+                data["value"] = self.cell_value(i, j)
+            self.rebind_rows(force=True)
+            return
+        
+        for (i,j), cell in self.frame.items():
+            value = self.cell_value(i, j)
+            if self.data[i,j]["value"]!=value:
+                self.data[i,j]["value"] = value
+                self.set_cell_text(cell, value)
 
     def select_row(self, row):
         """ select an entire row """
@@ -572,7 +1405,8 @@ Author: Akash Bora | https://github.com/Akascape
     def deselect_column(self, column):
         """ deselect an entire column """
         for i in range(self.rows):
-            self.frame[i,column].configure(fg_color=self.fg_color if i%2==0 else self.fg_color2)
+            if (i, column) in self.frame:
+                self.frame[i,column].configure(fg_color=self.fg_color if i%2==0 else self.fg_color2)
         if self.orient!="horizontal":
             if self.header_color:
                 self.edit_column(0, fg_color=self.header_color)
@@ -592,15 +1426,22 @@ Author: Akash Bora | https://github.com/Akascape
             hover_corners = [self.hover_color, "", self.hover_color, self.hover_color]
         else:
             hover_corners = [self.hover_color, self.hover_color, self.hover_color, self.hover_color]
-        self.frame[row, column].configure(background_corner_colors=hover_corners, fg_color=self.hover_color)
+        if (row, column) in self.frame:
+            self.frame[row, column].configure(background_corner_colors=hover_corners, fg_color=self.hover_color)
 
     def deselect(self, row, column):
         """ deselect any cell """
-        self.frame[row,column].configure(fg_color=self.fg_color if row%2==0 else self.fg_color2)
+        if (row, column) in self.frame:
+            self.frame[row,column].configure(fg_color=self.fg_color if row%2==0 else self.fg_color2)
         
     def insert(self, row, column, value, **kwargs):
         """ insert value in a specific block [row, column] """
-        if kwargs: self.data[row,column]["args"].update(kwargs)
+        if kwargs: self.cell_data(row,column)["args"].update(kwargs)
+        if (row, column) not in self.frame:
+            # a row of the virtual table which is not shown
+            self.cell_data(row,column)["value"] = value
+            self.set_value(row, column, value)
+            return
         if self.write:
             self.frame[row,column].delete(0, customtkinter.END)
             self.frame[row,column].insert(0, value)
@@ -610,11 +1451,14 @@ Author: Akash Bora | https://github.com/Akascape
             if (row, column) in self.corner_buttons.keys():
                 self.dynamic_hover(self.corner_buttons[row, column], row, column)
         
-        self.update_data()
+        self.data[row,column]["value"] = value
+        self.set_value(row, column, value)
         
     def edit(self, row, column, **kwargs):
         """ change parameters of a cell without changing value """
-        if kwargs: self.data[row,column]["args"].update(kwargs)
+        if kwargs: self.cell_data(row,column)["args"].update(kwargs)
+        if (row, column) not in self.frame:
+            return
         if self.write:
             self.frame[row,column].configure(**kwargs)
         else:        
@@ -622,22 +1466,24 @@ Author: Akash Bora | https://github.com/Akascape
             if (row, column) in self.corner_buttons.keys():
                 self.dynamic_hover(self.corner_buttons[row, column], row, column)
         
-        self.update_data()
-        
     def delete(self, row, column, **kwargs):
         """ delete a value from a specific block [row, column] """
+        if (row, column) not in self.frame:
+            self.insert(row, column, "", **kwargs)
+            return
         if self.write:
             self.frame[row,column].delete(0, customtkinter.END)
             self.frame[row,column].configure(**kwargs)
         else:     
             self.frame[row,column].configure(require_redraw=True, text="", **kwargs)
         if kwargs: self.data[row,column]["args"].update(kwargs)
-        self.update_data()
+        self.data[row,column]["value"] = ""
+        self.set_value(row, column, "")
         
     def get(self, row=None, column=None):
         """ get the required cell """
         if row is not None and column is not None:
-            return self.data[row,column]["value"]
+            return self.cell_data(row,column)["value"]
         else:
             return self.values
         
@@ -645,7 +1491,7 @@ Author: Akash Bora | https://github.com/Akascape
         """ Return the index and data of the selected row """
         selected_row_index = None
         for i in range(self.rows):
-            if self.frame[i, 0].cget("fg_color") == self.hover_color:
+            if self.is_selected(i, 0):
                 selected_row_index = i
                 break
         selected_row_data = self.get_row(selected_row_index) if selected_row_index is not None else None
@@ -655,12 +1501,18 @@ Author: Akash Bora | https://github.com/Akascape
         """ Return the index and data of the selected row """
         selected_column_index = None
         for i in range(self.columns):
-            if self.frame[0, i].cget("fg_color") == self.hover_color:
+            if self.is_selected(0, i):
                 selected_column_index = i
                 break
         selected_column_data = self.get_column(selected_column_index) if selected_column_index is not None else None
         return {"column_index": selected_column_index, "values": selected_column_data}
     
+    def is_selected(self, row, column):
+        """ check if a cell has the hover color """
+        if (row, column) in self.frame:
+            return self.frame[row, column].cget("fg_color") == self.hover_color
+        return (row, column) in self.data and self.data[row, column]["args"].get("fg_color") == self.hover_color
+    
     def configure(self, **kwargs):
         """ configure table widget attributes"""
         
@@ -677,6 +1529,7 @@ Author: Akash Bora | https://github.com/Akascape
             self.inside_frame.configure(fg_color=kwargs["bg_color"])
         if "header_color" in kwargs:
             self.header_color = kwargs.pop("header_color")
+            self.model.set_header_rows(1 if self.header_color else 0)
         if "rows" in kwargs:
             self.rows = kwargs.pop("rows")
         if "columns" in kwargs:
@@ -692,7 +1545,8 @@ Author: Akash Bora | https://github.com/Akascape
 
         for i in range(self.rows):
             for j in range(self.columns):
-                self.data[i,j]["args"].update(kwargs)
+                if (i,j) in self.data:
+                    self.data[i,j]["args"].update(kwargs)
                 
         if "hover_color" in kwargs:
             self.hover_color = kwargs.pop("hover_color")
@@ -725,13 +1579,13 @@ Author: Akash Bora | https://github.com/Akascape
         if "height" in kwargs:
             self.height = kwargs.pop("height")
             
-        self.update_values(self.values, **kwargs)
+        self.redraw(**kwargs)
 
     def cget(self, param):
         if param=="width":
-            return self.frame[0,0].winfo_reqwidth()
+            return self.first_cell().winfo_reqwidth()
         if param=="height":
-            return self.frame[0,0].winfo_reqheight()
+            return self.first_cell().winfo_reqheight()
         if param=="colors":
             return (self.fg_color, self.fg_color2)
         if param=="hover_color":
@@ -768,9 +1622,21 @@ Author: Akash Bora | https://github.com/Akascape
             return self.orient
         if param=="write":
             return self.write
+        if param=="virtual":
+            return self.virtual
+        if param=="visible_rows":
+            return self.visible_rows
+        if param=="overscan":
+            return self.overscan
         
         return super().cget(param)
     
+    def first_cell(self):
+        """ the top left cell widget """
+        if self.virtual:
+            return self.pool[0,0]
+        return self.frame[0,0]
+    
     def bind(self, sequence: str = None, command = None, add = True):
         """ bind all cells """
         self.binded_objects.append([sequence, command, add])
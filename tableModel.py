@@ -0,0 +1,286 @@
+"""
+TableModel
+Columnar storage of the values of a CTkTable
+"""
+
+from array import array
+import bisect
+
+class TableModel:
+    """
+Columnar data of a table, every column is stored in its own sequence.
+
+Columns which contain only ints are stored as array('q'), columns of floats as array('d') and
+all other columns as lists. A typed column becomes a list when a value of another type is set.
+The first header_rows rows (the header of a CTkTable) are stored as lists of their own, so a
+text header doesn't change the type of the columns below it.
+
+Rows are addressed by their model index, header rows included. Sorting and filtering return lists
+of model indices, so a view can show the rows in another order without changing the model.
+
+## Methods
+- **.get(row, column)**, **.set(row, column, value)**
+- **.get_row(row)**, **.get_column(column, rows)**
+- **.insert_row(index, values)**, **.delete_rows(rows)**
+- **.insert_column(index, values)**, **.delete_columns(columns)**
+- **.set_header_rows(count)**: number of rows which are stored outside of the typed columns
+- **.to_rows(rows)**: list of row lists
+- **.sort(column, reverse, rows)**: model indices sorted by the values of a column
+- **.filter(predicate, column, rows)**: model indices of the rows which match the predicate
+- **.create_index(column)**, **.drop_index(column)**, **.lookup(column, value)**: hash index of a column
+    """
+
+    # value of the cells which are missing in a row
+    EMPTY = " "
+
+    def __init__(self, values: list = None, header_rows: int = 0):
+        values = values or []
+        column_count = max((len(row) for row in values), default=0)
+        self.row_count = len(values)
+        self.header_count = header_rows
+        self.header = [self.padded(row, column_count) for row in values[:header_rows]] # header rows as lists
+        data = values[len(self.header):]
+        self.columns = [] # data rows, one sequence per column
+        for j in range(column_count):
+            self.columns.append(self.typed_column([row[j] if j<len(row) else self.EMPTY for row in data]))
+        self.indexes = {} # column: {value: set of rows}
+        self.stale_indexes = set() # indexed columns which must be rebuilt before a lookup
+
+    def __len__(self):
+        return self.row_count
+
+    @property
+    def column_count(self):
+        return len(self.columns)
+    
+    @property
+    def header_rows(self):
+        """ number of stored header rows, less than header_count if the model has less rows """
+        return len(self.header)
+    
+    @classmethod
+    def padded(cls, values, column_count):
+        return [values[j] if j<len(values) else cls.EMPTY for j in range(column_count)]
+
+    @staticmethod
+    def typed_column(values):
+        """ store a column as array if all values have the same numeric type """
+        if values and all(type(value) is int for value in values):
+            try:
+                return array("q", values)
+            except OverflowError:
+                return list(values)
+        if values and all(type(value) is float for value in values):
+            return array("d", values)
+        return list(values)
+
+    @staticmethod
+    def fits(column, value):
+        """ check if a value can be stored in a column without changing its type """
+        if not isinstance(column, array):
+            return True
+        if column.typecode=="q":
+            return type(value) is int and -2**63<=value<2**63
+        return type(value) is float
+
+    def get(self, row, column):
+        if not 0<=row<self.row_count:
+            raise IndexError("row index out of range")
+        header_rows = len(self.header)
+        if row<header_rows:
+            return self.header[row][column]
+        return self.columns[column][row-header_rows]
+
+    def set(self, row, column, value):
+        if not 0<=row<self.row_count:
+            raise IndexError("row index out of range")
+        header_rows = len(self.header)
+        if row<header_rows:
+            old_value = self.header[row][column]
+            self.header[row][column] = value
+        else:
+            if not self.fits(self.columns[column], value):
+                self.columns[column] = list(self.columns[column])
+            old_value = self.columns[column][row-header_rows]
+            self.columns[column][row-header_rows] = value
+
+        if column in self.indexes and column not in self.stale_indexes:
+            self.unindex(column, old_value, row)
+            self.index(column, value, row)
+
+    def get_row(self, row):
+        if not 0<=row<self.row_count:
+            raise IndexError("row index out of range")
+        header_rows = len(self.header)
+        if row<header_rows:
+            return list(self.header[row])
+        return [column[row-header_rows] for column in self.columns]
+
+    def get_column(self, column, rows=None):
+        header, header_rows = self.header, len(self.header)
+        values = self.columns[column]
+        if rows is None:
+            return [row[column] for row in header]+list(values)
+        return [values[row-header_rows] if row>=header_rows else header[row][column] for row in rows]
+
+    def to_rows(self, rows=None):
+        """ the values as list of row lists """
+        if rows is None:
+            rows = range(self.row_count)
+        header, header_rows = self.header, len(self.header)
+        columns = self.columns
+        return [[column[row-header_rows] for column in columns] if row>=header_rows else list(header[row])
+                for row in rows]
+
+    def insert_row(self, index, values):
+        """ insert a row, missing values are empty and more values than columns add columns """
+        index = max(0, min(index, self.row_count))
+        for j in range(self.column_count, len(values)):
+            self.columns.append([self.EMPTY]*(self.row_count-len(self.header)))
+            for row in self.header:
+                row.append(self.EMPTY)
+        row = self.padded(values, self.column_count)
+        
+        if index<len(self.header):
+            self.header.insert(index, row)
+            if len(self.header)>self.header_count:
+                # the last header row becomes the first data row
+                self.insert_data(0, self.header.pop())
+        elif index==len(self.header) and len(self.header)<self.header_count:
+            self.header.append(row)
+        else:
+            self.insert_data(index-len(self.header), row)
+        self.row_count += 1
+
+        for column in self.indexes:
+            if index==self.row_count-1 and column not in self.stale_indexes:
+                self.index(column, self.get(index, column), index)
+            else:
+                # the rows after the new row have new indices
+                self.stale_indexes.add(column)
+
+    def insert_data(self, position, row):
+        # insert a row into the typed columns at a position below the header
+        for j, column in enumerate(self.columns):
+            value = row[j]
+            if not self.fits(column, value):
+                column = self.columns[j] = list(column)
+            column.insert(position, value)
+
+    def delete_rows(self, rows):
+        rows = set(row for row in rows if 0<=row<self.row_count)
+        if not rows:
+            return
+        header_rows = len(self.header)
+        self.header = [row for i, row in enumerate(self.header) if i not in rows]
+        for j, column in enumerate(self.columns):
+            kept = [value for i, value in enumerate(column, header_rows) if i not in rows]
+            self.columns[j] = array(column.typecode, kept) if isinstance(column, array) else kept
+        self.row_count -= len(rows)
+        self.fill_header()
+        self.stale_indexes.update(self.indexes)
+
+    def fill_header(self):
+        # the first data rows move up into the header if header rows are missing
+        while len(self.header)<self.header_count and len(self.header)<self.row_count:
+            self.header.append([column.pop(0) for column in self.columns])
+
+    def set_header_rows(self, count):
+        """ change the number of rows which are stored outside of the typed columns, the rows keep their indices """
+        self.header_count = count
+        while len(self.header)>count:
+            self.insert_data(0, self.header.pop())
+        self.fill_header()
+        # the columns can be typed again without the values of the former header
+        self.columns = [column if isinstance(column, array) else self.typed_column(column) for column in self.columns]
+
+    def insert_column(self, index, values):
+        """ insert a column, missing values are empty """
+        index = max(0, min(index, self.column_count))
+        values = [values[i] if i<len(values) else self.EMPTY for i in range(self.row_count)]
+        for row, value in zip(self.header, values):
+            row.insert(index, value)
+        self.columns.insert(index, self.typed_column(values[len(self.header):]))
+        self.indexes = {(column+1 if column>=index else column): rows for column, rows in self.indexes.items()}
+        self.stale_indexes = set(column+1 if column>=index else column for column in self.stale_indexes)
+
+    def delete_columns(self, columns):
+        columns = sorted(set(column for column in columns if 0<=column<self.column_count))
+        deleted = set(columns)
+        self.columns = [column for j, column in enumerate(self.columns) if j not in deleted]
+        self.header = [[value for j, value in enumerate(row) if j not in deleted] for row in self.header]
+
+        def new_column(column):
+            return column-bisect.bisect_left(columns, column)
+        self.indexes = {new_column(column): rows for column, rows in self.indexes.items() if column not in columns}
+        self.stale_indexes = set(new_column(column) for column in self.stale_indexes if column not in columns)
+
+    @staticmethod
+    def sort_key(value):
+        # numbers are sorted before texts and texts before other values, so that mixed columns can be sorted
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, value, "")
+        if isinstance(value, str):
+            return (1, 0, value)
+        return (2, 0, str(value))
+
+    def sort(self, column, reverse=False, rows=None):
+        """ model indices of the rows sorted by a column, the sort is stable """
+        if rows is None:
+            rows = range(self.row_count)
+        header, header_rows = self.header, len(self.header)
+        values = self.columns[column]
+        if isinstance(values, array) and (not rows or min(rows)>=header_rows):
+            # only data rows, sorted by the values of the typed column
+            positions = sorted([row-header_rows for row in rows], key=values.__getitem__, reverse=reverse)
+            return [position+header_rows for position in positions]
+        sort_key = self.sort_key
+        return sorted(rows, key=lambda row: sort_key(values[row-header_rows] if row>=header_rows else header[row][column]),
+                      reverse=reverse)
+
+    def filter(self, predicate, column=None, rows=None):
+        """
+        model indices of the rows which match the predicate, predicate gets the value of the column
+        or the row as list if no column is given
+        """
+        if rows is None:
+            rows = range(self.row_count)
+        if column is not None:
+            header, header_rows = self.header, len(self.header)
+            values = self.columns[column]
+            return [row for row in rows
+                    if predicate(values[row-header_rows] if row>=header_rows else header[row][column])]
+        return [row for row in rows if predicate(self.get_row(row))]
+
+    def create_index(self, column):
+        """ create a hash index of a column, it is kept up to date when values are changed """
+        self.indexes[column] = {}
+        self.stale_indexes.add(column)
+
+    def drop_index(self, column):
+        self.indexes.pop(column, None)
+        self.stale_indexes.discard(column)
+
+    def lookup(self, column, value):
+        """ model indices of the rows where the column has the value, with the index if there is one """
+        if column not in self.indexes:
+            return [row for row, row_value in enumerate(self.get_column(column)) if row_value==value]
+        if column in self.stale_indexes:
+            self.build_index(column)
+        return sorted(self.indexes[column].get(value, ()))
+
+    def build_index(self, column):
+        self.indexes[column] = {}
+        for row, value in enumerate(self.get_column(column)):
+            self.index(column, value, row)
+        self.stale_indexes.discard(column)
+
+    def index(self, column, value, row):
+        self.indexes[column].setdefault(value, set()).add(row)
+
+    def unindex(self, column, value, row):
+        rows = self.indexes[column].get(value)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self.indexes[column][value]